@@ -1,20 +1,134 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify
+import os
 import sys
+import tracemalloc
 sys.path.append('..')
 from src.models.predict import DiseasePredictor
+from src.models.bundle import use_bundle
+from src.models.batching import PredictionBatcher
+from src.models.online import OnlineUpdater
+from src.models.sessions import SessionStore
+from src.utils.cache import VersionedCache
+from src.utils.memory import RequestMemoryTracker, memory_report, rss_bytes
+from src.utils.metrics import MetricsRegistry
+import config
 import json
 
 app = Flask(__name__)
 
-# Initialize predictor
-predictor = DiseasePredictor(
-    model_path='../models/best_model.pkl',
-    vocab_path='../data/processed/vocabulary.pkl'
-)
+# Diseases returned per /predict request
+PREDICT_TOP_N = 3
 
-# Load additional information (you'll need to create this)
-with open('../data/disease_info.json', 'r') as f:
-    disease_info = json.load(f)
+# Source files; a configured bundle is only served if it was exported from them
+MODEL_PATH = '../models/best_model.pkl'
+VOCAB_PATH = '../data/processed/vocabulary.pkl'
+DISEASE_INFO_PATH = '../data/disease_info.json'
+
+metrics = MetricsRegistry() if config.METRICS_ENABLED else None
+
+# Start tracing before the predictor loads so its components are attributed
+request_memory = None
+if config.MEMORY_PROFILING:
+    tracemalloc.start()
+    request_memory = RequestMemoryTracker()
+
+# Initialize predictor, from the memory-mapped bundle if one is configured
+# and still matches the source files
+if use_bundle(config.MODEL_BUNDLE_PATH, MODEL_PATH, VOCAB_PATH, DISEASE_INFO_PATH):
+    predictor = DiseasePredictor.from_bundle(
+        config.MODEL_BUNDLE_PATH, lazy_nlp=True, metrics=metrics,
+        synonyms_path=config.SYMPTOM_SYNONYMS_PATH, nlp_model=config.NLP_MODEL
+    )
+    disease_info = predictor.disease_info
+else:
+    predictor = DiseasePredictor(
+        model_path=MODEL_PATH,
+        vocab_path=VOCAB_PATH,
+        lazy_nlp=True,
+        metrics=metrics,
+        synonyms_path=config.SYMPTOM_SYNONYMS_PATH,
+        nlp_model=config.NLP_MODEL
+    )
+    
+    # Load additional information (you'll need to create this)
+    with open(DISEASE_INFO_PATH, 'r') as f:
+        disease_info = json.load(f)
+
+if config.CASCADE_MODEL_PATH:
+    predictor.set_cascade(config.CASCADE_MODEL_PATH, config.CASCADE_MARGIN)
+
+print(predictor.startup_report())
+
+# Optional micro-batching of concurrent /predict requests
+batcher = None
+if config.PREDICT_BATCHING:
+    batcher = PredictionBatcher(
+        predictor,
+        max_batch_size=config.PREDICT_MAX_BATCH_SIZE,
+        max_wait_ms=config.PREDICT_MAX_WAIT_MS
+    )
+
+# Assembled prediction JSON per (matched symptom set, top_n, threshold),
+# dropped whenever the serving model version changes
+response_cache = None
+if config.RESPONSE_CACHE_SIZE:
+    response_cache = VersionedCache(config.RESPONSE_CACHE_SIZE)
+
+# Optional incremental updates from confirmed diagnoses
+updater = OnlineUpdater(predictor) if config.ONLINE_UPDATES_ENABLED else None
+
+# Incremental diagnosis sessions (needs a linear fast scorer)
+sessions = None
+if config.SESSION_MAX_COUNT:
+    try:
+        sessions = SessionStore(
+            predictor, max_sessions=config.SESSION_MAX_COUNT,
+            ttl_seconds=config.SESSION_TTL_SECONDS
+        )
+    except ValueError as e:
+        print(f"Warning: diagnosis sessions disabled: {e}")
+
+def swap_predictor(new_predictor):
+    """
+    Publish a new predictor. Rebinding a reference is atomic, so each
+    request sees either the old or the new model, never a mix, and
+    requests already running finish on the one they started with.
+    """
+    global predictor
+    if response_cache is not None:
+        response_cache.advance(new_predictor.model_version)
+    predictor = new_predictor
+    if batcher is not None:
+        batcher.predictor = new_predictor
+    if sessions is not None:
+        sessions.set_predictor(new_predictor)
+
+def format_predictions(predictions):
+    """Predictions with the disease details shown by the UI"""
+    results = []
+    for disease, probability, _ in predictions:
+        disease_data = disease_info.get(disease, {})
+        results.append({
+            'disease': disease,
+            'probability': float(probability),
+            'description': disease_data.get('description', ''),
+            'precautions': disease_data.get('precautions', []),
+            'medications': disease_data.get('medications', []),
+            'workout': disease_data.get('workout', []),
+            'diet': disease_data.get('diet', [])
+        })
+    return results
+
+@app.before_request
+def begin_request_memory():
+    if request_memory is not None and request.endpoint != 'debug_memory':
+        g.memory_token = request_memory.begin()
+
+@app.teardown_request
+def end_request_memory(exc):
+    token = g.pop('memory_token', None)
+    if token is not None:
+        request_memory.end(request.endpoint or 'unknown', token)
 
 @app.route('/')
 def index():
@@ -29,33 +143,48 @@ def predict():
         if not user_symptoms:
             return jsonify({'error': 'No symptoms provided'}), 400
         
-        # Get predictions
-        predictions, matched_symptoms = predictor.predict(user_symptoms, return_top_n=3)
+        # Read the global once so a hot-swap can't change it mid-request
+        current = predictor
+        indices, matched_symptoms = current.match_symptoms(user_symptoms)
         
-        if not predictions:
-            return jsonify({
-                'error': 'Could not match symptoms. Please try different descriptions.',
-                'matched_symptoms': []
-            }), 404
+        # Predictions depend only on the matched set, not on the phrasing
+        threshold = current.confidence_threshold
+        key = (frozenset(indices), PREDICT_TOP_N, threshold)
+        results = None
+        if response_cache is not None and indices:
+            results = response_cache.get(key, current.model_version)
         
-        # Format response
-        results = []
-        for disease, probability, _ in predictions:
-            disease_data = disease_info.get(disease, {})
-            results.append({
-                'disease': disease,
-                'probability': float(probability),
-                'description': disease_data.get('description', ''),
-                'precautions': disease_data.get('precautions', []),
-                'medications': disease_data.get('medications', []),
-                'workout': disease_data.get('workout', []),
-                'diet': disease_data.get('diet', [])
-            })
+        if results is None:
+            predictions = []
+            if indices:
+                if batcher is not None:
+                    # Score on the model the symptoms were matched and cached with
+                    predictions = batcher.predict_indices(
+                        indices, matched_symptoms, return_top_n=PREDICT_TOP_N,
+                        confidence_threshold=threshold, predictor=current
+                    )
+                else:
+                    predictions = current.predict_indices(
+                        indices, matched_symptoms, return_top_n=PREDICT_TOP_N,
+                        confidence_threshold=threshold
+                    )
+            
+            if not predictions:
+                return jsonify({
+                    'error': 'Could not match symptoms. Please try different descriptions.',
+                    'matched_symptoms': []
+                }), 404
+            
+            # Format predictions once and cache the serialized JSON
+            results = app.json.dumps(format_predictions(predictions))
+            if response_cache is not None:
+                response_cache.put(key, results, current.model_version)
         
-        return jsonify({
-            'predictions': results,
-            'matched_symptoms': [{'symptom': s, 'confidence': c} for s, c in matched_symptoms]
-        })
+        matched = app.json.dumps([{'symptom': s, 'confidence': c} for s, c in matched_symptoms])
+        return Response(
+            f'{{"matched_symptoms":{matched},"predictions":{results}}}\n',
+            mimetype='application/json'
+        )
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -73,5 +202,157 @@ def suggest_symptoms():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/update', methods=['POST'])
+def update():
+    if updater is None:
+        return jsonify({'error': 'Online updates are disabled (ONLINE_UPDATES_ENABLED=0)'}), 404
+    
+    try:
+        data = request.json
+        cases = [(case['symptoms'], case['disease']) for case in data.get('cases', [])]
+        if not cases:
+            return jsonify({'error': 'No cases provided'}), 400
+        
+        updater.update(cases, publish=swap_predictor)
+        return jsonify(updater.stats())
+    
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def session_response(session, added=None, removed=None):
+    body = {
+        'session_id': session.session_id,
+        'matched_symptoms': [
+            {'symptom': s, 'confidence': c} for s, c in session.used_symptoms
+        ],
+        'predictions': format_predictions(sessions.predictions(session)),
+        'suggestions': [
+            {'symptom': s, 'information_gain': gain} for s, gain in sessions.suggest(session)
+        ]
+    }
+    if added is not None:
+        body['added'] = added
+        body['removed'] = removed
+    return body
+
+@app.route('/session', methods=['POST'])
+def create_session():
+    """Open a diagnosis session, optionally with initial symptoms"""
+    if sessions is None:
+        return jsonify({'error': 'Diagnosis sessions are disabled'}), 404
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        session = sessions.create()
+        added, removed = sessions.update(session, add=data.get('symptoms', []))
+        return jsonify(session_response(session, added, removed)), 201
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/session/<session_id>', methods=['GET', 'DELETE'])
+def session_state(session_id):
+    if sessions is None:
+        return jsonify({'error': 'Diagnosis sessions are disabled'}), 404
+    
+    if request.method == 'DELETE':
+        if not sessions.delete(session_id):
+            return jsonify({'error': 'Unknown or expired session'}), 404
+        return jsonify({'deleted': session_id})
+    
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown or expired session'}), 404
+    return jsonify(session_response(session))
+
+@app.route('/session/<session_id>/symptoms', methods=['POST'])
+def update_session(session_id):
+    """
+    Add, remove or rule out symptoms: {"add": [...], "remove": [...], "absent": [...]}
+    remove takes matched vocabulary symptoms, as listed in matched_symptoms
+    """
+    if sessions is None:
+        return jsonify({'error': 'Diagnosis sessions are disabled'}), 404
+    
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown or expired session'}), 404
+    
+    try:
+        data = request.json
+        added, removed = sessions.update(
+            session,
+            add=data.get('add', []),
+            remove=data.get('remove', []),
+            absent=data.get('absent', [])
+        )
+        return jsonify(session_response(session, added, removed))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/debug/memory')
+def debug_memory():
+    if request_memory is None:
+        return jsonify({'error': 'Memory profiling is disabled (MEMORY_PROFILING=0)'}), 404
+    
+    extra = {'disease_info': disease_info} if predictor.disease_info is None else None
+    return jsonify(memory_report(
+        predictor, extra=extra, requests=request_memory, top=request.args.get('top', 10, type=int)
+    ))
+
+@app.route('/metrics')
+def metrics_endpoint():
+    if metrics is None:
+        return jsonify({'error': 'Metrics are disabled (METRICS_ENABLED=0)'}), 404
+    
+    # Match cache counters are kept by the cache itself; copy them in
+    cache = predictor.matcher.match_cache
+    if cache is not None:
+        cache_gauge = metrics.gauge(
+            'symptom_match_cache', 'Symptom match cache statistics', ('stat',)
+        )
+        for stat in ('size', 'maxsize', 'hits', 'misses', 'evictions'):
+            cache_gauge.set(cache.stats()[stat], stat)
+    
+    if response_cache is not None:
+        response_gauge = metrics.gauge(
+            'predict_response_cache', 'Assembled /predict response cache statistics', ('stat',)
+        )
+        stats = response_cache.stats()
+        for stat in ('size', 'maxsize', 'hits', 'misses', 'evictions', 'invalidations'):
+            response_gauge.set(stats[stat], stat)
+    
+    if sessions is not None:
+        session_gauge = metrics.gauge(
+            'diagnosis_sessions', 'Diagnosis session store statistics', ('stat',)
+        )
+        for stat, value in sessions.stats().items():
+            session_gauge.set(value, stat)
+    
+    if predictor.cascade is not None:
+        cascade_gauge = metrics.gauge(
+            'prediction_cascade', 'Cascade escalation rate and per-tier cost', ('stat',)
+        )
+        for stat, value in predictor.cascade.stats().items():
+            if stat != 'model':
+                cascade_gauge.set(value, stat)
+    
+    rss = rss_bytes()
+    if rss is not None:
+        metrics.gauge(
+            'process_resident_memory_bytes', 'Resident memory size in bytes'
+        ).set(rss)
+    
+    alias_gauge = metrics.gauge(
+        'symptom_alias_index', 'Symptom alias index statistics', ('stat',)
+    )
+    for stat, value in predictor.matcher.aliases.stats().items():
+        alias_gauge.set(value, stat)
+    
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
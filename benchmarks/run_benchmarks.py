@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.nlp.symptom_matcher import SymptomMatcher
+from src.utils.synthetic import make_inputs, make_symptom_lists
+
+INPUT_KINDS = ('exact', 'typo', 'paraphrase', 'unknown')
+DATASET_PATH = os.path.join(project_root, 'data/raw/dataset.csv')
+
+
+def time_calls(func, inputs):
+    """Call func once per input and return per-call latencies in seconds"""
+    latencies = np.empty(len(inputs))
+    for i, item in enumerate(inputs):
+        start = time.perf_counter()
+        func(item)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def summarize(latencies, items_per_call=1):
+    """Latency percentiles in microseconds plus throughput"""
+    latencies = np.asarray(latencies)
+    return {
+        'n': int(len(latencies)),
+        'mean_us': float(latencies.mean() * 1e6),
+        'p50_us': float(np.percentile(latencies, 50) * 1e6),
+        'p95_us': float(np.percentile(latencies, 95) * 1e6),
+        'p99_us': float(np.percentile(latencies, 99) * 1e6),
+        'items_per_sec': float(items_per_call * len(latencies) / latencies.sum())
+    }
+
+
+def bench_matching(predictor, n):
+    """Each cascade stage on its own, then the full uncached cascade"""
+    matcher = predictor.matcher
+    matcher._load_nlp()
+    results = {}
+
+    for kind in INPUT_KINDS:
+        inputs = make_inputs(predictor.symptom_list, kind, n, seed=1)
+        for stage in SymptomMatcher.MATCH_STAGES:
+            if stage == 'semantic' and matcher.symptom_embeddings is None:
+                continue
+            results[f'match.{stage}.{kind}'] = summarize(
+                time_calls(lambda x: matcher.match_stage(stage, x), inputs)
+            )
+        results[f'match.cascade.{kind}'] = summarize(
+            time_calls(lambda x: matcher._match_symptom(x.lower().strip(), 80), inputs)
+        )
+    return results
+
+
+def bench_prediction(predictor, n, batch_sizes=(1, 16, 128)):
+    """predict with a cold and a warm match cache, and predict_batch"""
+    cases = make_symptom_lists(predictor.symptom_list, n, seed=2)
+    results = {}
+
+    match_cache = predictor.matcher.match_cache
+    predictor.matcher.match_cache = None
+    try:
+        results['predict.uncached'] = summarize(time_calls(predictor.predict, cases))
+    finally:
+        predictor.matcher.match_cache = match_cache
+
+    if match_cache is not None:
+        for case in cases:
+            predictor.predict(case)
+        results['predict.cached'] = summarize(time_calls(predictor.predict, cases))
+
+    for size in batch_sizes:
+        batches = [cases[i:i + size] for i in range(0, len(cases) - size + 1, size)]
+        if batches:
+            results[f'predict_batch.{size}'] = summarize(
+                time_calls(predictor.predict_batch, batches), items_per_call=size
+            )
+    return results
+
+
+def bench_suggestions(predictor, n):
+    """Autocomplete on keystroke prefixes of exact and typo'd terms"""
+    results = {}
+    for kind in ('exact', 'typo'):
+        terms = make_inputs(predictor.symptom_list, kind, n, seed=3)
+        prefixes = [term[:length] for term in terms for length in (2, 4, 7)]
+        results[f'suggest.{kind}'] = summarize(
+            time_calls(predictor.get_symptom_suggestions, prefixes)
+        )
+    return results
+
+
+def bench_preprocessing(scales, repeat=3):
+    """Preprocessor throughput on scaled-up copies of the raw dataset"""
+    from src.data.preprocessor import DiseaseDataPreprocessor
+
+    df = pd.read_csv(DATASET_PATH)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for scale in scales:
+            path = os.path.join(tmpdir, f'dataset_x{scale}.csv')
+            pd.concat([df] * scale, ignore_index=True).to_csv(path, index=False)
+
+            latencies = []
+            for _ in range(repeat):
+                preprocessor = DiseaseDataPreprocessor()
+                start = time.perf_counter()
+                preprocessor.build_sparse_features(path)
+                latencies.append(time.perf_counter() - start)
+            results[f'preprocess.x{scale}'] = summarize(latencies, items_per_call=len(df) * scale)
+    return results
+
+
+def run_benchmarks(n=200, scales=(1, 10), preprocessing=True):
+    predictor = DiseasePredictor(
+        model_path=os.path.join(project_root, 'models/best_model.pkl'),
+        vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl')
+    )
+
+    results = {}
+    results.update(bench_matching(predictor, n))
+    results.update(bench_prediction(predictor, n))
+    results.update(bench_suggestions(predictor, n))
+    if preprocessing:
+        try:
+            results.update(bench_preprocessing(scales))
+        except LookupError:
+            print("Warning: skipping preprocessing benchmarks, NLTK data is not installed")
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'semantic_stage': predictor.matcher.symptom_embeddings is not None,
+            'n': n
+        },
+        'results': results
+    }
+
+
+def compare(current, baseline, tolerance=0.25, metric='p50_us'):
+    """
+    Compare two runs on metric
+    Returns: list of (name, baseline, current, ratio, regressed) rows
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or not base[metric]:
+            continue
+        ratio = result[metric] / base[metric]
+        rows.append((name, base[metric], result[metric], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def print_results(report):
+    print(f"{'benchmark':<32} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'items/s':>12}")
+    print("-" * 78)
+    for name, r in report['results'].items():
+        print(f"{name:<32} {r['p50_us']:>10.1f} {r['p95_us']:>10.1f} "
+              f"{r['p99_us']:>10.1f} {r['items_per_sec']:>12.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark matching, prediction and preprocessing')
+    parser.add_argument('--n', type=int, default=200, help='Synthetic inputs per benchmark')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help='Dataset copies for preprocessing benchmarks')
+    parser.add_argument('--skip-preprocessing', action='store_true')
+    parser.add_argument('--output', help='Save results as a JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before flagging a regression (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print("BENCHMARKS")
+    print("=" * 78)
+    report = run_benchmarks(args.n, args.scales, not args.skip_preprocessing)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance)
+
+        print(f"\nComparison with {args.compare} (p50, tolerance {args.tolerance:.0%}):")
+        print("-" * 78)
+        for name, base, current, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:<32} {base:>10.1f} -> {current:>10.1f}  x{ratio:5.2f}  {flag}")
+
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond tolerance")
+            sys.exit(1)
+        print("\n✓ No regressions")
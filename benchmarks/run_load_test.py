@@ -0,0 +1,330 @@
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import joblib
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.synthetic import make_inputs, make_symptom_lists
+
+APP_DIR = os.path.join(project_root, 'app')
+ENDPOINTS = {'predict': '/predict', 'suggest': '/suggest_symptoms'}
+# Server settings recorded with each run so runs can be told apart
+SERVER_SETTINGS = (
+    'PREDICT_BATCHING', 'PREDICT_MAX_BATCH_SIZE', 'PREDICT_MAX_WAIT_MS',
+    'RESPONSE_CACHE_SIZE', 'CASCADE_MODEL_PATH', 'NLP_MODEL', 'WEB_CONCURRENCY'
+)
+
+
+def make_workload(vocabulary, n, mix=(('predict', 0.8), ('suggest', 0.2)),
+                  min_len=1, max_len=8, seed=0):
+    """
+    Generate n user tasks from the vocabulary
+
+    A predict task is one /predict request with 1 to max_len symptoms
+    (exact, typo'd, paraphrased or unknown). A suggest task is an
+    autocomplete keystroke stream: /suggest_symptoms for each growing
+    prefix of one exact or typo'd term, sent back to back.
+
+    Returns:
+        List of tasks, each a list of (endpoint, payload) requests
+    """
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in mix]
+    weights = [weight for _, weight in mix]
+    task_kinds = rng.choices(kinds, weights, k=n)
+
+    cases = iter(make_symptom_lists(
+        vocabulary, task_kinds.count('predict'), min_len, min(max_len, len(vocabulary)), seed=seed
+    ))
+    n_suggest = task_kinds.count('suggest')
+    terms = {
+        'exact': iter(make_inputs(vocabulary, 'exact', n_suggest, seed=seed)),
+        'typo': iter(make_inputs(vocabulary, 'typo', n_suggest, seed=seed + 1))
+    }
+
+    tasks = []
+    for kind in task_kinds:
+        if kind == 'predict':
+            tasks.append([('predict', {'symptoms': next(cases)})])
+        elif kind == 'suggest':
+            term = next(terms[rng.choice(('exact', 'typo'))])
+            tasks.append([
+                ('suggest', {'partial': term[:length]})
+                for length in range(2, min(len(term), 12) + 1)
+            ])
+        else:
+            raise ValueError(f"Unknown task kind: {kind}")
+    rng.shuffle(tasks)
+    return tasks
+
+
+def http_sender(base_url):
+    """Sender factory for a running server; each worker keeps one connection"""
+    parts = urlsplit(base_url)
+
+    def make_sender():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+        def send(endpoint, payload):
+            body = json.dumps(payload)
+            try:
+                connection.request('POST', parts.path.rstrip('/') + ENDPOINTS[endpoint], body,
+                                   {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, OSError):
+                # Reconnect on the next request
+                connection.close()
+                raise
+        return send
+
+    return make_sender
+
+
+def load_app():
+    """Import app/app.py in-process (its paths are relative to app/)"""
+    cwd = os.getcwd()
+    sys.path.insert(0, APP_DIR)
+    os.chdir(APP_DIR)
+    try:
+        import app as app_module
+    finally:
+        os.chdir(cwd)
+    return app_module.app
+
+
+def flask_client_sender(flask_app):
+    """Sender factory that calls the app through Flask's test client"""
+    def make_sender():
+        client = flask_app.test_client()
+
+        def send(endpoint, payload):
+            return client.post(ENDPOINTS[endpoint], json=payload).status_code
+        return send
+
+    return make_sender
+
+
+def run_load(make_sender, tasks, concurrency, duration=None):
+    """
+    Drive the tasks with a closed loop of concurrency workers
+
+    Workers take the next task and send its requests in order. With
+    duration set, tasks are cycled until that many seconds have passed,
+    otherwise every task runs once.
+
+    Returns:
+        (records, elapsed seconds); a record is (endpoint, status,
+        latency seconds) and status is None when the request raised
+    """
+    task_iter = itertools.cycle(tasks) if duration else iter(tasks)
+    lock = threading.Lock()
+    records = []
+    deadline = None
+
+    def worker():
+        send = make_sender()
+        local = []
+        while True:
+            with lock:
+                task = next(task_iter, None)
+            if task is None or (deadline and time.perf_counter() >= deadline):
+                break
+            for endpoint, payload in task:
+                start = time.perf_counter()
+                try:
+                    status = send(endpoint, payload)
+                except Exception:
+                    status = None
+                local.append((endpoint, status, time.perf_counter() - start))
+        with lock:
+            records.extend(local)
+
+    start = time.perf_counter()
+    if duration:
+        deadline = start + duration
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - start
+
+
+def summarize(records, elapsed):
+    """
+    Throughput, latency percentiles (ms) and error rates per endpoint and
+    overall. Server errors (5xx) and failed requests count as errors;
+    4xx (e.g. /predict finding no symptom) are reported separately.
+    """
+    groups = {'all': records}
+    for endpoint in sorted({r[0] for r in records}):
+        groups[endpoint] = [r for r in records if r[0] == endpoint]
+
+    summary = {}
+    for name, group in groups.items():
+        if not group:
+            continue
+        latencies = np.array([r[2] for r in group]) * 1000
+        statuses = [r[1] for r in group]
+        errors = sum(1 for s in statuses if s is None or s >= 500)
+        client_errors = sum(1 for s in statuses if s is not None and 400 <= s < 500)
+        summary[name] = {
+            'requests': len(group),
+            'throughput_rps': len(group) / elapsed if elapsed else 0.0,
+            'mean_ms': float(latencies.mean()),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(latencies.max()),
+            'errors': errors,
+            'error_rate': errors / len(group),
+            'client_error_rate': client_errors / len(group)
+        }
+    return summary
+
+
+def run_load_test(make_sender, vocabulary, concurrency_levels=(1, 4, 16), tasks=500,
+                  duration=None, mix=(('predict', 0.8), ('suggest', 0.2)), warmup=20,
+                  seed=0, target='', label=''):
+    """
+    Run the workload at each concurrency level
+
+    Returns:
+        Report dict with meta and one summary per concurrency level
+    """
+    workload = make_workload(vocabulary, tasks, mix, seed=seed)
+    if warmup:
+        run_load(make_sender, workload[:warmup], 1)
+
+    runs = {}
+    for concurrency in concurrency_levels:
+        records, elapsed = run_load(make_sender, workload, concurrency, duration)
+        runs[str(concurrency)] = summarize(records, elapsed)
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'label': label,
+            'target': target,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tasks': tasks,
+            'duration': duration,
+            'mix': dict(mix),
+            'settings': {k: os.environ[k] for k in SERVER_SETTINGS if k in os.environ}
+        },
+        'runs': runs
+    }
+
+
+def compare(current, baseline, tolerance=0.25, metric='p95_ms'):
+    """
+    Compare two reports on latency metric and throughput per concurrency level
+    Returns: list of (name, baseline, current, ratio, regressed) rows
+    """
+    rows = []
+    for concurrency, summary in current['runs'].items():
+        base_summary = baseline['runs'].get(concurrency, {})
+        for endpoint, result in summary.items():
+            base = base_summary.get(endpoint)
+            if base is None:
+                continue
+            name = f"c{concurrency}.{endpoint}"
+            if base[metric]:
+                ratio = result[metric] / base[metric]
+                rows.append((f"{name}.{metric}", base[metric], result[metric], ratio,
+                             ratio > 1 + tolerance))
+            if result['throughput_rps']:
+                ratio = base['throughput_rps'] / result['throughput_rps']
+                rows.append((f"{name}.rps", base['throughput_rps'], result['throughput_rps'],
+                             ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def print_report(report):
+    print(f"{'run':<18} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'4xx':>6}")
+    print("-" * 80)
+    for concurrency, summary in report['runs'].items():
+        for endpoint, r in summary.items():
+            name = f"c{concurrency}.{endpoint}"
+            print(f"{name:<18} {r['requests']:>9} {r['throughput_rps']:>9.1f} {r['p50_ms']:>8.2f} "
+                  f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['error_rate']:>7.1%} "
+                  f"{r['client_error_rate']:>6.1%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Load-test /predict and /suggest_symptoms; against --url, or in-process '
+                    'through the Flask test client when no URL is given'
+    )
+    parser.add_argument('--url', help='Base URL of a running app, e.g. http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--tasks', type=int, default=500, help='Distinct generated user tasks')
+    parser.add_argument('--duration', type=float,
+                        help='Seconds per concurrency level (cycles tasks); default runs each task once')
+    parser.add_argument('--predict-share', type=float, default=0.8,
+                        help='Share of tasks that are /predict calls; the rest are keystroke streams')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--label', default='', help='Name for this run, e.g. the server settings')
+    parser.add_argument('--output', help='Save the report as JSON')
+    parser.add_argument('--compare', help='Report JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before flagging a regression (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    vocabulary = sorted(joblib.load(args.vocab)['symptoms'])
+    if args.url:
+        make_sender, target = http_sender(args.url), args.url
+    else:
+        make_sender, target = flask_client_sender(load_app()), 'in-process'
+
+    mix = (('predict', args.predict_share), ('suggest', 1 - args.predict_share))
+    print("=" * 80)
+    print(f"LOAD TEST ({target})")
+    print("=" * 80)
+    report = run_load_test(
+        make_sender, vocabulary, args.concurrency, args.tasks, args.duration, mix,
+        args.warmup, args.seed, target, args.label
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance)
+
+        label = baseline['meta'].get('label') or args.compare
+        print(f"\nComparison with {label} (p95 and throughput, tolerance {args.tolerance:.0%}):")
+        print("-" * 80)
+        for name, base, current, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:<32} {base:>10.2f} -> {current:>10.2f}  x{ratio:5.2f}  {flag}")
+
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond tolerance")
+            sys.exit(1)
+        print("\n✓ No regressions")
@@ -0,0 +1,52 @@
+import os
+
+# Serving options for app/app.py, overridable through environment variables
+
+# Gather concurrent /predict requests into one vectorized model call
+PREDICT_BATCHING = os.environ.get('PREDICT_BATCHING', '0') == '1'
+PREDICT_MAX_BATCH_SIZE = int(os.environ.get('PREDICT_MAX_BATCH_SIZE', '32'))
+PREDICT_MAX_WAIT_MS = float(os.environ.get('PREDICT_MAX_WAIT_MS', '2'))
+
+# Per-stage latency instrumentation exposed at /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+
+# Lay synonyms resolved by the matcher's alias index (missing file = none)
+SYMPTOM_SYNONYMS_PATH = os.environ.get('SYMPTOM_SYNONYMS_PATH', '../data/symptom_synonyms.json')
+
+# Serve from a model bundle (python -m src.models.bundle) instead of the
+# pickled model, e.g. '../models/bundle'. The bundle is only used while it
+# matches the source model, vocabulary and disease info files.
+MODEL_BUNDLE_PATH = os.environ.get('MODEL_BUNDLE_PATH', '')
+
+# Accept clinician-confirmed cases at /update and hot-swap the updated model
+ONLINE_UPDATES_ENABLED = os.environ.get('ONLINE_UPDATES_ENABLED', '0') == '1'
+
+# Assembled /predict responses cached per matched symptom set (0 disables)
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '4096'))
+
+def default_nlp_model(project_root):
+    """
+    Word vectors for semantic matching: the compact table exported by
+    python -m src.nlp.word_vectors when present under project_root,
+    otherwise the spaCy model
+    """
+    path = os.path.join(project_root, 'models/word_vectors')
+    return path if os.path.exists(os.path.join(path, 'vectors.npy')) else 'en_core_web_md'
+
+NLP_MODEL = os.environ.get('NLP_MODEL') or default_nlp_model('..')
+
+# Stateful diagnosis sessions at /session: idle sessions expire after
+# SESSION_TTL_SECONDS and at most SESSION_MAX_COUNT are kept (0 disables)
+SESSION_MAX_COUNT = int(os.environ.get('SESSION_MAX_COUNT', '10000'))
+SESSION_TTL_SECONDS = float(os.environ.get('SESSION_TTL_SECONDS', '1800'))
+
+# Optional second model for low-confidence predictions: when the fast
+# model's top-1/top-2 probability margin is below CASCADE_MARGIN the case
+# is re-scored by CASCADE_MODEL_PATH (pick both with python -m src.models.cascade)
+CASCADE_MODEL_PATH = os.environ.get('CASCADE_MODEL_PATH', '')
+CASCADE_MARGIN = float(os.environ.get('CASCADE_MARGIN', '0.2'))
+
+# Memory profiling: traces allocations from startup and serves a per-component
+# and per-request breakdown at /debug/memory. Tracing slows every request and
+# requests are handled one at a time, so only enable it on a debug instance.
+MEMORY_PROFILING = os.environ.get('MEMORY_PROFILING', '0') == '1'
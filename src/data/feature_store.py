@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+STORE_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+BITS_FILE = 'bits.bin'
+INDPTR_FILE = 'indptr.bin'
+INDICES_FILE = 'indices.bin'
+LABELS_FILE = 'labels.bin'
+FORMATS = ('packed', 'sparse')
+
+
+def _index_dtype(n_features):
+    return np.uint16 if n_features <= np.iinfo(np.uint16).max else np.uint32
+
+
+def _as_csr(X):
+    """CSR view of a feature chunk (dense 0/1 arrays are converted)"""
+    X = sparse.csr_matrix(X)
+    X.sum_duplicates()
+    X.eliminate_zeros()
+    return X
+
+
+def store_nbytes(X, layout):
+    """On-disk size of the features of X (no labels) in a layout"""
+    n_rows, n_features = X.shape
+    if layout == 'packed':
+        return n_rows * ((n_features + 7) // 8)
+    nnz = _as_csr(X).nnz if sparse.issparse(X) else int(np.count_nonzero(X))
+    return nnz * np.dtype(_index_dtype(n_features)).itemsize + (n_rows + 1) * 8
+
+
+class FeatureStoreWriter:
+    """
+    Append binary feature rows (and labels) to an on-disk feature store
+
+    Features are 0/1 symptom indicators. 'packed' stores one bit per
+    symptom per row; 'sparse' stores the active column indices with
+    row offsets, which is smaller when rows have few symptoms. Files
+    are raw little-endian arrays described by manifest.json, so chunks
+    can be appended without holding the matrix in memory.
+    """
+
+    def __init__(self, path, n_features, layout='packed'):
+        if layout not in FORMATS:
+            raise ValueError(f"Unknown feature store layout: {layout}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.n_features = n_features
+        self.layout = layout
+        self.n_rows = 0
+        self.nnz = 0
+        self.has_labels = None
+        self.label_dtype = None
+
+        self._files = {}
+        if layout == 'packed':
+            self._files['bits'] = open(os.path.join(path, BITS_FILE), 'wb')
+        else:
+            self._files['indptr'] = open(os.path.join(path, INDPTR_FILE), 'wb')
+            self._files['indices'] = open(os.path.join(path, INDICES_FILE), 'wb')
+            np.zeros(1, dtype='<i8').tofile(self._files['indptr'])
+
+    def append(self, X, y=None):
+        """Append a chunk of rows (CSR or dense) and optional integer labels"""
+        X = _as_csr(X)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Chunk has {X.shape[1]} features, expected {self.n_features}")
+        if X.nnz and not np.all(X.data == 1):
+            raise ValueError("Feature store rows must be binary (0/1)")
+
+        if y is not None:
+            y = np.asarray(y)
+            if len(y) != X.shape[0]:
+                raise ValueError(f"{len(y)} labels for {X.shape[0]} rows")
+        if self.has_labels is None:
+            self.has_labels = y is not None
+            if self.has_labels:
+                self.label_dtype = '<i4' if np.abs(y).max(initial=0) < 2 ** 31 else '<i8'
+                self._files['labels'] = open(os.path.join(self.path, LABELS_FILE), 'wb')
+        elif self.has_labels != (y is not None):
+            raise ValueError("Either every chunk or no chunk must have labels")
+
+        if self.layout == 'packed':
+            dense = np.zeros(X.shape, dtype=np.uint8)
+            dense[X.nonzero()] = 1
+            np.packbits(dense, axis=1, bitorder='little').tofile(self._files['bits'])
+        else:
+            X.sort_indices()
+            X.indices.astype('<' + np.dtype(_index_dtype(self.n_features)).str[1:]).tofile(
+                self._files['indices']
+            )
+            (X.indptr[1:].astype('<i8') + self.nnz).tofile(self._files['indptr'])
+
+        if self.has_labels:
+            y.astype(self.label_dtype).tofile(self._files['labels'])
+        self.n_rows += X.shape[0]
+        self.nnz += X.nnz
+
+    def close(self):
+        """Flush the data files and write the manifest; returns it"""
+        for f in self._files.values():
+            f.close()
+        manifest = {
+            'format_version': STORE_FORMAT_VERSION,
+            'layout': self.layout,
+            'shape': [self.n_rows, self.n_features],
+            'nnz': self.nnz,
+            'index_dtype': np.dtype(_index_dtype(self.n_features)).name,
+            'labels': bool(self.has_labels),
+            'label_dtype': self.label_dtype
+        }
+        with open(os.path.join(self.path, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_features(path, X, y=None, layout='auto', chunksize=100000):
+    """
+    Write a binary feature matrix (and labels) as a feature store
+
+    layout='auto' picks whichever of 'packed' and 'sparse' is smaller.
+
+    Returns:
+        The store manifest
+    """
+    if layout == 'auto':
+        layout = min(FORMATS, key=lambda name: store_nbytes(X, name))
+    with FeatureStoreWriter(path, X.shape[1], layout) as writer:
+        for start in range(0, X.shape[0], chunksize):
+            stop = start + chunksize
+            writer.append(X[start:stop], None if y is None else y[start:stop])
+    return load_manifest(path)
+
+
+def load_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+class FeatureStore:
+    """
+    Read a feature store in row chunks, memory-mapped by default
+
+    Only the rows of the chunk being read are paged in and expanded, so
+    stores much larger than RAM can be scored chunk by chunk.
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        self.manifest = load_manifest(path)
+        if self.manifest['format_version'] > STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Feature store format {self.manifest['format_version']} is newer than "
+                f"supported format {STORE_FORMAT_VERSION}"
+            )
+        self.layout = self.manifest['layout']
+        self.shape = tuple(self.manifest['shape'])
+        n_rows, n_features = self.shape
+
+        if self.layout == 'packed':
+            self.bits = self._load(BITS_FILE, np.uint8, (n_rows, (n_features + 7) // 8), mmap)
+        else:
+            self.indptr = self._load(INDPTR_FILE, '<i8', (n_rows + 1,), mmap)
+            self.indices = self._load(INDICES_FILE, '<' + np.dtype(self.manifest['index_dtype']).str[1:],
+                                      (self.manifest['nnz'],), mmap)
+
+        self.labels = None
+        if self.manifest['labels']:
+            self.labels = self._load(LABELS_FILE, self.manifest['label_dtype'], (n_rows,), mmap)
+
+    def _load(self, filename, dtype, shape, mmap):
+        filepath = os.path.join(self.path, filename)
+        if not np.prod(shape):
+            return np.zeros(shape, dtype=dtype)
+        if mmap:
+            return np.memmap(filepath, dtype=dtype, mode='r', shape=shape)
+        return np.fromfile(filepath, dtype=dtype).reshape(shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def nbytes(self):
+        """Size of the feature and label files"""
+        arrays = [self.bits] if self.layout == 'packed' else [self.indptr, self.indices]
+        if self.labels is not None:
+            arrays.append(self.labels)
+        return int(sum(array.nbytes for array in arrays))
+
+    def rows(self, start, stop):
+        """Rows start:stop as a float64 CSR matrix"""
+        stop = min(stop, self.shape[0])
+        if self.layout == 'packed':
+            dense = np.unpackbits(self.bits[start:stop], axis=1, count=self.shape[1],
+                                  bitorder='little')
+            return sparse.csr_matrix(dense, dtype=np.float64)
+
+        indptr = np.asarray(self.indptr[start:stop + 1])
+        indices = np.asarray(self.indices[indptr[0]:indptr[-1]], dtype=np.int32)
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr - indptr[0]),
+            shape=(stop - start, self.shape[1])
+        )
+
+    def iter_chunks(self, chunksize=100000):
+        """
+        Yields:
+            (start row, CSR features, labels or None) per chunk
+        """
+        for start in range(0, self.shape[0], chunksize):
+            stop = min(start + chunksize, self.shape[0])
+            labels = None if self.labels is None else np.asarray(self.labels[start:stop])
+            yield start, self.rows(start, stop), labels
+
+    def to_csr(self):
+        """The whole matrix in memory"""
+        return self.rows(0, self.shape[0])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Convert a dense .npy or sparse .npz feature matrix to a memory-mappable feature store'
+    )
+    parser.add_argument('features', help='X .npy (dense) or .npz (scipy sparse) file')
+    parser.add_argument('output', help='Feature store directory to write')
+    parser.add_argument('--labels', help='y .npy file of encoded labels')
+    parser.add_argument('--layout', choices=('auto',) + FORMATS, default='auto')
+    args = parser.parse_args()
+
+    if args.features.endswith('.npz'):
+        X = sparse.load_npz(args.features).tocsr()
+    else:
+        X = np.load(args.features, mmap_mode='r')
+    y = np.load(args.labels) if args.labels else None
+
+    manifest = save_features(args.output, X, y, layout=args.layout)
+    store = FeatureStore(args.output)
+    source_bytes = os.path.getsize(args.features) + (os.path.getsize(args.labels) if args.labels else 0)
+    print(f"✓ Wrote {manifest['shape'][0]:,} x {manifest['shape'][1]} features "
+          f"({manifest['nnz']:,} non-zeros) as '{manifest['layout']}' to {args.output}")
+    print(f"  {source_bytes / 1e3:,.1f} KB -> {store.nbytes / 1e3:,.1f} KB "
+          f"({source_bytes / store.nbytes:.0f}x smaller)")
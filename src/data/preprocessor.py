@@ -1,30 +1,73 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from sklearn.preprocessing import LabelEncoder
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import re
 
-# Download required NLTK data
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4'
+}
+
+def download_nltk_data():
+    """Download required NLTK data, skipping anything already installed"""
+    for resource, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(resource)
+
+OUTPUT_FILES = ('X_features.npz', 'y_target.npy', 'vocabulary.pkl')
+
+def existing_outputs(output_dir, feature_store=False):
+    """Files the CLI would overwrite in output_dir"""
+    names = OUTPUT_FILES + (('features',) if feature_store else ())
+    return [name for name in names if os.path.exists(os.path.join(output_dir, name))]
 
 class DiseaseDataPreprocessor:
-    def __init__(self):
+    def __init__(self, lemmatizer=None):
+        """
+        Args:
+            lemmatizer: Object with a lemmatize(word) method; defaults to
+                NLTK's WordNetLemmatizer (its corpora are downloaded if missing)
+        """
+        self.stop_words = set()
+        if lemmatizer is None:
+            download_nltk_data()
+            lemmatizer = WordNetLemmatizer()
+            self.stop_words = set(stopwords.words('english'))
         self.label_encoder = LabelEncoder()
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        self.lemmatizer = lemmatizer
         self.symptom_vocabulary = set()
         
+        # Raw string -> cleaned text, shared by every cleaning path so each
+        # distinct value is normalized once per preprocessor
+        self.normalization_cache = {}
+        self._lemma_cache = {}
+        self.rows_read = 0
+        
     def clean_symptom_text(self, text):
         """Clean and normalize symptom text"""
         if pd.isna(text):
             return ""
         
+        raw = str(text)
+        cached = self.normalization_cache.get(raw)
+        if cached is not None:
+            return cached
+        
         # Convert to lowercase
-        text = str(text).lower()
+        text = raw.lower()
         
         # Remove special characters and numbers
         text = re.sub(r'[^a-zA-Z\s]', '', text)
@@ -34,9 +77,57 @@ class DiseaseDataPreprocessor:
         
         # Lemmatize
         words = text.split()
-        words = [self.lemmatizer.lemmatize(word) for word in words]
+        words = [self._lemmatize(word) for word in words]
+        
+        cleaned = ' '.join(words)
+        self.normalization_cache[raw] = cleaned
+        return cleaned
+    
+    def _lemmatize(self, word):
+        lemma = self._lemma_cache.get(word)
+        if lemma is None:
+            lemma = self._lemma_cache[word] = self.lemmatizer.lemmatize(word)
+        return lemma
+    
+    def clean_symptom_values(self, values):
+        """
+        Vectorized clean_symptom_text for an array of raw values
+        Only values missing from normalization_cache are cleaned.
+        Returns: list of cleaned strings
+        """
+        series = pd.Series(values, dtype=object)
+        missing = series.isna().to_numpy()
+        raw = series.astype(str)
+        
+        cache = self.normalization_cache
+        cleaned = [
+            "" if is_missing else cache.get(value)
+            for is_missing, value in zip(missing, raw)
+        ]
         
-        return ' '.join(words)
+        todo = [i for i, value in enumerate(cleaned) if value is None]
+        if todo:
+            words = (
+                raw.iloc[todo]
+                .str.lower()
+                .str.replace(r'[^a-zA-Z\s]', '', regex=True)
+                .str.split()
+            )
+            for i, row_words in zip(todo, words):
+                cleaned[i] = ' '.join(self._lemmatize(word) for word in row_words)
+                cache[raw.iat[i]] = cleaned[i]
+        
+        return cleaned
+    
+    def _clean_cells(self, values):
+        """
+        Clean a 2D object array of raw symptom cells, once per distinct value
+        Returns: (codes, cleaned_uniques) where codes has the shape of values
+        and indexes cleaned_uniques; missing cells point at a trailing ""
+        """
+        codes, uniques = pd.factorize(values.ravel())
+        cleaned_uniques = self.clean_symptom_values(uniques) + [""]
+        return codes.reshape(values.shape), cleaned_uniques
     
     def prepare_dataset(self, df, symptom_columns):
         """
@@ -44,22 +135,18 @@ class DiseaseDataPreprocessor:
         df: DataFrame with Disease and symptom columns
         symptom_columns: List of column names containing symptoms
         """
-        processed_data = []
+        codes, cleaned_uniques = self._clean_cells(
+            df[symptom_columns].to_numpy(dtype=object)
+        )
+        cleaned = np.array(cleaned_uniques, dtype=object)[codes]
         
-        for idx, row in df.iterrows():
-            disease = row['Disease']
-            symptoms = []
-            
+        processed_data = []
+        for disease, row in zip(df['Disease'], cleaned):
             # Collect all symptoms for this row
-            for col in symptom_columns:
-                symptom = row[col]
-                if pd.notna(symptom) and str(symptom).strip():
-                    cleaned = self.clean_symptom_text(symptom)
-                    if cleaned:
-                        symptoms.append(cleaned)
-                        self.symptom_vocabulary.add(cleaned)
+            symptoms = [symptom for symptom in row if symptom]
             
             if symptoms:  # Only add if there are symptoms
+                self.symptom_vocabulary.update(symptoms)
                 processed_data.append({
                     'disease': disease,
                     'symptoms': symptoms
@@ -79,21 +166,157 @@ class DiseaseDataPreprocessor:
         # Create feature matrix
         X = np.zeros((len(df), len(symptom_list)))
         
-        for idx, row in df.iterrows():
-            for symptom in row['symptoms']:
-                if symptom in symptom_to_idx:
-                    X[idx, symptom_to_idx[symptom]] = 1
+        lengths = [len(symptoms) for symptoms in df['symptoms']]
+        rows = np.repeat(np.arange(len(df)), lengths)
+        cols = np.array(
+            [symptom_to_idx.get(s, -1) for symptoms in df['symptoms'] for s in symptoms],
+            dtype=np.intp
+        )
+        known = cols >= 0
+        X[rows[known], cols[known]] = 1
         
         # Encode target variable
         y = self.label_encoder.fit_transform(df['disease'])
         
         return X, y, symptom_list
     
+    def _encode_chunk(self, chunk, symptom_columns, disease_column, dtype):
+        """
+        Encode one raw chunk with chunk-local ids, in first-appearance order
+        Returns: (csr_block, symptoms, diseases, targets, n_rows) where the
+        block's columns index symptoms and targets index diseases
+        """
+        columns = symptom_columns or [c for c in chunk.columns if c != disease_column]
+        codes, cleaned_uniques = self._clean_cells(
+            chunk[columns].to_numpy(dtype=object)
+        )
+        
+        # Local column id per distinct cleaned value (-1 for empty)
+        symptom_ids = {}
+        unique_ids = np.array(
+            [symptom_ids.setdefault(s, len(symptom_ids)) if s else -1
+             for s in cleaned_uniques],
+            dtype=np.int64
+        )
+        cell_ids = unique_ids[codes]
+        
+        valid = cell_ids >= 0
+        keep = valid.any(axis=1)
+        kept_ids = cell_ids[keep]
+        kept_valid = valid[keep]
+        block = sparse.csr_matrix(
+            (np.ones(kept_valid.sum(), dtype=dtype),
+             kept_ids[kept_valid],
+             np.concatenate([[0], np.cumsum(kept_valid.sum(axis=1))])),
+            shape=(len(kept_ids), len(symptom_ids))
+        )
+        block.sum_duplicates()
+        block.data[:] = 1
+        
+        disease_ids = {}
+        targets = np.array(
+            [disease_ids.setdefault(d, len(disease_ids))
+             for d in chunk[disease_column].to_numpy(dtype=object)[keep]],
+            dtype=np.int64
+        )
+        
+        return block, list(symptom_ids), list(disease_ids), targets, len(chunk)
+    
+    def build_sparse_features(self, csv_path, chunksize=100000, symptom_columns=None,
+                              disease_column='Disease', dtype=np.float64, n_jobs=1):
+        """
+        Stream a raw CSV in chunks into a sparse feature matrix
+        
+        Gives the same X (as CSR), y and symptom_list as prepare_dataset
+        followed by create_feature_matrix, but only one chunk of raw rows
+        is in memory at a time. Columns are numbered in order of first
+        appearance while streaming and renumbered to sorted order at the end.
+        
+        With n_jobs > 1 chunks are encoded in a process pool (at most
+        2 * n_jobs in flight). Results are merged in chunk order, so the
+        output is identical to n_jobs=1.
+        
+        Returns:
+            X (scipy.sparse.csr_matrix), y, symptom_list
+        """
+        symptom_ids = {}
+        disease_ids = {}
+        blocks = []
+        targets = []
+        self.rows_read = 0
+        
+        def merge(result):
+            block, symptoms, diseases, chunk_targets, n_rows = result
+            self.rows_read += n_rows
+            if not block.shape[0]:
+                return
+            
+            # Map chunk-local ids onto the running provisional ids
+            column_map = np.array(
+                [symptom_ids.setdefault(s, len(symptom_ids)) for s in symptoms],
+                dtype=np.int32
+            )
+            block.indices = column_map[block.indices]
+            blocks.append(block)
+            
+            disease_map = np.array(
+                [disease_ids.setdefault(d, len(disease_ids)) for d in diseases],
+                dtype=np.int64
+            )
+            targets.append(disease_map[chunk_targets])
+        
+        chunks = pd.read_csv(csv_path, chunksize=chunksize)
+        if n_jobs > 1:
+            with ProcessPoolExecutor(
+                n_jobs, initializer=_init_worker,
+                initargs=(dict(self.normalization_cache), self.lemmatizer)
+            ) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(
+                        _encode_chunk_in_worker, chunk, symptom_columns, disease_column, dtype
+                    ))
+                    if len(pending) >= 2 * n_jobs:
+                        merge(pending.popleft().result())
+                while pending:
+                    merge(pending.popleft().result())
+        else:
+            for chunk in chunks:
+                merge(self._encode_chunk(chunk, symptom_columns, disease_column, dtype))
+        
+        self.symptom_vocabulary.update(symptom_ids)
+        symptom_list = sorted(self.symptom_vocabulary)
+        if not blocks:
+            return sparse.csr_matrix((0, len(symptom_list)), dtype=dtype), \
+                np.array([], dtype=np.int64), symptom_list
+        
+        # Renumber provisional columns to sorted symptom order
+        symptom_to_idx = {s: i for i, s in enumerate(symptom_list)}
+        column_map = np.empty(len(symptom_ids), dtype=np.int32)
+        for symptom, provisional in symptom_ids.items():
+            column_map[provisional] = symptom_to_idx[symptom]
+        
+        for block in blocks:
+            block.resize((block.shape[0], len(symptom_list)))
+        X = sparse.vstack(blocks, format='csr')
+        X.indices = column_map[X.indices]
+        X.has_sorted_indices = False
+        X.sort_indices()
+        
+        # Encode target variable
+        disease_names = np.empty(len(disease_ids), dtype=object)
+        for disease, provisional in disease_ids.items():
+            disease_names[provisional] = disease
+        self.label_encoder.fit(disease_names)
+        y = self.label_encoder.transform(disease_names)[np.concatenate(targets)]
+        
+        return X, y, symptom_list
+    
     def save_vocabulary(self, filepath):
         """Save symptom vocabulary for later use"""
         import joblib
         joblib.dump({
-            'symptoms': list(self.symptom_vocabulary),
+            'symptoms': sorted(self.symptom_vocabulary),
             'label_encoder': self.label_encoder
         }, filepath)
     
@@ -102,4 +325,62 @@ class DiseaseDataPreprocessor:
         import joblib
         data = joblib.load(filepath)
         self.symptom_vocabulary = set(data['symptoms'])
-        self.label_encoder = data['label_encoder']
\ No newline at end of file
+        self.label_encoder = data['label_encoder']
+
+# Process pool workers each hold one preprocessor, seeded with the
+# parent's lemmatizer and normalization cache
+_worker_preprocessor = None
+
+def _init_worker(normalization_cache, lemmatizer):
+    global _worker_preprocessor
+    _worker_preprocessor = DiseaseDataPreprocessor(lemmatizer)
+    _worker_preprocessor.normalization_cache.update(normalization_cache)
+
+def _encode_chunk_in_worker(chunk, symptom_columns, disease_column, dtype):
+    return _worker_preprocessor._encode_chunk(chunk, symptom_columns, disease_column, dtype)
+
+if __name__ == '__main__':
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    parser = argparse.ArgumentParser(description='Build sparse training features from a raw symptom CSV')
+    parser.add_argument('--input', default=os.path.join(project_root, 'data/raw/dataset.csv'))
+    parser.add_argument('--output-dir', default=os.path.join(project_root, 'data/processed'),
+                        help='Existing outputs are only replaced with --force')
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--n-jobs', type=int, default=1)
+    parser.add_argument('--feature-store', action='store_true',
+                        help='Also write a memory-mappable feature store to <output-dir>/features')
+    parser.add_argument('--force', action='store_true',
+                        help='Overwrite existing outputs in --output-dir')
+    args = parser.parse_args()
+    
+    existing = existing_outputs(args.output_dir, args.feature_store)
+    if existing and not args.force:
+        parser.error(f"{args.output_dir} already has {', '.join(existing)}; "
+                     "pass --force to overwrite or choose another --output-dir")
+    
+    preprocessor = DiseaseDataPreprocessor()
+    
+    start = time.perf_counter()
+    X, y, symptom_list = preprocessor.build_sparse_features(
+        args.input, chunksize=args.chunksize, n_jobs=args.n_jobs
+    )
+    elapsed = time.perf_counter() - start
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    sparse.save_npz(os.path.join(args.output_dir, 'X_features.npz'), X)
+    np.save(os.path.join(args.output_dir, 'y_target.npy'), y)
+    preprocessor.save_vocabulary(os.path.join(args.output_dir, 'vocabulary.pkl'))
+    if args.feature_store:
+        from src.data.feature_store import save_features
+        manifest = save_features(os.path.join(args.output_dir, 'features'), X, y)
+    
+    print(f"✓ Processed {preprocessor.rows_read} rows in {elapsed:.2f}s "
+          f"({preprocessor.rows_read / elapsed:,.0f} rows/sec, {args.n_jobs} process(es))")
+    print(f"  {X.shape[0]} samples with symptoms, "
+          f"{len(preprocessor.normalization_cache)} distinct raw symptom strings")
+    print(f"  Feature matrix: {X.shape}, {X.nnz} non-zeros")
+    print(f"  {len(symptom_list)} symptoms, {len(preprocessor.label_encoder.classes_)} diseases")
+    if args.feature_store:
+        print(f"  Feature store: '{manifest['layout']}' layout in {args.output_dir}/features")
+    print(f"  Saved to: {args.output_dir}")
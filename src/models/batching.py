@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class PredictionBatcher:
+    """
+    Micro-batching front end for DiseasePredictor.predict
+
+    Request threads call predict() or predict_indices(), which queue the
+    request and wait. One background thread drains the queue and scores
+    everything it took with predict_batch or predict_indices_batch,
+    grouped by (predictor, return_top_n, confidence_threshold).
+
+    A request that finds the queue empty is scored right away, so low
+    load adds no waiting. A batch waits up to max_wait_ms for more
+    requests only once a second request is already waiting.
+    """
+
+    def __init__(self, predictor, max_batch_size=32, max_wait_ms=2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.requests = 0
+
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+        self._thread.start()
+
+    def predict(self, user_symptoms, return_top_n=3, confidence_threshold=0.3, predictor=None):
+        """
+        Same arguments and return value as DiseasePredictor.predict
+        predictor: Score with this predictor instead of self.predictor
+        """
+        return self._submit(
+            predictor, 'symptoms', user_symptoms, return_top_n, confidence_threshold
+        )
+
+    def predict_indices(self, indices, used_symptoms, return_top_n=3, confidence_threshold=0.3,
+                        predictor=None):
+        """
+        Same arguments and return value as DiseasePredictor.predict_indices,
+        for symptoms the caller has already matched
+        predictor: Score with this predictor instead of self.predictor,
+            e.g. the one the indices were matched with
+        """
+        return self._submit(
+            predictor, 'indices', (indices, used_symptoms), return_top_n, confidence_threshold
+        )
+
+    def _submit(self, predictor, kind, payload, return_top_n, confidence_threshold):
+        if self._stopped.is_set():
+            raise RuntimeError("PredictionBatcher is closed")
+
+        future = Future()
+        self._queue.put((predictor if predictor is not None else self.predictor, kind, payload,
+                         return_top_n, confidence_threshold, future))
+        return future.result()
+
+    def close(self, timeout=None):
+        """Stop the background thread after the queued requests are served"""
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self):
+        """Request and batch counts, plus the mean batch size"""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0
+        }
+
+    def _collect(self):
+        """Block for one request, then gather more without delaying a lone request"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if len(batch) == 1 or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            groups = {}
+            for predictor, kind, payload, return_top_n, confidence_threshold, future in batch:
+                key = (id(predictor), kind, return_top_n, confidence_threshold)
+                groups.setdefault(key, (predictor, []))[1].append((payload, future))
+
+            for (_, kind, return_top_n, confidence_threshold), (predictor, items) in groups.items():
+                try:
+                    results = self._score(predictor, kind, [payload for payload, _ in items],
+                                          return_top_n, confidence_threshold)
+                except Exception:
+                    # Don't let one bad request fail the others: score each on its own
+                    self._run_each(predictor, kind, items, return_top_n, confidence_threshold)
+                    continue
+
+                for (_, future), result in zip(items, results):
+                    future.set_result(result)
+
+            self.batches += 1
+            self.requests += len(batch)
+
+    def _score(self, predictor, kind, payloads, return_top_n, confidence_threshold):
+        if kind == 'indices':
+            return predictor.predict_indices_batch(
+                [indices for indices, _ in payloads],
+                [used_symptoms for _, used_symptoms in payloads],
+                return_top_n=return_top_n,
+                confidence_threshold=confidence_threshold
+            )
+        return predictor.predict_batch(
+            payloads, return_top_n=return_top_n, confidence_threshold=confidence_threshold
+        )
+
+    def _run_each(self, predictor, kind, items, return_top_n, confidence_threshold):
+        for payload, future in items:
+            try:
+                result = self._score(
+                    predictor, kind, [payload], return_top_n, confidence_threshold
+                )[0]
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
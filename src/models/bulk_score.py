@@ -0,0 +1,246 @@
+import argparse
+import ast
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import pandas as pd
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+
+DEFAULT_BUNDLE = os.path.join(project_root, 'models/bundle')
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+
+def _is_jsonl(path):
+    return path.lower().endswith(JSONL_EXTENSIONS)
+
+
+def _split_symptoms(value):
+    """A symptoms cell/field as a list: a list, a list literal or a comma/semicolon string"""
+    if isinstance(value, list):
+        return [str(s) for s in value]
+    if not isinstance(value, str):
+        return []
+    value = value.strip()
+    if value.startswith('['):
+        return [str(s) for s in ast.literal_eval(value)]
+    return [s for s in re.split(r'[,;]', value) if s.strip()]
+
+
+def read_cases(path, chunksize=10000, symptom_columns=None, id_column=None):
+    """
+    Stream cases from a CSV or JSONL file in chunks
+
+    JSONL lines are objects with a 'symptoms' list (or string). CSV files
+    either have a 'symptoms' column or one symptom per column, by default
+    every column whose name starts with 'Symptom' (the raw dataset layout).
+    Case ids come from id_column, or are the 0-based row number.
+
+    Yields:
+        (case_ids, symptom_lists) per chunk
+    """
+    row = 0
+    if _is_jsonl(path):
+        with open(path, 'r') as f:
+            lines = (line for line in f if line.strip())
+            while True:
+                records = [json.loads(line) for line in islice(lines, chunksize)]
+                if not records:
+                    return
+                ids = [r.get(id_column, row + i) if id_column else row + i
+                       for i, r in enumerate(records)]
+                yield ids, [_split_symptoms(r.get('symptoms')) for r in records]
+                row += len(records)
+
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+        if 'symptoms' in chunk.columns:
+            symptom_lists = [_split_symptoms(v) for v in chunk['symptoms']]
+        else:
+            columns = symptom_columns or [c for c in chunk.columns if c.startswith('Symptom')]
+            symptom_lists = [
+                [v for v in values if isinstance(v, str) and v.strip()]
+                for values in chunk[columns].itertuples(index=False, name=None)
+            ]
+        if id_column:
+            ids = chunk[id_column].tolist()
+        else:
+            ids = list(range(row, row + len(chunk)))
+        yield ids, symptom_lists
+        row += len(chunk)
+
+
+def load_predictor(bundle_path=None, model_path=None, vocab_path=None, synonyms_path=None,
+                   nlp_model='en_core_web_md'):
+    """Memory-mapped bundle when given, otherwise the pickled model and vocabulary"""
+    if bundle_path:
+        return DiseasePredictor.from_bundle(
+            bundle_path, lazy_nlp=True, mmap=True, synonyms_path=synonyms_path, nlp_model=nlp_model
+        )
+    return DiseasePredictor(model_path, vocab_path, lazy_nlp=True, synonyms_path=synonyms_path,
+                            nlp_model=nlp_model)
+
+
+def score_chunk(predictor, ids, symptom_lists, output_format, top_n=3, threshold=0.3):
+    """
+    Match and score one chunk with a single predict_batch call
+
+    Returns:
+        (formatted output text, number of cases, number with a prediction)
+    """
+    results = predictor.predict_batch(symptom_lists, return_top_n=top_n,
+                                      confidence_threshold=threshold)
+    buffer = io.StringIO()
+    scored = 0
+
+    if output_format == 'jsonl':
+        for case_id, (predictions, used_symptoms) in zip(ids, results):
+            scored += bool(predictions)
+            buffer.write(json.dumps({
+                'id': case_id,
+                'predictions': [
+                    {'disease': disease, 'probability': float(probability)}
+                    for disease, probability, _ in predictions
+                ],
+                'matched_symptoms': [symptom for symptom, _ in used_symptoms]
+            }))
+            buffer.write('\n')
+    else:
+        writer = csv.writer(buffer)
+        for case_id, (predictions, used_symptoms) in zip(ids, results):
+            scored += bool(predictions)
+            row = [case_id, ';'.join(symptom for symptom, _ in used_symptoms)]
+            for k in range(top_n):
+                if k < len(predictions):
+                    row += [predictions[k][0], f'{predictions[k][1]:.6f}']
+                else:
+                    row += ['', '']
+            writer.writerow(row)
+
+    return buffer.getvalue(), len(ids), scored
+
+
+def csv_header(top_n):
+    header = ['id', 'matched_symptoms']
+    for k in range(1, top_n + 1):
+        header += [f'disease_{k}', f'probability_{k}']
+    return ','.join(header) + '\n'
+
+
+# Each pool worker loads one predictor; with a bundle the weights are
+# memory-mapped, so all workers share a single physical copy
+_worker_predictor = None
+
+def _init_worker(predictor_args):
+    global _worker_predictor
+    _worker_predictor = load_predictor(**predictor_args)
+
+def _score_chunk_in_worker(ids, symptom_lists, output_format, top_n, threshold):
+    return score_chunk(_worker_predictor, ids, symptom_lists, output_format, top_n, threshold)
+
+
+def bulk_score(input_path, output_path, predictor_args, chunksize=10000, n_jobs=1,
+               top_n=3, threshold=0.3, symptom_columns=None, id_column=None):
+    """
+    Score every case in input_path and write predictions to output_path
+
+    Output is JSONL or CSV depending on the output extension and is
+    written chunk by chunk in input order. With n_jobs > 1 chunks are
+    scored in a process pool with at most 2 * n_jobs chunks in flight,
+    so memory stays bounded regardless of file size.
+
+    Returns:
+        dict with rows, scored, seconds and rows_per_sec
+    """
+    output_format = 'jsonl' if _is_jsonl(output_path) else 'csv'
+    chunks = read_cases(input_path, chunksize, symptom_columns, id_column)
+    totals = {'rows': 0, 'scored': 0}
+    start = time.perf_counter()
+
+    with open(output_path, 'w', newline='') as out:
+        if output_format == 'csv':
+            out.write(csv_header(top_n))
+
+        def write(result):
+            text, n_rows, n_scored = result
+            out.write(text)
+            totals['rows'] += n_rows
+            totals['scored'] += n_scored
+
+        if n_jobs > 1:
+            with ProcessPoolExecutor(
+                n_jobs, initializer=_init_worker, initargs=(predictor_args,)
+            ) as pool:
+                pending = deque()
+                for ids, symptom_lists in chunks:
+                    pending.append(pool.submit(
+                        _score_chunk_in_worker, ids, symptom_lists, output_format, top_n, threshold
+                    ))
+                    if len(pending) >= 2 * n_jobs:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        else:
+            predictor = load_predictor(**predictor_args)
+            for ids, symptom_lists in chunks:
+                write(score_chunk(predictor, ids, symptom_lists, output_format, top_n, threshold))
+
+    elapsed = time.perf_counter() - start
+    totals['seconds'] = elapsed
+    totals['rows_per_sec'] = totals['rows'] / elapsed if elapsed else 0.0
+    return totals
+
+
+if __name__ == '__main__':
+    import config
+    from src.models.bundle import use_bundle
+
+    parser = argparse.ArgumentParser(description='Score a CSV/JSONL file of symptom lists in bulk')
+    parser.add_argument('input', help='CSV or JSONL (.jsonl/.ndjson) file of cases')
+    parser.add_argument('output', help='Predictions file; .jsonl/.ndjson for JSONL, otherwise CSV')
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE,
+                        help="Model bundle directory; pass '' to use --model/--vocab")
+    parser.add_argument('--model', default=os.path.join(project_root, 'models/best_model.pkl'))
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--synonyms', default=os.path.join(project_root, 'data/symptom_synonyms.json'))
+    parser.add_argument('--nlp-model', default=None,
+                        help='spaCy model or word-vector table (default: models/word_vectors if exported)')
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--n-jobs', type=int, default=1)
+    parser.add_argument('--top-n', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.3,
+                        help='Minimum probability for a prediction to be written')
+    parser.add_argument('--id-column', help='Column/field to carry through as the case id')
+    parser.add_argument('--symptom-columns', nargs='+',
+                        help="CSV symptom columns (default: 'symptoms' or Symptom_* columns)")
+    args = parser.parse_args()
+
+    nlp_model = args.nlp_model or config.default_nlp_model(project_root)
+    predictor_args = {'synonyms_path': args.synonyms, 'nlp_model': nlp_model}
+    if use_bundle(args.bundle, args.model, args.vocab):
+        predictor_args['bundle_path'] = args.bundle
+    else:
+        predictor_args.update(model_path=args.model, vocab_path=args.vocab)
+
+    totals = bulk_score(
+        args.input, args.output, predictor_args,
+        chunksize=args.chunksize, n_jobs=args.n_jobs, top_n=args.top_n,
+        threshold=args.threshold, symptom_columns=args.symptom_columns,
+        id_column=args.id_column
+    )
+
+    print(f"✓ Scored {totals['rows']:,} cases in {totals['seconds']:.2f}s "
+          f"({totals['rows_per_sec']:,.0f} rows/sec, {args.n_jobs} process(es))")
+    print(f"  {totals['scored']:,} with a prediction above {args.threshold}")
+    print(f"  Saved to: {args.output}")
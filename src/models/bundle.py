@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import joblib
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.models.fast_scorer import SCORERS, make_fast_scorer
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model.joblib'
+DISEASE_INFO_FILE = 'disease_info.json'
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bundle_checksum(file_hashes):
+    """Single checksum over every file in the bundle"""
+    payload = json.dumps(file_hashes, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def export_bundle(model_path, vocab_path, disease_info_path, output_dir, version=None):
+    """
+    Write a versioned model bundle directory:
+        manifest.json      format version, symptom order, classes, checksums
+        weights.npy        (n_symptoms, n_classes) scorer weights, if supported
+        bias.npy           (n_classes,) scorer bias, if supported
+        feature_count.npy  (n_classes, n_symptoms) training counts and
+        class_count.npy    (n_classes,) case counts, for count-based
+                           models (MultinomialNB); sessions use them to
+                           suggest the next symptom to ask about
+        model.joblib       the original estimator, for models without a fast path
+        disease_info.json  disease descriptions served with predictions
+
+    The manifest also records the sha256 of the source model, vocabulary
+    and disease info files, so a bundle that no longer matches them can
+    be detected (see stale_sources).
+
+    The symptom order is sorted, which is the column order
+    DiseaseDataPreprocessor.create_feature_matrix trains with.
+    Returns: the manifest dict
+    """
+    model = joblib.load(model_path)
+    vocab_data = joblib.load(vocab_path)
+    symptoms = sorted(vocab_data['symptoms'])
+    classes = [str(c) for c in vocab_data['label_encoder'].classes_]
+
+    n_features = getattr(model, 'n_features_in_', len(symptoms))
+    if n_features != len(symptoms):
+        raise ValueError(
+            f"Model expects {n_features} features but vocabulary has {len(symptoms)} symptoms"
+        )
+
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+
+    scorer = make_fast_scorer(model)
+    scorer_kind = None
+    if scorer is not None:
+        scorer_kind = scorer.kind
+        for name, array in (('weights', scorer.weights), ('bias', scorer.bias)):
+            filename = f'{name}.npy'
+            np.save(os.path.join(output_dir, filename), np.ascontiguousarray(array))
+            files[filename] = None
+
+    if hasattr(model, 'feature_count_') and hasattr(model, 'class_count_'):
+        for name, array in (('feature_count', model.feature_count_),
+                            ('class_count', model.class_count_)):
+            filename = f'{name}.npy'
+            np.save(os.path.join(output_dir, filename), np.ascontiguousarray(array))
+            files[filename] = None
+
+    joblib.dump(model, os.path.join(output_dir, MODEL_FILE))
+    files[MODEL_FILE] = None
+
+    shutil.copyfile(disease_info_path, os.path.join(output_dir, DISEASE_INFO_FILE))
+    files[DISEASE_INFO_FILE] = None
+
+    for filename in files:
+        files[filename] = _file_sha256(os.path.join(output_dir, filename))
+    checksum = _bundle_checksum(files)
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'version': version or time.strftime('%Y%m%d%H%M%S') + '-' + checksum[:8],
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model_class': type(model).__name__,
+        'scorer': scorer_kind,
+        'symptoms': symptoms,
+        'classes': classes,
+        'files': files,
+        'checksum': checksum,
+        'sources': {
+            'model': _file_sha256(model_path),
+            'vocabulary': _file_sha256(vocab_path),
+            'disease_info': _file_sha256(disease_info_path)
+        }
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+class ModelBundle:
+    """
+    A loaded model bundle
+
+    Parameter arrays are opened with np.load(mmap_mode='r') so preforked
+    workers share the same page-cache copy. The pickled estimator is only
+    loaded when the bundle has no fast-path arrays, or on load_model().
+    """
+
+    def __init__(self, bundle_dir, mmap=True, verify=True):
+        self.bundle_dir = bundle_dir
+        with open(os.path.join(bundle_dir, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+
+        if self.manifest['format_version'] > BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Bundle format {self.manifest['format_version']} is newer than "
+                f"supported format {BUNDLE_FORMAT_VERSION}"
+            )
+        if verify:
+            self.verify()
+
+        self.version = self.manifest['version']
+        self.checksum = self.manifest['checksum']
+        self.symptoms = list(self.manifest['symptoms'])
+        self.classes = np.array(self.manifest['classes'], dtype=object)
+        self.mmap_mode = 'r' if mmap else None
+
+        self.scorer = None
+        self.model = None
+        if self.manifest['scorer'] in SCORERS:
+            self.scorer = SCORERS[self.manifest['scorer']](
+                self._load_array('weights.npy'), self._load_array('bias.npy')
+            )
+        else:
+            self.model = self.load_model()
+
+        # Training counts, exported for count-based models only
+        self.feature_count = self.class_count = None
+        if 'feature_count.npy' in self.manifest['files']:
+            self.feature_count = self._load_array('feature_count.npy')
+            self.class_count = self._load_array('class_count.npy')
+
+        with open(os.path.join(bundle_dir, DISEASE_INFO_FILE)) as f:
+            self.disease_info = json.load(f)
+
+    def _load_array(self, filename):
+        return np.load(os.path.join(self.bundle_dir, filename), mmap_mode=self.mmap_mode)
+
+    def verify(self):
+        """Raise ValueError if any file does not match the manifest checksums"""
+        files = self.manifest['files']
+        for filename, expected in files.items():
+            if _file_sha256(os.path.join(self.bundle_dir, filename)) != expected:
+                raise ValueError(f"Checksum mismatch for {filename} in {self.bundle_dir}")
+        if _bundle_checksum(files) != self.manifest['checksum']:
+            raise ValueError(f"Bundle checksum mismatch in {self.bundle_dir}")
+
+    def load_model(self):
+        """Load the original sklearn estimator from the bundle"""
+        return joblib.load(os.path.join(self.bundle_dir, MODEL_FILE), mmap_mode=self.mmap_mode)
+
+    def label_encoder(self):
+        """A fitted LabelEncoder for the bundle's classes"""
+        encoder = LabelEncoder()
+        encoder.classes_ = np.array(self.manifest['classes'])
+        return encoder
+
+
+def stale_sources(bundle_dir, model_path, vocab_path, disease_info_path=None):
+    """
+    Source files the bundle was not exported from
+
+    Args:
+        bundle_dir: Bundle directory
+        model_path, vocab_path, disease_info_path: Current source files;
+            disease_info_path may be None when the caller doesn't serve it
+
+    Returns:
+        Names ('model', 'vocabulary', 'disease_info') whose sha256 differs
+        from the one in the manifest, or that the manifest doesn't record
+    """
+    with open(os.path.join(bundle_dir, MANIFEST_FILE)) as f:
+        recorded = json.load(f).get('sources', {})
+    sources = {'model': model_path, 'vocabulary': vocab_path, 'disease_info': disease_info_path}
+    return [
+        name for name, path in sources.items()
+        if path is not None and recorded.get(name) != _file_sha256(path)
+    ]
+
+
+def use_bundle(bundle_dir, model_path, vocab_path, disease_info_path=None):
+    """
+    True if bundle_dir holds a bundle exported from the current source
+    files; a stale bundle is reported and should not be served
+    """
+    if not bundle_dir or not os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+        return False
+    stale = stale_sources(bundle_dir, model_path, vocab_path, disease_info_path)
+    if stale:
+        print(f"Warning: bundle {bundle_dir} was not exported from the current "
+              f"{', '.join(stale)}; using the source files instead "
+              "(re-export with python -m src.models.bundle)")
+        return False
+    return True
+
+
+def load_bundle(bundle_dir, mmap=True, verify=True):
+    """Load a bundle written by export_bundle"""
+    return ModelBundle(bundle_dir, mmap=mmap, verify=verify)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a versioned model bundle')
+    parser.add_argument('--model', default=os.path.join(project_root, 'models/best_model.pkl'))
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--disease-info', default=os.path.join(project_root, 'data/disease_info.json'))
+    parser.add_argument('--output', default=os.path.join(project_root, 'models/bundle'))
+    parser.add_argument('--version', default=None)
+    args = parser.parse_args()
+
+    manifest = export_bundle(args.model, args.vocab, args.disease_info, args.output, args.version)
+    print(f"✓ Bundle {manifest['version']} written to: {args.output}")
+    print(f"  Model: {manifest['model_class']} (scorer: {manifest['scorer']})")
+    print(f"  {len(manifest['symptoms'])} symptoms, {len(manifest['classes'])} diseases")
+    print(f"  Checksum: {manifest['checksum']}")
@@ -0,0 +1,229 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.model_selection import train_test_split
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+
+def top2_margin(probabilities):
+    """Difference between the two highest class probabilities of each row"""
+    probabilities = np.atleast_2d(probabilities)
+    if probabilities.shape[1] < 2:
+        return probabilities[:, 0]
+    top2 = np.partition(probabilities, -2, axis=1)[:, -2:]
+    return top2[:, 1] - top2[:, 0]
+
+
+class Cascade:
+    """
+    Second model tier for predictions the first tier is unsure about
+
+    The first tier (the fast NB scorer) answers when its top-1/top-2
+    probability margin is at least margin. The remaining rows are
+    re-scored by the heavier model and its probabilities replace the
+    first tier's. Row counts and per-tier latency are kept for sizing
+    the margin.
+    """
+
+    def __init__(self, model, margin=0.2, n_classes=None, n_features=None, metrics=None):
+        """
+        Args:
+            model: Fitted heavy model with predict_proba over the same
+                encoded classes and symptom columns as the first tier
+            margin: Minimum top-1/top-2 margin the first tier answers alone
+            n_classes, n_features: Expected shape, checked when given
+            metrics: Optional MetricsRegistry for per-tier counters/latency
+        """
+        if not hasattr(model, 'predict_proba'):
+            raise ValueError(f"{type(model).__name__} has no predict_proba")
+        if n_classes is not None and len(model.classes_) != n_classes:
+            raise ValueError(
+                f"Cascade model has {len(model.classes_)} classes, expected {n_classes}"
+            )
+        model_features = getattr(model, 'n_features_in_', None)
+        if n_features is not None and model_features not in (None, n_features):
+            raise ValueError(
+                f"Cascade model has {model_features} features, expected {n_features}"
+            )
+
+        self.model = model
+        self.margin = margin
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.escalated = 0
+        self.fast_seconds = 0.0
+        self.heavy_seconds = 0.0
+
+        self.metrics = metrics
+        if metrics is not None:
+            self._rows_counter = metrics.counter(
+                'cascade_rows_total', 'Rows answered by each cascade tier', ('tier',)
+            )
+            self._tier_latency = metrics.histogram(
+                'cascade_tier_seconds', 'Latency of each cascade tier per call', ('tier',)
+            )
+
+    def refine(self, probabilities, get_features, fast_seconds=0.0):
+        """
+        Escalate the low-margin rows of first-tier probabilities
+
+        Args:
+            probabilities: (n_rows, n_classes) first-tier probabilities
+            get_features: Callable taking row positions and returning the
+                CSR feature rows for them, so features are only built
+                when something is escalated
+            fast_seconds: Time the first tier took, for the tier stats
+
+        Returns:
+            Probabilities with escalated rows replaced (a new array if any)
+        """
+        escalate = np.flatnonzero(top2_margin(probabilities) < self.margin)
+
+        heavy_seconds = 0.0
+        if len(escalate):
+            start = time.perf_counter()
+            heavy = self.model.predict_proba(get_features(escalate))
+            heavy_seconds = time.perf_counter() - start
+            probabilities = np.array(probabilities, dtype=np.float64)
+            probabilities[escalate] = heavy
+
+        n_rows = len(probabilities)
+        with self._lock:
+            self.rows += n_rows
+            self.escalated += len(escalate)
+            self.fast_seconds += fast_seconds
+            self.heavy_seconds += heavy_seconds
+
+        if self.metrics is not None:
+            self._rows_counter.inc('fast', amount=n_rows - len(escalate))
+            self._tier_latency.observe(fast_seconds, 'fast')
+            if len(escalate):
+                self._rows_counter.inc('heavy', amount=len(escalate))
+                self._tier_latency.observe(heavy_seconds, 'heavy')
+
+        return probabilities
+
+    def stats(self):
+        with self._lock:
+            rows, escalated = self.rows, self.escalated
+            fast_seconds, heavy_seconds = self.fast_seconds, self.heavy_seconds
+        return {
+            'margin': self.margin,
+            'model': type(self.model).__name__,
+            'rows': rows,
+            'escalated': escalated,
+            'escalation_rate': escalated / rows if rows else 0.0,
+            'fast_ms_per_row': fast_seconds * 1000 / rows if rows else 0.0,
+            'heavy_ms_per_escalated_row': heavy_seconds * 1000 / escalated if escalated else 0.0,
+            'ms_per_row': (fast_seconds + heavy_seconds) * 1000 / rows if rows else 0.0
+        }
+
+
+def evaluate_margins(fast_probabilities, heavy_probabilities, y, margins):
+    """
+    Accuracy and escalation rate of the cascade at each candidate margin,
+    from both tiers' probabilities on a held-out set
+
+    Returns:
+        List of dicts with margin, escalation_rate and accuracy
+    """
+    fast_pred = np.argmax(fast_probabilities, axis=1)
+    heavy_pred = np.argmax(heavy_probabilities, axis=1)
+    margin = top2_margin(fast_probabilities)
+
+    results = []
+    for threshold in margins:
+        escalate = margin < threshold
+        pred = np.where(escalate, heavy_pred, fast_pred)
+        results.append({
+            'margin': float(threshold),
+            'escalation_rate': float(escalate.mean()),
+            'accuracy': float(np.mean(pred == y))
+        })
+    return results
+
+
+def keep_symptoms(X, keep, random_state=0):
+    """
+    Copy of CSR feature rows with only a random fraction of each row's
+    symptoms (at least one), like a patient reporting some of them
+    """
+    rng = np.random.RandomState(random_state)
+    X = X.tocsr()
+    indptr = [0]
+    indices = []
+    for i in range(X.shape[0]):
+        row = X.indices[X.indptr[i]:X.indptr[i + 1]]
+        n = max(1, int(np.ceil(keep * len(row))))
+        indices.extend(sorted(rng.choice(row, n, replace=False)))
+        indptr.append(len(indices))
+    return sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=X.shape)
+
+
+if __name__ == '__main__':
+    from src.models.fast_scorer import make_fast_scorer
+    from src.models.selection import load_training_data, make_candidates
+
+    parser = argparse.ArgumentParser(
+        description='Measure a fast/heavy model cascade across escalation margins'
+    )
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data/processed'))
+    parser.add_argument('--fast', default='Naive Bayes', help='First-tier candidate name')
+    parser.add_argument('--heavy', default='Random Forest',
+                        help='Heavy candidate name, or a path to a pickled model')
+    parser.add_argument('--margins', type=float, nargs='+',
+                        default=[0.0, 0.05, 0.1, 0.2, 0.3, 0.5, 1.01])
+    parser.add_argument('--keep', type=float, default=1.0,
+                        help='Fraction of each held-out case\'s symptoms to keep (simulates partial reports)')
+    parser.add_argument('--save', help='Write the fitted heavy model here (e.g. models/cascade_model.pkl)')
+    args = parser.parse_args()
+
+    X, y = load_training_data(args.data_dir)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    if args.keep < 1.0:
+        X_test = keep_symptoms(X_test, args.keep)
+
+    candidates = make_candidates()
+    fast = candidates[args.fast].fit(X_train, y_train)
+    if os.path.exists(args.heavy):
+        heavy = joblib.load(args.heavy)
+    else:
+        heavy = candidates[args.heavy].fit(X_train, y_train)
+
+    scorer = make_fast_scorer(fast)
+    fast_probabilities = scorer.predict_proba(X_test) if scorer else fast.predict_proba(X_test)
+    heavy_probabilities = heavy.predict_proba(X_test)
+
+    # Per-row cost of each tier, scoring one row at a time like /predict
+    rows = [X_test[i] for i in range(min(X_test.shape[0], 200))]
+    start = time.perf_counter()
+    for row in rows:
+        scorer.predict_proba_indices(row.indices) if scorer else fast.predict_proba(row)
+    fast_ms = (time.perf_counter() - start) * 1000 / len(rows)
+    start = time.perf_counter()
+    for row in rows:
+        heavy.predict_proba(row)
+    heavy_ms = (time.perf_counter() - start) * 1000 / len(rows)
+
+    print(f"{args.fast} {fast_ms:.3f} ms/row, {type(heavy).__name__} {heavy_ms:.3f} ms/row "
+          f"on {X_test.shape[0]} held-out cases ({args.keep:.0%} of symptoms kept)\n")
+    print(f"{'margin':>7} {'escalated':>10} {'accuracy':>9} {'ms/row':>8}")
+    for r in evaluate_margins(fast_probabilities, heavy_probabilities, y_test, args.margins):
+        cost = fast_ms + r['escalation_rate'] * heavy_ms
+        print(f"{r['margin']:>7.2f} {r['escalation_rate']:>10.1%} {r['accuracy']:>9.4f} {cost:>8.3f}")
+
+    if args.save:
+        joblib.dump(heavy, args.save)
+        print(f"\n✓ Heavy model saved to: {args.save}")
@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.data.feature_store import FeatureStore
+from src.models.fast_scorer import make_fast_scorer
+
+
+class StreamingEvaluator:
+    """
+    Confusion matrix and classification metrics accumulated chunk by chunk
+
+    Memory is O(n_classes^2) regardless of how many rows are evaluated;
+    the metrics equal those of sklearn.metrics on all rows at once.
+    """
+
+    def __init__(self, n_classes, top_k=3):
+        self.n_classes = n_classes
+        self.top_k = top_k
+        self.confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self.top_k_hits = 0
+        self.log_loss_sum = 0.0
+        self.scored_probabilities = 0
+
+    @property
+    def n_rows(self):
+        return int(self.confusion.sum())
+
+    def update(self, y_true, y_pred=None, probabilities=None):
+        """
+        Add a chunk of true labels with predicted labels or class probabilities
+        With probabilities, top-k accuracy and log loss are accumulated too.
+        """
+        y_true = np.asarray(y_true, dtype=np.int64)
+        if probabilities is not None:
+            probabilities = np.asarray(probabilities)
+            y_pred = np.argmax(probabilities, axis=1)
+
+            k = min(self.top_k, self.n_classes)
+            top = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+            self.top_k_hits += int((top == y_true[:, np.newaxis]).any(axis=1).sum())
+
+            true_proba = probabilities[np.arange(len(y_true)), y_true]
+            self.log_loss_sum -= float(np.log(np.clip(true_proba, 1e-15, 1.0)).sum())
+            self.scored_probabilities += len(y_true)
+
+        y_pred = np.asarray(y_pred, dtype=np.int64)
+        self.confusion += np.bincount(
+            y_true * self.n_classes + y_pred, minlength=self.n_classes ** 2
+        ).reshape(self.n_classes, self.n_classes)
+
+    def per_class(self):
+        """
+        Returns:
+            dict of precision, recall, f1 and support arrays (one entry per class);
+            classes never predicted or never seen score 0, like sklearn's zero_division=0
+        """
+        true_positive = np.diag(self.confusion).astype(np.float64)
+        predicted = self.confusion.sum(axis=0)
+        support = self.confusion.sum(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(predicted > 0, true_positive / predicted, 0.0)
+            recall = np.where(support > 0, true_positive / support, 0.0)
+            f1 = np.where(precision + recall > 0,
+                          2 * precision * recall / (precision + recall), 0.0)
+        return {'precision': precision, 'recall': recall, 'f1': f1, 'support': support}
+
+    def metrics(self):
+        """
+        Overall accuracy, macro and support-weighted averages, and top-k/log loss
+        Like sklearn, the macro averages only cover classes that occur in
+        the true or predicted labels.
+        """
+        per_class = self.per_class()
+        support = per_class['support']
+        present = (support > 0) | (self.confusion.sum(axis=0) > 0)
+        n_rows = self.n_rows
+        result = {
+            'rows': n_rows,
+            'accuracy': float(np.trace(self.confusion) / n_rows) if n_rows else 0.0
+        }
+        for name in ('precision', 'recall', 'f1'):
+            result[f'macro_{name}'] = float(per_class[name][present].mean()) if n_rows else 0.0
+            result[f'weighted_{name}'] = (
+                float((per_class[name] * support).sum() / support.sum()) if n_rows else 0.0
+            )
+        if self.scored_probabilities:
+            result[f'top_{self.top_k}_accuracy'] = self.top_k_hits / self.scored_probabilities
+            result['log_loss'] = self.log_loss_sum / self.scored_probabilities
+        return result
+
+    def report(self, class_names=None):
+        """Text report in the layout of sklearn's classification_report"""
+        per_class = self.per_class()
+        names = class_names if class_names is not None else [str(i) for i in range(self.n_classes)]
+        width = max(len('weighted avg'), max(len(str(n)) for n in names))
+
+        lines = [f"{'':>{width}} {'precision':>9} {'recall':>9} {'f1-score':>9} {'support':>9}", ""]
+        for i, name in enumerate(names):
+            lines.append(f"{name:>{width}} {per_class['precision'][i]:>9.2f} "
+                         f"{per_class['recall'][i]:>9.2f} {per_class['f1'][i]:>9.2f} "
+                         f"{per_class['support'][i]:>9}")
+
+        metrics = self.metrics()
+        lines.append("")
+        lines.append(f"{'accuracy':>{width}} {'':>9} {'':>9} {metrics['accuracy']:>9.2f} "
+                     f"{metrics['rows']:>9}")
+        for average in ('macro', 'weighted'):
+            lines.append(f"{average + ' avg':>{width}} {metrics[f'{average}_precision']:>9.2f} "
+                         f"{metrics[f'{average}_recall']:>9.2f} {metrics[f'{average}_f1']:>9.2f} "
+                         f"{metrics['rows']:>9}")
+        return "\n".join(lines)
+
+
+def evaluate_store(model, store, chunksize=100000, top_k=3, n_classes=None):
+    """
+    Score a labeled FeatureStore chunk by chunk
+
+    Uses the model's native fast scorer when it has one, predict_proba
+    otherwise; only one chunk of features and probabilities is held in
+    memory at a time.
+
+    Returns:
+        StreamingEvaluator with the accumulated results
+    """
+    if store.labels is None:
+        raise ValueError(f"Feature store {store.path} has no labels to evaluate against")
+
+    scorer = make_fast_scorer(model)
+    evaluator = StreamingEvaluator(n_classes or len(model.classes_), top_k)
+    for _, X, y in store.iter_chunks(chunksize):
+        probabilities = scorer.predict_proba(X) if scorer is not None else model.predict_proba(X)
+        evaluator.update(y, probabilities=probabilities)
+    return evaluator
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Evaluate a model on a feature store (src.data.feature_store) in chunks'
+    )
+    parser.add_argument('--features', default=os.path.join(project_root, 'data/processed/test_features'))
+    parser.add_argument('--model', default=os.path.join(project_root, 'models/best_model.pkl'))
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--confusion-output', help='Save the confusion matrix as .npy')
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    class_names = list(joblib.load(args.vocab)['label_encoder'].classes_)
+    store = FeatureStore(args.features)
+
+    start = time.perf_counter()
+    evaluator = evaluate_store(model, store, args.chunksize, args.top_k, len(class_names))
+    elapsed = time.perf_counter() - start
+
+    print(evaluator.report(class_names))
+    metrics = evaluator.metrics()
+    print(f"\nTop-{args.top_k} accuracy: {metrics[f'top_{args.top_k}_accuracy']:.4f}, "
+          f"log loss: {metrics['log_loss']:.4f}")
+    print(f"✓ Evaluated {metrics['rows']:,} rows in {elapsed:.2f}s "
+          f"({metrics['rows'] / elapsed:,.0f} rows/sec, '{store.layout}' store, "
+          f"{store.nbytes / 1e3:,.1f} KB on disk)")
+
+    if args.confusion_output:
+        np.save(args.confusion_output, evaluator.confusion)
+        print(f"✓ Confusion matrix saved to: {args.confusion_output}")
@@ -0,0 +1,113 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.utils.extmath import softmax
+
+
+def top_n_indices(probabilities, n):
+    """
+    Indices of the n largest probabilities, highest first
+    Ties are broken by ascending class index.
+    """
+    n = min(n, len(probabilities))
+    if n <= 0:
+        return np.array([], dtype=np.intp)
+
+    if n < len(probabilities):
+        # Keep everything tied with the n-th largest so the cut is exact
+        nth = np.argpartition(-probabilities, n - 1)[n - 1]
+        candidates = np.flatnonzero(probabilities >= probabilities[nth])
+    else:
+        candidates = np.arange(len(probabilities))
+
+    order = np.lexsort((candidates, -probabilities[candidates]))
+    return candidates[order[:n]]
+
+
+class LinearScorer(ABC):
+    """
+    Scores binary symptom vectors as bias + sum of active weight rows.
+    Skips sklearn's per-call input validation; a single request only
+    touches the rows for its matched symptoms. Subclasses define how
+    scores become probabilities (normalize).
+    """
+
+    kind = None
+
+    def __init__(self, weights, bias):
+        # (n_symptoms, n_classes), C-contiguous so each symptom row is one block.
+        # Already contiguous float64 arrays (e.g. memory maps) are not copied.
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = np.asarray(bias, dtype=np.float64)
+
+    def decision_function(self, indices):
+        """Raw class scores for one row given its active symptom indices"""
+        if len(indices):
+            # Rows are added in index order, as scipy's sparse product does
+            scores = self.weights[indices].sum(axis=0)
+        else:
+            scores = np.zeros(self.weights.shape[1])
+        return scores + self.bias
+
+    def decision_matrix(self, feature_matrix):
+        """Raw class scores for a CSR feature matrix"""
+        return feature_matrix @ self.weights + self.bias
+
+    @abstractmethod
+    def normalize(self, scores):
+        """Turn a 2D array of raw scores into probabilities"""
+
+    def predict_proba_indices(self, indices):
+        """Class probabilities for one row given its active symptom indices"""
+        return self.normalize(self.decision_function(indices)[np.newaxis, :])[0]
+
+    def predict_proba(self, feature_matrix):
+        """Class probabilities for a CSR feature matrix"""
+        return self.normalize(self.decision_matrix(feature_matrix))
+
+
+class NaiveBayesScorer(LinearScorer):
+    """Fast path for MultinomialNB: log prior + summed feature log probs"""
+
+    kind = 'naive_bayes'
+
+    def normalize(self, scores):
+        # Same steps as scipy's classic logsumexp, without its per-call overhead
+        max_scores = scores.max(axis=1, keepdims=True)
+        log_prob_x = np.log(np.exp(scores - max_scores).sum(axis=1)) + max_scores[:, 0]
+        return np.exp(scores - np.atleast_2d(log_prob_x).T)
+
+
+class SoftmaxScorer(LinearScorer):
+    """Fast path for multinomial LogisticRegression"""
+
+    kind = 'softmax'
+
+    def normalize(self, scores):
+        return softmax(scores, copy=False)
+
+
+SCORERS = {scorer.kind: scorer for scorer in (NaiveBayesScorer, SoftmaxScorer)}
+
+
+def make_fast_scorer(model):
+    """
+    Return a fast scorer for supported models, or None if the model
+    has to go through its own predict_proba
+    """
+    if type(model) is MultinomialNB:
+        return NaiveBayesScorer(model.feature_log_prob_.T, model.class_log_prior_)
+
+    if type(model) is LogisticRegression:
+        multi_class = model.multi_class
+        if multi_class == 'auto':
+            multi_class = (
+                'ovr' if model.solver == 'liblinear' or len(model.classes_) <= 2
+                else 'multinomial'
+            )
+        if multi_class == 'multinomial':
+            return SoftmaxScorer(model.coef_.T, model.intercept_)
+
+    return None
@@ -0,0 +1,126 @@
+import copy
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+
+class OnlineUpdater:
+    """
+    Fold newly labeled cases into the live model without retraining
+
+    Each update copies the current estimator, calls partial_fit on the
+    copy with the new cases and wraps it in a new predictor that shares
+    the matcher, vocabulary and metrics of the current one. The running
+    predictor is never mutated, so requests already using it finish on
+    the old model. Callers publish the new predictor with a single
+    reference assignment, from update()'s publish callback.
+
+    For MultinomialNB, partial_fit just adds to the per-class feature
+    counts. The updated model is the same one a full refit on the
+    original plus the new cases would give.
+    """
+
+    def __init__(self, predictor, threshold=75):
+        """
+        Args:
+            predictor: The DiseasePredictor currently serving requests
+            threshold: Symptom matching threshold used to encode cases
+        """
+        self.predictor = predictor
+        self.threshold = threshold
+        self._lock = threading.Lock()
+
+        # Bundle-loaded predictors score with exported weights only
+        model = predictor.model
+        if model is None and predictor.bundle is not None:
+            model = predictor.bundle.load_model()
+        if model is None or not hasattr(model, 'partial_fit'):
+            raise ValueError(
+                f"{type(model).__name__} does not support incremental updates (partial_fit)"
+            )
+        self.model = model
+        self.base_version = predictor.model_version
+
+        self.updates = 0
+        self.cases_applied = 0
+        self.last_update_seconds = None
+
+    def encode_cases(self, cases):
+        """
+        Turn labeled cases into a feature matrix and encoded labels
+
+        Args:
+            cases: List of (symptom strings, disease name) pairs
+
+        Returns:
+            (csr_matrix, label array)
+        """
+        known_classes = set(self.predictor.classes)
+        indptr = [0]
+        indices = []
+        labels = []
+        for i, (user_symptoms, disease) in enumerate(cases):
+            if disease not in known_classes:
+                raise ValueError(f"Case {i}: unknown disease '{disease}'")
+
+            matched_symptoms = self.predictor.matcher.match_multiple_symptoms(
+                user_symptoms, threshold=self.threshold
+            )
+            row_indices, _ = self.predictor._encode_symptoms(matched_symptoms)
+            if not row_indices:
+                raise ValueError(f"Case {i}: none of the symptoms matched the vocabulary")
+
+            indices.extend(row_indices)
+            indptr.append(len(indices))
+            labels.append(disease)
+
+        features = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(labels), len(self.predictor.symptom_list))
+        )
+        return features, self.predictor.label_encoder.transform(labels)
+
+    def update(self, cases, publish=None):
+        """
+        Apply labeled cases and return a new predictor using the updated model
+        Concurrent updates are serialized; each builds on the previous one.
+        
+        Args:
+            cases: List of (symptom strings, disease name) pairs
+            publish: Optional callable given the new predictor before the
+                lock is released, so concurrent updates are published in
+                the order they were applied
+        """
+        if not cases:
+            return self.predictor
+
+        with self._lock:
+            start = time.perf_counter()
+            features, labels = self.encode_cases(cases)
+
+            model = copy.deepcopy(self.model)
+            model.partial_fit(features, labels, classes=model.classes_)
+
+            predictor = self.predictor.with_model(
+                model, f"{self.base_version}+update{self.updates + 1}"
+            )
+            self.model = model
+            self.predictor = predictor
+
+            self.updates += 1
+            self.cases_applied += len(cases)
+            self.last_update_seconds = time.perf_counter() - start
+            if publish is not None:
+                publish(predictor)
+            return predictor
+
+    def stats(self):
+        return {
+            'updates': self.updates,
+            'cases_applied': self.cases_applied,
+            'last_update_ms': (
+                self.last_update_seconds * 1000 if self.last_update_seconds is not None else None
+            )
+        }
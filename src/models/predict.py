@@ -1,7 +1,10 @@
+import copy
 import joblib
 import numpy as np
+from scipy import sparse
 import sys
 import os
+import time
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,20 +12,115 @@ sys.path.insert(0, project_root)
 
 # Now import with relative path
 from src.nlp.symptom_matcher import SymptomMatcher
-from src.data.preprocessor import DiseaseDataPreprocessor
+from src.models.fast_scorer import make_fast_scorer, top_n_indices
+from src.models.bundle import load_bundle
+from src.models.cascade import Cascade
+from src.utils.memory import memory_mark, memory_since
 
 class DiseasePredictor:
-    def __init__(self, model_path, vocab_path):
+    # Minimum probability for a disease to be served, unless a caller passes its own
+    confidence_threshold = 0.3
+    
+    def __init__(self, model_path, vocab_path, lazy_nlp=False, metrics=None, synonyms_path=None,
+                 nlp_model='en_core_web_md'):
+        """
+        Args:
+            model_path: Path to the pickled classifier
+            vocab_path: Path to the pickled vocabulary and label encoder
+            lazy_nlp: Defer loading spaCy until the semantic stage is needed
+            metrics: Optional MetricsRegistry for latency instrumentation
+            synonyms_path: Optional JSON file of symptom synonyms for the matcher
+            nlp_model: spaCy model or exported word-vector table for the matcher
+        """
+        self.load_times = {}
+        self.load_memory = {}
+        self._init_metrics(metrics)
+        self.bundle = None
+        self.cascade = None
+        self.disease_info = None
+        
         # Load model
+        start = time.perf_counter()
+        mark = memory_mark()
         self.model = joblib.load(model_path)
+        self.load_times['model'] = time.perf_counter() - start
+        self.load_memory['model'] = memory_since(mark)
+        # Identifies the loaded model for caches keyed on its outputs
+        self.model_version = f"{os.path.basename(model_path)}@{os.path.getmtime(model_path):.0f}"
         
-        # Load vocabulary and encoder
+        # Load vocabulary and encoder. Columns are in sorted symptom order,
+        # as built by DiseaseDataPreprocessor.create_feature_matrix
+        start = time.perf_counter()
+        mark = memory_mark()
         vocab_data = joblib.load(vocab_path)
-        self.symptom_list = vocab_data['symptoms']
+        self.symptom_list = sorted(vocab_data['symptoms'])
         self.label_encoder = vocab_data['label_encoder']
+        self.classes = self.label_encoder.classes_
+        self.load_times['vocabulary'] = time.perf_counter() - start
+        self.load_memory['vocabulary'] = memory_since(mark)
+        
+        # Native scorer for NB/linear models, None falls back to predict_proba
+        self.scorer = make_fast_scorer(self.model)
+        
+        self._init_matcher(lazy_nlp, synonyms_path, nlp_model)
+    
+    @classmethod
+    def from_bundle(cls, bundle_path, lazy_nlp=False, mmap=True, verify=True, metrics=None,
+                    synonyms_path=None, nlp_model='en_core_web_md'):
+        """
+        Load a predictor from a bundle written by src.models.bundle
+        
+        With mmap=True the parameter arrays are memory-mapped, so
+        preforked workers share one physical copy.
+        """
+        predictor = cls.__new__(cls)
+        predictor.load_times = {}
+        predictor.load_memory = {}
+        predictor._init_metrics(metrics)
+        predictor.cascade = None
         
+        start = time.perf_counter()
+        mark = memory_mark()
+        bundle = load_bundle(bundle_path, mmap=mmap, verify=verify)
+        predictor.load_times['bundle'] = time.perf_counter() - start
+        predictor.load_memory['bundle'] = memory_since(mark)
+        
+        predictor.bundle = bundle
+        predictor.model_version = bundle.version
+        predictor.disease_info = bundle.disease_info
+        predictor.model = bundle.model
+        predictor.scorer = bundle.scorer
+        predictor.symptom_list = bundle.symptoms
+        predictor.label_encoder = bundle.label_encoder()
+        predictor.classes = bundle.classes
+        
+        predictor._init_matcher(lazy_nlp, synonyms_path, nlp_model)
+        return predictor
+    
+    def _init_metrics(self, metrics):
+        self.metrics = metrics
+        if metrics is not None:
+            self._stage_latency = metrics.histogram(
+                'prediction_stage_seconds',
+                'Latency of prediction stages (match, score, total)',
+                ('stage',)
+            )
+            self._batch_size = metrics.histogram(
+                'prediction_batch_size',
+                'Number of cases per predict_batch call',
+                buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+            )
+    
+    def _init_matcher(self, lazy_nlp, synonyms_path=None, nlp_model='en_core_web_md'):
         # Initialize symptom matcher
-        self.matcher = SymptomMatcher(self.symptom_list)
+        start = time.perf_counter()
+        mark = memory_mark()
+        self.matcher = SymptomMatcher(
+            self.symptom_list, nlp_model=nlp_model, lazy_nlp=lazy_nlp,
+            metrics=self.metrics, synonyms_path=synonyms_path
+        )
+        self.load_times['symptom_matcher'] = time.perf_counter() - start
+        self.load_memory['symptom_matcher'] = memory_since(mark)
         
         # Create symptom to index mapping
         self.symptom_to_idx = {s: i for i, s in enumerate(self.symptom_list)}
@@ -39,37 +137,274 @@ class DiseasePredictor:
         Returns:
             List of (disease, probability, matched_symptoms) tuples
         """
-        # Match user symptoms to vocabulary
+        if self.scorer is None:
+            return self.predict_batch(
+                [user_symptoms], return_top_n, confidence_threshold
+            )[0]
+        
+        timed = self.metrics is not None
+        if timed:
+            start = time.perf_counter()
+        
+        indices, used_symptoms = self.match_symptoms(user_symptoms)
+        predictions = []
+        if indices:
+            predictions = self.predict_indices(
+                indices, used_symptoms, return_top_n, confidence_threshold
+            )
+        
+        if timed:
+            self._stage_latency.observe(time.perf_counter() - start, 'total')
+        if not indices:
+            return [], []
+        return predictions, used_symptoms
+    
+    def match_symptoms(self, user_symptoms):
+        """
+        Match user symptoms to vocabulary columns
+        Returns: (sorted column indices, [(symptom, confidence), ...])
+        """
+        timed = self.metrics is not None
+        if timed:
+            start = time.perf_counter()
+        
         matched_symptoms = self.matcher.match_multiple_symptoms(
             user_symptoms, threshold=75
         )
+        result = self._encode_symptoms(matched_symptoms)
         
-        if not matched_symptoms:
-            return [], []
+        if timed:
+            self._stage_latency.observe(time.perf_counter() - start, 'match')
+        return result
+    
+    def predict_indices(self, indices, used_symptoms, return_top_n=3, confidence_threshold=0.3):
+        """
+        Score an already matched symptom set (see match_symptoms)
+        The result depends only on the set of indices, not on how the
+        symptoms were phrased.
+        Returns: List of (disease, probability, used_symptoms) tuples
+        """
+        timed = self.metrics is not None
+        if timed:
+            start = time.perf_counter()
+        
+        if self.cascade is not None:
+            fast_start = time.perf_counter()
+        
+        if self.scorer is not None:
+            # Fast path: score only the active symptom rows
+            probabilities = self.scorer.predict_proba_indices(indices)
+        else:
+            probabilities = self.model.predict_proba(self._feature_row(indices))[0]
+        
+        if self.cascade is not None:
+            probabilities = self.cascade.refine(
+                probabilities[np.newaxis, :], lambda rows: self._feature_row(indices),
+                time.perf_counter() - fast_start
+            )[0]
+        
+        predictions = self._top_predictions(
+            probabilities, used_symptoms, return_top_n, confidence_threshold
+        )
+        
+        if timed:
+            self._stage_latency.observe(time.perf_counter() - start, 'score')
+        return predictions
+    
+    def predict_batch(self, symptom_lists, return_top_n=3, confidence_threshold=0.3):
+        """
+        Predict diseases for many patients with a single model call
+        
+        Args:
+            symptom_lists: List of symptom string lists, one per patient
+            return_top_n: Number of top predictions to return per patient
+            confidence_threshold: Minimum confidence for predictions
+        
+        Returns:
+            List of (predictions, used_symptoms) pairs in input order, each
+            shaped like the return value of predict()
+        """
+        results = [([], []) for _ in symptom_lists]
+        
+        timed = self.metrics is not None
+        if timed:
+            start = time.perf_counter()
+            self._batch_size.observe(len(symptom_lists))
+        
+        # Match symptoms and collect the active column indices for each row
+        rows = []
+        index_lists = []
+        used_symptom_lists = []
+        for i, user_symptoms in enumerate(symptom_lists):
+            matched_symptoms = self.matcher.match_multiple_symptoms(
+                user_symptoms, threshold=75
+            )
+            if not matched_symptoms:
+                continue
+            
+            row_indices, used_symptoms = self._encode_symptoms(matched_symptoms)
+            rows.append(i)
+            index_lists.append(row_indices)
+            used_symptom_lists.append(used_symptoms)
+        
+        if timed:
+            matched_at = time.perf_counter()
+            self._stage_latency.observe(matched_at - start, 'match')
+        
+        if not rows:
+            if timed:
+                self._stage_latency.observe(matched_at - start, 'total')
+            return results
+        
+        predictions = self._score_rows(
+            index_lists, used_symptom_lists, return_top_n, confidence_threshold
+        )
+        for i, row_predictions, used_symptoms in zip(rows, predictions, used_symptom_lists):
+            results[i] = (row_predictions, used_symptoms)
+        
+        if timed:
+            end = time.perf_counter()
+            self._stage_latency.observe(end - matched_at, 'score')
+            self._stage_latency.observe(end - start, 'total')
+        return results
+    
+    def predict_indices_batch(self, index_lists, used_symptom_lists, return_top_n=3,
+                              confidence_threshold=0.3):
+        """
+        Score many already matched symptom sets (see match_symptoms) with
+        a single model call
+        Returns: List of predictions, one per index list, each shaped like
+        the return value of predict_indices()
+        """
+        timed = self.metrics is not None
+        if timed:
+            start = time.perf_counter()
+            self._batch_size.observe(len(index_lists))
+        
+        predictions = self._score_rows(
+            index_lists, used_symptom_lists, return_top_n, confidence_threshold
+        )
+        
+        if timed:
+            self._stage_latency.observe(time.perf_counter() - start, 'score')
+        return predictions
+    
+    def _score_rows(self, index_lists, used_symptom_lists, return_top_n, confidence_threshold):
+        """Top predictions for each row of sorted column indices"""
+        indptr = np.zeros(len(index_lists) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row_indices) for row_indices in index_lists])
+        indices = [idx for row_indices in index_lists for idx in row_indices]
+        
+        # Create sparse feature matrix
+        feature_matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(index_lists), len(self.symptom_list))
+        )
+        
+        # Predict
+        if self.cascade is not None:
+            fast_start = time.perf_counter()
+        
+        if self.scorer is not None:
+            probabilities = self.scorer.predict_proba(feature_matrix)
+        else:
+            probabilities = self.model.predict_proba(feature_matrix)
         
-        # Create feature vector
-        feature_vector = np.zeros((1, len(self.symptom_list)))
+        if self.cascade is not None:
+            probabilities = self.cascade.refine(
+                probabilities, lambda rows: feature_matrix[rows],
+                time.perf_counter() - fast_start
+            )
+        
+        return [
+            self._top_predictions(
+                row_probabilities, used_symptoms, return_top_n, confidence_threshold
+            )
+            for row_probabilities, used_symptoms in zip(probabilities, used_symptom_lists)
+        ]
+    
+    def _feature_row(self, indices):
+        """One-row CSR feature matrix for sorted column indices"""
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), indices, [0, len(indices)]),
+            shape=(1, len(self.symptom_list))
+        )
+    
+    def set_cascade(self, model, margin=0.2):
+        """
+        Escalate predictions whose top-1/top-2 probability margin is
+        below margin to a heavier model (see src.models.cascade)
+        
+        Args:
+            model: Fitted heavy model, or a path to a pickled one; None
+                serves from the single model again
+            margin: Minimum margin the first tier answers alone
+        """
+        if model is None:
+            self.cascade = None
+            return
+        if isinstance(model, str):
+            start = time.perf_counter()
+            mark = memory_mark()
+            model = joblib.load(model)
+            self.load_times['cascade_model'] = time.perf_counter() - start
+            self.load_memory['cascade_model'] = memory_since(mark)
+        self.cascade = Cascade(
+            model, margin, n_classes=len(self.classes),
+            n_features=len(self.symptom_list), metrics=self.metrics
+        )
+    
+    def _encode_symptoms(self, matched_symptoms):
+        """
+        Map matched symptoms to sorted, de-duplicated column indices
+        Returns: (column_indices, used_symptoms)
+        """
+        columns = set()
         used_symptoms = []
         
         for symptom, confidence in matched_symptoms:
             if symptom in self.symptom_to_idx:
-                feature_vector[0, self.symptom_to_idx[symptom]] = 1
+                columns.add(self.symptom_to_idx[symptom])
                 used_symptoms.append((symptom, confidence))
         
-        # Predict
-        probabilities = self.model.predict_proba(feature_vector)[0]
-        
-        # Get top predictions
-        top_indices = np.argsort(probabilities)[::-1][:return_top_n]
+        return sorted(columns), used_symptoms
+    
+    def _top_predictions(self, probabilities, used_symptoms, return_top_n, confidence_threshold):
+        """Turn one row of class probabilities into (disease, probability, symptoms) tuples"""
+        top_indices = top_n_indices(probabilities, return_top_n)
         
         predictions = []
         for idx in top_indices:
             prob = probabilities[idx]
             if prob >= confidence_threshold:
-                disease = self.label_encoder.inverse_transform([idx])[0]
-                predictions.append((disease, prob, used_symptoms))
+                predictions.append((self.classes[idx], prob, used_symptoms))
         
-        return predictions, used_symptoms
+        return predictions
+    
+    def with_model(self, model, model_version):
+        """
+        Copy of this predictor that scores with another fitted model
+        
+        The copy shares the matcher, vocabulary and metrics; model must
+        use the same classes and symptom columns. Used by
+        src.models.online to hot-swap incrementally updated models.
+        """
+        predictor = copy.copy(self)
+        predictor.model = model
+        predictor.model_version = model_version
+        predictor.scorer = make_fast_scorer(model)
+        return predictor
+    
+    def startup_report(self):
+        """Human-readable breakdown of component load times"""
+        lines = ["Startup time by component:"]
+        for name, seconds in self.load_times.items():
+            lines.append(f"  {name:<20} {seconds * 1000:9.1f} ms")
+        for name, seconds in self.matcher.load_times.items():
+            lines.append(f"    matcher.{name:<12} {seconds * 1000:9.1f} ms")
+        if not self.matcher._nlp_loaded:
+            lines.append("    matcher.nlp_model    (deferred until first semantic match)")
+        return "\n".join(lines)
     
     def get_symptom_suggestions(self, partial_input):
         """Get symptom suggestions for autocomplete"""
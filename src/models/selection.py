@@ -0,0 +1,304 @@
+import argparse
+import ast
+import io
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.neighbors import KNeighborsClassifier
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from src.models.fast_scorer import make_fast_scorer
+
+
+def make_candidates():
+    """
+    Candidate models from notebooks/03_model_training.ipynb
+
+    Each model is single-threaded; parallelism comes from running
+    (candidate, fold) jobs side by side. XGBoost and LightGBM are
+    skipped with a warning when they are not installed.
+    """
+    candidates = {
+        'Naive Bayes': MultinomialNB(),
+        'Logistic Regression': LogisticRegression(max_iter=1000, random_state=42),
+        'K-Nearest Neighbors': KNeighborsClassifier(n_neighbors=5),
+        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'Extra Trees': ExtraTreesClassifier(n_estimators=100, random_state=42),
+        'Gradient Boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
+    }
+
+    try:
+        from xgboost import XGBClassifier
+        candidates['XGBoost'] = XGBClassifier(n_estimators=100, random_state=42, n_jobs=1)
+    except ImportError:
+        print("Warning: xgboost not installed, skipping XGBoost")
+
+    try:
+        from lightgbm import LGBMClassifier
+        candidates['LightGBM'] = LGBMClassifier(
+            n_estimators=100, random_state=42, verbose=-1, n_jobs=1
+        )
+    except ImportError:
+        print("Warning: lightgbm not installed, skipping LightGBM")
+
+    return candidates
+
+
+def load_training_data(processed_dir):
+    """
+    Load the feature matrix and encoded labels
+
+    Uses X_features.npz / y_target.npy from the preprocessor CLI when
+    present, otherwise encodes processed_disease_data.csv with the
+    saved vocabulary (columns in sorted symptom order).
+
+    Returns:
+        (csr_matrix, label array)
+    """
+    features_path = os.path.join(processed_dir, 'X_features.npz')
+    if os.path.exists(features_path):
+        return sparse.load_npz(features_path).tocsr(), np.load(os.path.join(processed_dir, 'y_target.npy'))
+
+    vocab_data = joblib.load(os.path.join(processed_dir, 'vocabulary.pkl'))
+    symptom_to_idx = {s: i for i, s in enumerate(sorted(vocab_data['symptoms']))}
+    df = pd.read_csv(os.path.join(processed_dir, 'processed_disease_data.csv'))
+
+    indptr = [0]
+    indices = []
+    for symptoms in df['symptoms']:
+        indices.extend(sorted({symptom_to_idx[s] for s in ast.literal_eval(symptoms)}))
+        indptr.append(len(indices))
+
+    X = sparse.csr_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(len(df), len(symptom_to_idx))
+    )
+    return X, vocab_data['label_encoder'].transform(df['disease'])
+
+
+def _fit(estimator, X, y):
+    """Fit a fresh clone of estimator"""
+    model = clone(estimator)
+    model.fit(X, y)
+    return model
+
+
+def _fit_and_score(estimator, X, y, train_idx, test_idx):
+    """Fit a fresh clone on one fold and return its accuracy and fit time"""
+    model = clone(estimator)
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - start
+    accuracy = float(np.mean(model.predict(X[test_idx]) == y[test_idx]))
+    return {'accuracy': accuracy, 'fit_seconds': fit_seconds}
+
+
+def cross_validate_candidates(candidates, X, y, n_splits=5, n_jobs=-1, cache_dir=None,
+                              random_state=42):
+    """
+    Cross-validate all candidates, running every (candidate, fold) pair in parallel
+
+    With cache_dir set, fold results are memoized on disk keyed by the
+    estimator's parameters, the data and the fold indices (joblib.Memory),
+    so re-runs only fit the folds of new or changed candidates.
+
+    Returns:
+        {name: {'cv_mean', 'cv_std', 'fit_seconds'}}
+    """
+    score = _fit_and_score
+    if cache_dir:
+        score = joblib.Memory(cache_dir, verbose=0).cache(_fit_and_score)
+
+    folds = list(StratifiedKFold(n_splits, shuffle=True, random_state=random_state).split(X, y))
+    jobs = [(name, train_idx, test_idx) for name in candidates for train_idx, test_idx in folds]
+
+    fold_results = Parallel(n_jobs=n_jobs)(
+        delayed(score)(candidates[name], X, y, train_idx, test_idx)
+        for name, train_idx, test_idx in jobs
+    )
+
+    results = {}
+    for name in candidates:
+        scores = [r for (job_name, _, _), r in zip(jobs, fold_results) if job_name == name]
+        accuracies = np.array([r['accuracy'] for r in scores])
+        results[name] = {
+            'cv_mean': float(accuracies.mean()),
+            'cv_std': float(accuracies.std()),
+            'fit_seconds': float(np.mean([r['fit_seconds'] for r in scores]))
+        }
+    return results
+
+
+def measure_inference(model, X_sample, repeats=1000):
+    """
+    Serving cost of a fitted model
+
+    Single-row latency uses the path DiseasePredictor would take: the
+    native fast scorer when the model has one, predict_proba otherwise.
+
+    Returns:
+        dict with single_row_us (p50), batch_row_us (per row when scoring
+        X_sample at once), size_kb (joblib pickle) and load_ms
+    """
+    scorer = make_fast_scorer(model)
+    rows = [X_sample[i] for i in range(min(len(X_sample.indptr) - 1, repeats))]
+
+    latencies = []
+    for i in range(repeats):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        if scorer is not None:
+            scorer.predict_proba_indices(row.indices)
+        else:
+            model.predict_proba(row)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict_proba(X_sample)
+    batch_seconds = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    load_seconds = []
+    for _ in range(3):
+        buffer.seek(0)
+        start = time.perf_counter()
+        joblib.load(buffer)
+        load_seconds.append(time.perf_counter() - start)
+
+    return {
+        'fast_path': scorer is not None,
+        'single_row_us': float(np.median(latencies) * 1e6),
+        'batch_row_us': float(batch_seconds / X_sample.shape[0] * 1e6),
+        'size_kb': buffer.getbuffer().nbytes / 1024,
+        'load_ms': float(min(load_seconds) * 1000)
+    }
+
+
+def pareto_front(rows, accuracy_key='cv_mean', latency_key='single_row_us'):
+    """
+    Names of candidates not dominated on (higher accuracy, lower latency)
+    Returns them ordered from fastest to slowest.
+    """
+    front = []
+    for name, row in rows.items():
+        dominated = any(
+            other[accuracy_key] >= row[accuracy_key]
+            and other[latency_key] <= row[latency_key]
+            and (other[accuracy_key] > row[accuracy_key] or other[latency_key] < row[latency_key])
+            for other_name, other in rows.items() if other_name != name
+        )
+        if not dominated:
+            front.append(name)
+    return sorted(front, key=lambda name: rows[name][latency_key])
+
+
+def select_model(rows, tolerance=0.001, accuracy_key='cv_mean', latency_key='single_row_us'):
+    """
+    Fastest model on the Pareto front whose accuracy is within tolerance
+    of the most accurate candidate
+    """
+    best_accuracy = max(row[accuracy_key] for row in rows.values())
+    for name in pareto_front(rows, accuracy_key, latency_key):
+        if rows[name][accuracy_key] >= best_accuracy - tolerance:
+            return name
+
+
+def run_selection(X, y, candidates=None, n_splits=5, n_jobs=-1, cache_dir=None,
+                  tolerance=0.001, repeats=1000):
+    """
+    Cross-validate candidates, fit each on a train split and measure it
+
+    Returns:
+        (results DataFrame indexed by model name, winner name, fitted models)
+    """
+    if candidates is None:
+        candidates = make_candidates()
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    rows = cross_validate_candidates(
+        candidates, X_train, y_train, n_splits=n_splits, n_jobs=n_jobs, cache_dir=cache_dir
+    )
+
+    fit = _fit
+    if cache_dir:
+        fit = joblib.Memory(cache_dir, verbose=0).cache(_fit)
+
+    fitted = {}
+    for name, estimator in candidates.items():
+        model = fit(estimator, X_train, y_train)
+        fitted[name] = model
+        rows[name]['test_accuracy'] = float(np.mean(model.predict(X_test) == y_test))
+        rows[name].update(measure_inference(model, X_test, repeats=repeats))
+
+    front = set(pareto_front(rows))
+    winner = select_model(rows, tolerance)
+    for name, row in rows.items():
+        row['pareto'] = name in front
+
+    results = pd.DataFrame.from_dict(rows, orient='index')
+    results.index.name = 'model'
+    return results, winner, fitted
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Cross-validate candidate models and pick one on accuracy and latency'
+    )
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data/processed'))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--cache-dir', default=os.path.join(project_root, 'models/.selection_cache'),
+                        help="Fold result cache; pass '' to disable")
+    parser.add_argument('--tolerance', type=float, default=0.001,
+                        help='Accuracy a faster model may give up against the most accurate one')
+    # Not models/model_comparison.csv: that is the notebook's comparison,
+    # with different columns
+    parser.add_argument('--output', default=os.path.join(project_root, 'models/model_selection.csv'))
+    parser.add_argument('--save', help='Write the selected model here (e.g. models/best_model.pkl)')
+    args = parser.parse_args()
+
+    X, y = load_training_data(args.data_dir)
+    print(f"Features: {X.shape}, {len(np.unique(y))} classes")
+
+    start = time.perf_counter()
+    results, winner, fitted = run_selection(
+        X, y, n_splits=args.folds, n_jobs=args.n_jobs,
+        cache_dir=args.cache_dir or None, tolerance=args.tolerance
+    )
+    print(f"Selection finished in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'model':<22} {'cv mean':>8} {'cv std':>7} {'test':>6} {'1-row us':>9} "
+          f"{'batch us':>9} {'size kb':>9} {'load ms':>8}  pareto")
+    print("-" * 92)
+    for name, r in results.sort_values('single_row_us').iterrows():
+        flag = "*" if r['pareto'] else ""
+        print(f"{name:<22} {r['cv_mean']:>8.4f} {r['cv_std']:>7.4f} {r['test_accuracy']:>6.3f} "
+              f"{r['single_row_us']:>9.1f} {r['batch_row_us']:>9.2f} {r['size_kb']:>9.1f} "
+              f"{r['load_ms']:>8.2f}  {flag}")
+
+    print(f"\n✓ Selected: {winner} (fastest Pareto-optimal model within "
+          f"{args.tolerance} of the best CV accuracy)")
+
+    results.to_csv(args.output)
+    print(f"✓ Results saved to: {args.output}")
+
+    if args.save:
+        joblib.dump(fitted[winner], args.save)
+        print(f"✓ Model saved to: {args.save}")
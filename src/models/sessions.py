@@ -0,0 +1,302 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+
+def symptom_presence_probabilities(model):
+    """
+    P(symptom present | class) from a count-based model's training counts
+
+    MultinomialNB keeps per-class symptom counts (feature_count_) and
+    case counts (class_count_); with binary features their Laplace-
+    smoothed ratio is the fraction of each disease's cases that report
+    the symptom.
+
+    Returns:
+        (n_symptoms, n_classes) array, or None if the model has no counts
+    """
+    if not hasattr(model, 'feature_count_') or not hasattr(model, 'class_count_'):
+        return None
+    return presence_from_counts(model.feature_count_, model.class_count_)
+
+
+def presence_from_counts(feature_count, class_count):
+    """symptom_presence_probabilities from (n_classes, n_symptoms) and (n_classes,) counts"""
+    return ((feature_count + 1.0) / (class_count[:, np.newaxis] + 2.0)).T
+
+
+def information_gain(probabilities, presence):
+    """
+    Expected entropy reduction of the class posterior from asking about
+    each symptom, for all symptoms at once
+
+    Args:
+        probabilities: Current class probabilities, shape (n_classes,)
+        presence: P(symptom | class), shape (n_symptoms, n_classes)
+
+    Returns:
+        Gain in nats per symptom, shape (n_symptoms,)
+    """
+    joint_yes = presence * probabilities
+    joint_no = probabilities - joint_yes
+    p_yes = joint_yes.sum(axis=1, keepdims=True)
+    p_no = 1.0 - p_yes
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # sum over classes of P(c, answer) * log P(c | answer)
+        yes_term = np.where(joint_yes > 0, joint_yes * np.log(joint_yes / p_yes), 0.0)
+        no_term = np.where(joint_no > 0, joint_no * np.log(joint_no / p_no), 0.0)
+        prior = np.where(probabilities > 0, probabilities * np.log(probabilities), 0.0)
+
+    return (yes_term + no_term).sum(axis=1) - prior.sum()
+
+
+class DiagnosisSession:
+    """
+    One patient's running diagnosis
+
+    Holds the matched symptom columns and the class scores for them, so
+    adding or removing a symptom only adds or subtracts one weight row.
+    SessionStore replaces scores rather than changing them in place.
+    """
+
+    def __init__(self, session_id, scores, model_version):
+        self.session_id = session_id
+        self.symptoms = {}   # column index -> (symptom, confidence)
+        self.absent = set()  # columns the patient said they don't have
+        self.scores = scores
+        self.model_version = model_version
+        self.last_access = time.monotonic()
+
+    @property
+    def indices(self):
+        return sorted(self.symptoms)
+
+    @property
+    def used_symptoms(self):
+        return [self.symptoms[idx] for idx in self.indices]
+
+
+class SessionStore:
+    """
+    Bounded, thread-safe store of diagnosis sessions
+
+    Sessions idle longer than ttl_seconds expire, and once max_sessions
+    are open the least recently used one is evicted. Scoring needs a
+    linear fast scorer (see src.models.fast_scorer); next-symptom
+    suggestions also need per-class symptom counts (MultinomialNB).
+    """
+
+    def __init__(self, predictor, max_sessions=10000, ttl_seconds=1800):
+        if predictor.scorer is None:
+            raise ValueError(
+                f"{type(predictor.model).__name__} has no linear scorer; sessions need one"
+            )
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evictions = 0
+        self.set_predictor(predictor)
+
+    def set_predictor(self, predictor):
+        """
+        Score with another predictor (e.g. after a hot-swap); open sessions
+        are re-scored from their symptoms the next time they are used
+        """
+        bundle = predictor.bundle
+        if predictor.model is not None:
+            presence = symptom_presence_probabilities(predictor.model)
+        elif bundle is not None and bundle.feature_count is not None:
+            # Bundle-loaded predictors only have the exported arrays
+            presence = presence_from_counts(bundle.feature_count, bundle.class_count)
+        else:
+            presence = None
+        if presence is None:
+            model = predictor.model if predictor.model is not None else predictor.scorer
+            print(f"Warning: {type(model).__name__} has no symptom counts, "
+                  "next-symptom suggestions are disabled")
+
+        with self._lock:
+            self.predictor = predictor
+            self.presence = presence
+
+    def _expire_locked(self, now):
+        # Oldest access first, so stop at the first live session
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def _refresh_locked(self, session):
+        """Recompute scores if the session was built on an older model"""
+        scorer = self.predictor.scorer
+        if session.model_version != self.predictor.model_version:
+            session.scores = scorer.decision_function(session.indices)
+            session.model_version = self.predictor.model_version
+
+    def create(self):
+        """Open an empty session and return it"""
+        now = time.monotonic()
+        session = DiagnosisSession(
+            uuid.uuid4().hex,
+            np.array(self.predictor.scorer.bias, dtype=np.float64),
+            self.predictor.model_version
+        )
+        with self._lock:
+            self._expire_locked(now)
+            self._sessions[session.session_id] = session
+            self.created += 1
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        return session
+
+    def get(self, session_id):
+        """Return a live session and mark it used, or None if unknown or expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            self._sessions.move_to_end(session_id)
+            session.last_access = now
+            self._refresh_locked(session)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def update(self, session, add=(), remove=(), absent=()):
+        """
+        Add, remove or rule out symptoms
+        add and absent are user text, matched like /predict. remove takes
+        vocabulary symptoms as returned in used_symptoms, since several
+        inputs can match the same symptom; other terms are ignored.
+        Each added or removed symptom costs one O(n_classes) update.
+
+        Returns:
+            (added, removed) lists of vocabulary symptoms actually changed
+        """
+        # Match outside the lock; it may run the slower matcher stages
+        predictor = self.predictor
+        removed_indices = [predictor.symptom_to_idx[s] for s in remove
+                           if s in predictor.symptom_to_idx]
+        absent_indices = predictor.match_symptoms(absent)[0] if absent else []
+        added_symptoms = predictor.match_symptoms(add)[1] if add else []
+        added = []
+        removed = []
+
+        with self._lock:
+            self._refresh_locked(session)
+            weights = self.predictor.scorer.weights
+            scores = session.scores.copy()
+
+            for idx in removed_indices:
+                if idx in session.symptoms:
+                    scores -= weights[idx]
+                    removed.append(session.symptoms.pop(idx)[0])
+
+            session.absent.update(i for i in absent_indices if i not in session.symptoms)
+
+            for symptom, confidence in added_symptoms:
+                idx = predictor.symptom_to_idx[symptom]
+                if idx not in session.symptoms:
+                    scores += weights[idx]
+                    session.symptoms[idx] = (symptom, confidence)
+                    session.absent.discard(idx)
+                    added.append(symptom)
+
+            session.scores = scores
+            session.last_access = time.monotonic()
+
+        return added, removed
+
+    def _snapshot(self, session):
+        """The session's scores and symptoms as of one update"""
+        with self._lock:
+            asked = list(session.symptoms) + list(session.absent)
+            return session.scores, session.indices, session.used_symptoms, asked
+
+    def _probabilities(self, scores, indices):
+        if not indices:
+            return None
+        predictor = self.predictor
+        if predictor.cascade is None:
+            return predictor.scorer.normalize(scores[np.newaxis, :])[0]
+
+        start = time.perf_counter()
+        probabilities = predictor.scorer.normalize(scores[np.newaxis, :])
+        return predictor.cascade.refine(
+            probabilities, lambda rows: predictor._feature_row(indices),
+            time.perf_counter() - start
+        )[0]
+
+    def probabilities(self, session):
+        """Class probabilities for the session's current symptoms"""
+        scores, indices, _, _ = self._snapshot(session)
+        return self._probabilities(scores, indices)
+
+    def predictions(self, session, return_top_n=3, confidence_threshold=0.3):
+        """Shaped like DiseasePredictor.predict()'s predictions"""
+        scores, indices, used_symptoms, _ = self._snapshot(session)
+        probabilities = self._probabilities(scores, indices)
+        if probabilities is None:
+            return []
+        return self.predictor._top_predictions(
+            probabilities, used_symptoms, return_top_n, confidence_threshold
+        )
+
+    def suggest(self, session, n=3):
+        """
+        Symptoms worth asking about next, most informative first
+
+        Returns:
+            List of (symptom, expected information gain in nats)
+        """
+        presence = self.presence
+        if presence is None or n <= 0:
+            return []
+
+        scores, indices, _, asked = self._snapshot(session)
+        probabilities = self._probabilities(scores, indices)
+        if probabilities is None:
+            probabilities = self.predictor.scorer.normalize(
+                self.predictor.scorer.bias[np.newaxis, :]
+            )[0]
+
+        gain = information_gain(probabilities, presence)
+        gain[asked] = -np.inf
+
+        n = min(n, len(gain) - len(asked))
+        if n <= 0:
+            return []
+        top = np.argpartition(-gain, n - 1)[:n]
+        top = top[np.lexsort((top, -gain[top]))]
+        symptom_list = self.predictor.symptom_list
+        return [(symptom_list[idx], float(gain[idx])) for idx in top]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'created': self.created,
+                'expired': self.expired,
+                'evictions': self.evictions
+            }
+
+    def __len__(self):
+        return len(self._sessions)
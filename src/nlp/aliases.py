@@ -0,0 +1,117 @@
+import json
+import threading
+
+from src.nlp.autocomplete import normalize_symptom
+
+
+def _singular(word, strip_es=False):
+    """
+    Crude plural folding, applied the same way to vocabulary and input
+    After ch/sh/ss/x the plural may add "-es" ("patches") or just "-s"
+    ("headaches"), so strip_es picks which one to undo there.
+    """
+    if len(word) <= 3 or word.endswith(('ss', 'us', 'is')):
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if strip_es and word.endswith(('ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+def alias_keys(text):
+    """
+    Lookup keys for a symptom, most specific first:
+    normalized words, the space-free form, and the space-free form
+    with plurals folded by dropping "-s" ("headaches" -> "headache")
+    or "-es" ("dischromic _patches" -> "dischromicpatch")
+    """
+    normalized = normalize_symptom(text)
+    words = normalized.split()
+    keys = [
+        normalized,
+        ''.join(words),
+        ''.join(_singular(word) for word in words)
+    ]
+    es_folded = ''.join(_singular(word, strip_es=True) for word in words)
+    if es_folded != keys[-1]:
+        keys.append(es_folded)
+    return tuple(keys)
+
+
+def load_synonyms(path):
+    """
+    Load a synonyms file: JSON object mapping a vocabulary symptom to a
+    list of alternative phrasings, e.g. {"vomiting": ["throwing up"]}
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class SymptomAliasIndex:
+    """
+    Hash index from normalized spellings and synonyms to vocabulary symptoms
+
+    Resolves inputs that differ from a symptom only in case, spacing,
+    underscores/punctuation or plural endings, plus any listed synonyms,
+    with a few dict lookups. Keys that would map to two different
+    symptoms keep the first one in vocabulary order.
+    """
+
+    def __init__(self, symptom_vocabulary, synonyms=None):
+        self.symptoms = list(symptom_vocabulary)
+        self._index = {}
+
+        # Exact spellings first so they can never be shadowed
+        for symptom in self.symptoms:
+            self._index.setdefault(symptom, symptom)
+        symptom_keys = [(symptom, alias_keys(symptom)) for symptom in self.symptoms]
+        for key_level in range(max((len(keys) for _, keys in symptom_keys), default=0)):
+            for symptom, keys in symptom_keys:
+                if key_level < len(keys):
+                    self._index.setdefault(keys[key_level], symptom)
+
+        for canonical, aliases in (synonyms or {}).items():
+            symptom = self.lookup(canonical, count=False)
+            if symptom is None:
+                print(f"Warning: synonym entry '{canonical}' is not in the vocabulary, skipping")
+                continue
+            for alias in aliases:
+                for key in alias_keys(alias):
+                    self._index.setdefault(key, symptom)
+
+        self._index.pop('', None)
+        self.lookups = 0
+        self.resolved = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def lookup(self, text, count=True):
+        """Vocabulary symptom for text, or None if no alias matches"""
+        symptom = self._index.get(text)
+        if symptom is None and text:
+            for key in alias_keys(text):
+                symptom = self._index.get(key)
+                if symptom is not None:
+                    break
+        if count:
+            with self._lock:
+                self.lookups += 1
+                if symptom is not None:
+                    self.resolved += 1
+        return symptom
+
+    def stats(self):
+        """Alias count plus how much of the traffic the index resolved"""
+        with self._lock:
+            lookups, resolved = self.lookups, self.resolved
+        return {
+            'aliases': len(self._index),
+            'lookups': lookups,
+            'resolved': resolved,
+            'resolved_fraction': resolved / lookups if lookups else 0.0
+        }
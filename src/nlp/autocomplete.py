@@ -0,0 +1,135 @@
+import re
+from collections import Counter, defaultdict
+
+from fuzzywuzzy import fuzz
+
+
+def normalize_symptom(text):
+    """Lowercase, replace punctuation/underscores with spaces and collapse whitespace"""
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).split())
+
+
+class SymptomAutocompleteIndex:
+    """
+    Fast symptom autocomplete built once over the vocabulary:
+    1. Precomputed top-k suggestions for short inputs
+    2. Character n-gram inverted index for substring lookup
+    3. Fuzzy scoring on a small candidate set as a fallback
+
+    Matching ignores spaces, so "skin rash" finds "skinrash" and vice versa.
+    Substring hits are ranked: whole-symptom prefix, then word prefix,
+    then any other position; ties go to the shorter symptom.
+    """
+
+    def __init__(self, symptom_vocabulary, ngram_size=3, top_k=10, fallback_candidates=20):
+        self.symptoms = list(symptom_vocabulary)
+        self.ngram_size = ngram_size
+        self.top_k = top_k
+        self.fallback_candidates = fallback_candidates
+
+        # Space-free form used for substring matching, plus the offsets where
+        # each word starts so word prefixes can be ranked above inner hits
+        self._compact = []
+        self._word_starts = []
+        for symptom in self.symptoms:
+            words = normalize_symptom(symptom).split()
+            starts = set()
+            offset = 0
+            for word in words:
+                starts.add(offset)
+                offset += len(word)
+            self._compact.append(''.join(words))
+            self._word_starts.append(starts)
+
+        # Inverted index: every substring up to ngram_size chars -> symptom ids
+        postings = defaultdict(set)
+        for i, text in enumerate(self._compact):
+            for size in range(1, ngram_size + 1):
+                for start in range(len(text) - size + 1):
+                    postings[text[start:start + size]].add(i)
+        self._postings = {gram: sorted(ids) for gram, ids in postings.items()}
+
+        # Short inputs are answered straight from a precomputed ranking
+        self._short_queries = {
+            gram: self._rank(gram, ids)[:top_k]
+            for gram, ids in self._postings.items()
+        }
+
+    def _rank(self, query, ids):
+        """Order symptom ids that contain query as a substring"""
+        def key(i):
+            text = self._compact[i]
+            if text.startswith(query):
+                position = 0
+            else:
+                position = 2
+                start = text.find(query)
+                while start != -1:
+                    if start in self._word_starts[i]:
+                        position = 1
+                        break
+                    start = text.find(query, start + 1)
+            return (position, len(text), text)
+
+        return sorted(ids, key=key)
+
+    def _substring_matches(self, query):
+        """Ids of symptoms containing query, found via the n-gram index"""
+        if len(query) <= self.ngram_size:
+            return self._postings.get(query, [])
+
+        grams = {query[i:i + self.ngram_size]
+                 for i in range(len(query) - self.ngram_size + 1)}
+        posting_lists = []
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if not ids:
+                return []
+            posting_lists.append(ids)
+
+        # Intersect starting from the rarest gram, then verify
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for ids in posting_lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return [i for i in candidates if query in self._compact[i]]
+
+    def _fuzzy_candidates(self, query):
+        """Symptoms sharing the most n-grams with query"""
+        size = min(self.ngram_size, len(query))
+        counts = Counter()
+        for i in range(len(query) - size + 1):
+            counts.update(self._postings.get(query[i:i + size], ()))
+        return [i for i, _ in counts.most_common(self.fallback_candidates)]
+
+    def suggest(self, partial_input, top_n=5, min_score=60):
+        """
+        Suggest symptoms for partial input
+        Returns: list of at most top_n vocabulary symptoms
+        """
+        query = normalize_symptom(partial_input).replace(' ', '')
+        if not query:
+            return []
+
+        if len(query) <= self.ngram_size and top_n <= self.top_k:
+            ranked = self._short_queries.get(query, [])
+        else:
+            ranked = self._rank(query, self._substring_matches(query))
+
+        ranked = ranked[:top_n]
+        if len(ranked) < top_n:
+            # Fall back to fuzzy scoring, but only on a few candidates
+            seen = set(ranked)
+            scored = []
+            for i in self._fuzzy_candidates(query):
+                if i in seen:
+                    continue
+                score = fuzz.partial_ratio(query, self._compact[i])
+                if score > min_score:
+                    scored.append((-score, len(self._compact[i]), i))
+            scored.sort()
+            ranked = ranked + [i for _, _, i in scored[:top_n - len(ranked)]]
+
+        return [self.symptoms[i] for i in ranked]
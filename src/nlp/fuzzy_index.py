@@ -0,0 +1,92 @@
+import string
+
+import numpy as np
+from fuzzywuzzy import fuzz, utils
+
+# Characters left after fuzzywuzzy's full_process(force_ascii=True);
+# anything else shares the last column, which only loosens the bound
+ALPHABET = string.ascii_lowercase + string.digits + ' '
+_CHAR_COLUMN = {c: i for i, c in enumerate(ALPHABET)}
+
+
+def _char_counts(text):
+    counts = np.zeros(len(ALPHABET) + 1, dtype=np.int32)
+    for c in text:
+        counts[_CHAR_COLUMN.get(c, len(ALPHABET))] += 1
+    return counts
+
+
+def _sorted_tokens(text):
+    return ' '.join(sorted(text.split()))
+
+
+class FuzzyCandidateIndex:
+    """
+    Exact drop-in for process.extractOne(query, choices,
+    scorer=fuzz.token_sort_ratio) that only scores a few candidates.
+
+    token_sort_ratio compares token-sorted strings a and b as
+    2 * LCS(a, b) / (len(a) + len(b)). The LCS can't exceed the shared
+    character counts, so each choice gets a score upper bound from one
+    vectorized np.minimum over a precomputed (n_choices, alphabet)
+    count matrix. Choices are then scored in order of decreasing bound.
+    Scoring stops once no remaining bound can reach the best score so
+    far or the threshold. Ties go to the earlier choice, as in extractOne.
+    """
+
+    def __init__(self, choices):
+        self.choices = list(choices)
+
+        # Same processing extractOne applies to each choice
+        self._processed = [utils.full_process(c, force_ascii=True) for c in self.choices]
+        sorted_choices = [_sorted_tokens(p) for p in self._processed]
+
+        self._counts = np.array([_char_counts(s) for s in sorted_choices], dtype=np.int32)
+        self._lengths = np.array([len(s) for s in sorted_choices], dtype=np.int32)
+
+    def upper_bounds(self, processed_query):
+        """Upper bound of the token_sort_ratio score for every choice"""
+        sorted_query = _sorted_tokens(processed_query)
+        shared = np.minimum(self._counts, _char_counts(sorted_query)).sum(axis=1)
+        total = self._lengths + len(sorted_query)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = np.where(total > 0, 200.0 * shared / total, 0.0)
+        # Round the same way fuzzywuzzy does, plus a hair for float error
+        return np.floor(bounds + 0.5 + 1e-9).astype(np.int32)
+
+    def best_match(self, query, threshold):
+        """
+        Best (choice, score) if its score is >= threshold, else None
+        Matches process.extractOne whenever the true best score >= threshold.
+        """
+        if not self.choices:
+            return None
+
+        processed_query = utils.full_process(utils.full_process(query), force_ascii=True)
+        if threshold <= 0 or not processed_query:
+            # Degenerate cases: every choice scores 0, defer to the full scan
+            from fuzzywuzzy import process
+            best = process.extractOne(query, self.choices, scorer=fuzz.token_sort_ratio)
+            return best if best and best[1] >= threshold else None
+
+        bounds = self.upper_bounds(processed_query)
+        candidates = np.flatnonzero(bounds >= threshold)
+        if not len(candidates):
+            return None
+
+        # Highest bound first, earlier choice first among equal bounds
+        order = candidates[np.lexsort((candidates, -bounds[candidates]))]
+
+        best_score = -1
+        best_idx = None
+        for idx in order:
+            if bounds[idx] < best_score:
+                break
+            score = fuzz.token_sort_ratio(processed_query, self._processed[idx], full_process=False)
+            if score > best_score or (score == best_score and idx < best_idx):
+                best_score = score
+                best_idx = idx
+
+        if best_score < threshold:
+            return None
+        return self.choices[best_idx], best_score
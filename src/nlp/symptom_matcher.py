@@ -1,28 +1,186 @@
+import threading
+import time
+
 import numpy as np
-from fuzzywuzzy import fuzz, process
-import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from src.nlp.aliases import SymptomAliasIndex, load_synonyms
+from src.nlp.autocomplete import SymptomAutocompleteIndex
+from src.nlp.fuzzy_index import FuzzyCandidateIndex
+from src.nlp.word_vectors import WordVectorTable, is_word_vector_table
+from src.utils.cache import BoundedCache
+from src.utils.memory import memory_mark, memory_since
+
 class SymptomMatcher:
     """
     Intelligent symptom matching using multiple techniques:
     1. Exact matching
     2. Fuzzy string matching
     3. Semantic similarity (using word embeddings)
+    
+    Ahead of the cascade (and its cache) an alias index resolves spelling
+    variants such as "skin_rash" or "Skin Rash " and the synonyms listed
+    in the optional synonyms_path JSON file in constant time.
+    
+    nlp_model is a spaCy package name, a path to a saved pipeline, or a
+    word-vector table exported by src.nlp.word_vectors (float16,
+    memory-mapped), which serves the semantic stage without spaCy.
+    With lazy_nlp=True spaCy is imported and loaded on the first query
+    that reaches the semantic stage instead of at construction.
+    Load durations are recorded in load_times (seconds) and RSS/heap
+    growth in load_memory (see src.utils.memory).
+    
+    Pass a MetricsRegistry as metrics to record per-stage latency and
+    which stage resolved each input; None (default) disables it.
     """
     
-    def __init__(self, symptom_vocabulary):
+    MATCH_STAGES = ('exact', 'fuzzy', 'semantic', 'tfidf')
+    
+    def __init__(self, symptom_vocabulary, cache_size=1024, cache_policy='lru',
+                 nlp_model='en_core_web_md', lazy_nlp=False, metrics=None,
+                 synonyms_path=None):
         self.symptom_vocabulary = list(symptom_vocabulary)
+        self._vocabulary_set = set(self.symptom_vocabulary)
+        self.metrics = None
+        if metrics is not None:
+            self.instrument(metrics)
+        self._stage_methods = {
+            stage: getattr(self, f'_match_{stage}') for stage in self.MATCH_STAGES
+        }
+        self.load_times = {}
+        self.load_memory = {}
+        self.nlp_model = nlp_model
         self.nlp = None
-        try:
-            self.nlp = spacy.load('en_core_web_md')
-        except:
-            print("Warning: spacy model not loaded. Install with: python -m spacy download en_core_web_md")
+        self.word_vectors = None
+        self.symptom_embeddings = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
+        if not lazy_nlp:
+            self._load_nlp()
+        
+        # Normalized spellings and synonyms -> symptom
+        start = time.perf_counter()
+        mark = memory_mark()
+        synonyms = None
+        if synonyms_path:
+            try:
+                synonyms = load_synonyms(synonyms_path)
+            except FileNotFoundError:
+                print(f"Warning: synonyms file not found: {synonyms_path}")
+        self.aliases = SymptomAliasIndex(self.symptom_vocabulary, synonyms)
+        self.load_times['aliases'] = time.perf_counter() - start
+        self.load_memory['aliases'] = memory_since(mark)
         
         # Create TF-IDF vectorizer for symptoms
+        start = time.perf_counter()
+        mark = memory_mark()
         self.tfidf = TfidfVectorizer()
         self.symptom_vectors = self.tfidf.fit_transform(self.symptom_vocabulary)
+        self.load_times['tfidf'] = time.perf_counter() - start
+        self.load_memory['tfidf'] = memory_since(mark)
+        
+        # Prefix/n-gram index for autocomplete
+        start = time.perf_counter()
+        mark = memory_mark()
+        self.autocomplete = SymptomAutocompleteIndex(self.symptom_vocabulary)
+        self.load_times['autocomplete'] = time.perf_counter() - start
+        self.load_memory['autocomplete'] = memory_since(mark)
+
+        # Character-count bounds so fuzzy matching only scores likely candidates
+        start = time.perf_counter()
+        mark = memory_mark()
+        self.fuzzy_index = FuzzyCandidateIndex(self.symptom_vocabulary)
+        self.load_times['fuzzy_index'] = time.perf_counter() - start
+        self.load_memory['fuzzy_index'] = memory_since(mark)
+        
+        # Memoize match results per (normalized input, threshold);
+        # cache_size=0 disables caching
+        self.match_cache = None
+        if cache_size:
+            self.match_cache = BoundedCache(cache_size, policy=cache_policy)
+    
+    def instrument(self, metrics):
+        """Start recording match metrics into a MetricsRegistry"""
+        self._stage_latency = metrics.histogram(
+            'symptom_match_stage_seconds',
+            'Latency of each symptom matching cascade stage',
+            ('stage',)
+        )
+        self._resolved = metrics.counter(
+            'symptom_match_resolved_total',
+            'Inputs resolved per cascade stage (alias = alias index, cache = match cache)',
+            ('stage',)
+        )
+        self.metrics = metrics
+    
+    def _load_nlp(self):
+        """Load word vectors and the vocabulary embeddings once (thread-safe)"""
+        with self._nlp_lock:
+            if self._nlp_loaded:
+                return
+            
+            start = time.perf_counter()
+            mark = memory_mark()
+            if is_word_vector_table(self.nlp_model):
+                self.word_vectors = WordVectorTable(self.nlp_model)
+                self.load_times['word_vectors'] = time.perf_counter() - start
+                self.load_memory['word_vectors'] = memory_since(mark)
+            else:
+                try:
+                    import spacy
+                    self.nlp = spacy.load(self.nlp_model)
+                except:
+                    print(f"Warning: spacy model not loaded. Install with: python -m spacy download {self.nlp_model}")
+                self.load_times['spacy_model'] = time.perf_counter() - start
+                self.load_memory['spacy_model'] = memory_since(mark)
+            
+            # Precompute unit-normalized word embeddings for the vocabulary so the
+            # semantic stage is a single matrix-vector product per query
+            if self.nlp or self.word_vectors:
+                start = time.perf_counter()
+                mark = memory_mark()
+                self.symptom_embeddings = self._build_embedding_matrix()
+                self.load_times['embeddings'] = time.perf_counter() - start
+                self.load_memory['embeddings'] = memory_since(mark)
+            
+            self._nlp_loaded = True
+    
+    def _build_embedding_matrix(self):
+        """
+        Build an (n_symptoms, dim) matrix of unit-length symptom vectors.
+        Symptoms without a vector get an all-zero row, which scores 0 just
+        like Doc.similarity does for empty vectors.
+        """
+        if self.word_vectors is not None:
+            dimensions = self.word_vectors.vectors_length
+        else:
+            dimensions = self.nlp.vocab.vectors_length
+        embeddings = np.zeros((len(self.symptom_vocabulary), dimensions), dtype=np.float32)
+        for i, symptom in enumerate(self.symptom_vocabulary):
+            vector = self._unit_vector(symptom)
+            if vector is not None:
+                embeddings[i] = vector
+        return embeddings
+    
+    def _unit_vector(self, text):
+        """Unit-length float32 vector for text, or None if it has no vector"""
+        if self.word_vectors is not None:
+            return self.word_vectors.unit_vector(text)
+        doc = self.nlp.make_doc(text)
+        if not doc.vector_norm:
+            return None
+        return (doc.vector / doc.vector_norm).astype(np.float32)
+    
+    def _semantic_scores(self, user_input):
+        """
+        Cosine similarity (0-100) between user input and every symptom.
+        Returns None when the input has no word vector.
+        """
+        user_vector = self._unit_vector(user_input)
+        if user_vector is None:
+            return None
+        return self.symptom_embeddings @ user_vector * 100
     
     def match_symptom(self, user_input, threshold=80):
         """
@@ -31,60 +189,181 @@ class SymptomMatcher:
         """
         user_input = user_input.lower().strip()
         
-        # Method 1: Exact match
-        if user_input in self.symptom_vocabulary:
-            return user_input, 100
+        alias = self._resolve_alias(user_input)
+        if alias is not None:
+            return alias
         
-        # Method 2: Fuzzy string matching
-        best_match = process.extractOne(
-            user_input, 
-            self.symptom_vocabulary,
-            scorer=fuzz.token_sort_ratio
-        )
+        if self.match_cache is None:
+            return self._match_symptom(user_input, threshold)
         
-        if best_match and best_match[1] >= threshold:
-            return best_match[0], best_match[1]
+        key = (user_input, threshold)
+        result = self.match_cache.get(key)
+        if result is not None and self.metrics is not None:
+            self._resolved.inc('cache')
+        if result is None:
+            result = self._match_symptom(user_input, threshold)
+            self.match_cache.put(key, result)
+        return result
+    
+    def _resolve_alias(self, user_input):
+        """(symptom, 100) if the alias index knows the input, else None"""
+        symptom = self.aliases.lookup(user_input)
+        if symptom is None:
+            return None
+        if self.metrics is not None:
+            self._resolved.inc('alias')
+        return symptom, 100
+    
+    def _match_symptom(self, user_input, threshold):
+        """Run the matching cascade on already normalized input"""
+        if self.metrics is not None:
+            return self._match_symptom_instrumented(user_input, threshold)
         
+        for stage in self.MATCH_STAGES:
+            result = self._stage_methods[stage](user_input, threshold)
+            if result is not None:
+                return result
+        return None, 0
+    
+    def _match_symptom_instrumented(self, user_input, threshold):
+        """The matching cascade, timing each stage it runs"""
+        for stage in self.MATCH_STAGES:
+            start = time.perf_counter()
+            result = self._stage_methods[stage](user_input, threshold)
+            self._stage_latency.observe(time.perf_counter() - start, stage)
+            if result is not None:
+                self._resolved.inc(stage)
+                return result
+        self._resolved.inc('unmatched')
+        return None, 0
+    
+    def match_stage(self, stage, user_input, threshold=80):
+        """
+        Run a single cascade stage ('exact', 'fuzzy', 'semantic' or 'tfidf')
+        Returns: (matched_symptom, confidence_score) or None if the stage
+        does not resolve the input
+        """
+        return self._stage_methods[stage](user_input.lower().strip(), threshold)
+    
+    def _match_exact(self, user_input, threshold):
+        # Method 1: Exact match
+        if user_input in self._vocabulary_set:
+            return user_input, 100
+        return None
+    
+    def _match_fuzzy(self, user_input, threshold):
+        # Method 2: Fuzzy string matching (same result as a full
+        # process.extractOne scan with token_sort_ratio)
+        return self.fuzzy_index.best_match(user_input, threshold)
+    
+    def _match_semantic(self, user_input, threshold):
         # Method 3: Semantic similarity (if spacy is available)
-        if self.nlp:
-            user_doc = self.nlp(user_input)
-            best_similarity = 0
-            best_symptom = None
-            
-            for symptom in self.symptom_vocabulary:
-                symptom_doc = self.nlp(symptom)
-                similarity = user_doc.similarity(symptom_doc) * 100
-                
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_symptom = symptom
-            
-            if best_similarity >= threshold * 0.8:  # Lower threshold for semantic
-                return best_symptom, best_similarity
+        if not self._nlp_loaded:
+            self._load_nlp()
         
+        if self.symptom_embeddings is not None:
+            similarities = self._semantic_scores(user_input)
+            if similarities is not None:
+                best_idx = np.argmax(similarities)
+                best_similarity = float(similarities[best_idx])
+                
+                if best_similarity >= threshold * 0.8:  # Lower threshold for semantic
+                    return self.symptom_vocabulary[best_idx], best_similarity
+        return None
+    
+    def _match_tfidf(self, user_input, threshold):
         # Method 4: TF-IDF cosine similarity
-        user_vector = self.tfidf.transform([user_input])
-        similarities = cosine_similarity(user_vector, self.symptom_vectors)[0]
-        best_idx = np.argmax(similarities)
-        best_score = similarities[best_idx] * 100
+        best_idx, best_scores = self._tfidf_best([user_input])
+        best_score = best_scores[0]
         
         if best_score >= threshold * 0.7:
-            return self.symptom_vocabulary[best_idx], best_score
-        
-        return None, 0
+            return self.symptom_vocabulary[best_idx[0]], best_score
+        return None
+    
+    def _tfidf_best(self, user_inputs):
+        """
+        Best TF-IDF match for each input with one transform and one sparse
+        similarity matrix against the precomputed symptom vectors
+        Returns: (best_idx, best_scores) arrays, scores on a 0-100 scale
+        """
+        user_vectors = self.tfidf.transform(user_inputs)
+        similarities = cosine_similarity(user_vectors, self.symptom_vectors, dense_output=False).tocsr()
+        # Sorted, explicit non-zero entries make sparse argmax pick the
+        # lowest column on ties (and column 0 for empty rows) like np.argmax
+        similarities.eliminate_zeros()
+        similarities.sort_indices()
+        best_idx = np.asarray(similarities.argmax(axis=1)).ravel()
+        best_scores = similarities.max(axis=1).toarray().ravel() * 100
+        return best_idx, best_scores
     
     def match_multiple_symptoms(self, user_inputs, threshold=80):
         """
         Match multiple user inputs to symptoms
+        Inputs still unresolved after the cheaper stages share a single
+        batched TF-IDF pass.
         Returns: list of (matched_symptom, confidence) tuples
         """
+        normalized = [user_input.lower().strip() for user_input in user_inputs]
+        results = {}
+        pending = []
+        
+        for user_input in dict.fromkeys(normalized):
+            result = self._resolve_alias(user_input)
+            if result is None and self.match_cache is not None:
+                result = self.match_cache.get((user_input, threshold))
+                if result is not None and self.metrics is not None:
+                    self._resolved.inc('cache')
+            if result is None:
+                result = self._match_before_tfidf(user_input, threshold)
+            if result is None:
+                pending.append(user_input)
+            else:
+                results[user_input] = result
+        
+        if pending:
+            start = time.perf_counter()
+            best_idx, best_scores = self._tfidf_best(pending)
+            if self.metrics is not None:
+                # Amortized per input so the histogram stays per-lookup
+                elapsed = (time.perf_counter() - start) / len(pending)
+            for user_input, idx, score in zip(pending, best_idx, best_scores):
+                result = None, 0
+                if score >= threshold * 0.7:
+                    result = self.symptom_vocabulary[idx], score
+                if self.metrics is not None:
+                    self._stage_latency.observe(elapsed, 'tfidf')
+                    self._resolved.inc('tfidf' if result[0] else 'unmatched')
+                results[user_input] = result
+                if self.match_cache is not None:
+                    self.match_cache.put((user_input, threshold), result)
+        
         matches = []
-        for user_input in user_inputs:
-            match, score = self.match_symptom(user_input, threshold)
+        for user_input in normalized:
+            match, score = results[user_input]
             if match:
                 matches.append((match, score))
         return matches
     
+    def _match_before_tfidf(self, user_input, threshold):
+        """
+        Cascade stages ahead of TF-IDF; caches and returns the result, or
+        returns None if the input still needs the TF-IDF stage
+        """
+        for stage in self.MATCH_STAGES[:-1]:
+            if self.metrics is not None:
+                start = time.perf_counter()
+                result = self._stage_methods[stage](user_input, threshold)
+                self._stage_latency.observe(time.perf_counter() - start, stage)
+            else:
+                result = self._stage_methods[stage](user_input, threshold)
+            if result is not None:
+                if self.metrics is not None:
+                    self._resolved.inc(stage)
+                if self.match_cache is not None:
+                    self.match_cache.put((user_input, threshold), result)
+                return result
+        return None
+    
     def suggest_symptoms(self, partial_input, top_n=5):
         """
         Suggest symptoms based on partial input (for autocomplete)
@@ -92,12 +371,4 @@ class SymptomMatcher:
         if not partial_input:
             return []
         
-        partial_input = partial_input.lower().strip()
-        suggestions = process.extract(
-            partial_input,
-            self.symptom_vocabulary,
-            scorer=fuzz.partial_ratio,
-            limit=top_n
-        )
-        
-        return [s[0] for s in suggestions if s[1] > 60]
\ No newline at end of file
+        return self.autocomplete.suggest(partial_input, top_n=top_n)
\ No newline at end of file
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import re
+import string
+import sys
+import time
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+VECTORS_FILE = 'vectors.npy'
+ROWS_FILE = 'rows.npy'
+WORDS_FILE = 'words.txt'
+SPECIAL_CASES_FILE = 'special_cases.json'
+META_FILE = 'meta.json'
+
+# Close to spaCy's tokenizer for lowercase symptom text: words, plus
+# each punctuation character as its own token. spaCy's tokenizer
+# exceptions ("can't" -> "ca", "n't") are exported with the table.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+EDGE_PUNCTUATION = re.compile(r"^([^\w\s]*)(.*?)([^\w\s]*)$")
+
+
+def is_word_vector_table(path):
+    """True if path is a directory written by export_word_vectors"""
+    return os.path.isfile(os.path.join(str(path), VECTORS_FILE))
+
+
+class WordVectorTable:
+    """
+    Reduced float16 word-vector table, a spaCy-free stand-in for Doc.vector
+
+    vectors.npy holds each distinct vector once and is memory-mapped, so
+    workers share one physical copy and startup only reads the word
+    list. rows.npy maps each line of words.txt to its vector row.
+    """
+
+    def __init__(self, table_dir, mmap=True):
+        self.table_dir = table_dir
+        self.vectors = np.load(os.path.join(table_dir, VECTORS_FILE), mmap_mode='r' if mmap else None)
+        rows = np.load(os.path.join(table_dir, ROWS_FILE))
+        with open(os.path.join(table_dir, WORDS_FILE), 'r', encoding='utf-8') as f:
+            words = f.read().split('\n')
+        self.word_to_row = dict(zip(words, rows.tolist()))
+        self.vectors_length = self.vectors.shape[1]
+
+        self.special_cases = {}
+        special_cases_path = os.path.join(table_dir, SPECIAL_CASES_FILE)
+        if os.path.exists(special_cases_path):
+            with open(special_cases_path, 'r', encoding='utf-8') as f:
+                self.special_cases = json.load(f)
+
+    def __len__(self):
+        return len(self.word_to_row)
+
+    def tokenize(self, text):
+        """Split text into tokens the way spaCy's tokenizer would for plain text"""
+        tokens = []
+        for chunk in text.split():
+            if chunk in self.special_cases:
+                tokens.extend(self.special_cases[chunk])
+                continue
+            prefix, core, suffix = EDGE_PUNCTUATION.match(chunk).groups()
+            tokens.extend(prefix)
+            if core in self.special_cases:
+                tokens.extend(self.special_cases[core])
+            else:
+                tokens.extend(TOKEN_PATTERN.findall(core))
+            tokens.extend(suffix)
+        return tokens
+
+    def text_vector(self, text):
+        """
+        Mean of the token vectors, out-of-table tokens counting as zeros,
+        like Doc.vector
+        """
+        tokens = self.tokenize(text)
+        vector = np.zeros(self.vectors_length, dtype=np.float32)
+        if not tokens:
+            return vector
+        rows = [self.word_to_row[t] for t in tokens if t in self.word_to_row]
+        if rows:
+            vector += self.vectors[rows].astype(np.float32).sum(axis=0)
+        return vector / len(tokens)
+
+    def unit_vector(self, text):
+        """Unit-length text vector, or None when no token has a vector"""
+        vector = self.text_vector(text)
+        norm = np.sqrt((vector ** 2).sum())
+        if not norm:
+            return None
+        return vector / norm
+
+
+def _table_words(nlp, texts, max_words):
+    """
+    Words to export: every token of the given texts, punctuation, and the
+    max_words most frequent lowercase words in the model's vector table
+    (spaCy's packaged vectors are stored in frequency order)
+    """
+    words = set(string.punctuation)
+    for text in texts:
+        words.update(token.text for token in nlp.make_doc(text.lower()))
+
+    strings = nlp.vocab.strings
+    frequent = []
+    for key, row in nlp.vocab.vectors.key2row.items():
+        word = strings[key] if key in strings else None
+        if word and word.isalpha() and word.islower():
+            frequent.append((row, word))
+    frequent.sort()
+    words.update(word for _, word in frequent[:max_words])
+    return sorted(words)
+
+
+def export_word_vectors(nlp, output_dir, texts=(), max_words=50000):
+    """
+    Write a float16 word-vector table covering texts and a lay word list
+
+    Args:
+        nlp: Loaded spaCy pipeline with word vectors
+        output_dir: Directory for vectors.npy, rows.npy, words.txt, meta.json
+        texts: Strings whose tokens must be covered (symptoms, synonyms)
+        max_words: How many of the model's most frequent words to add
+
+    Returns:
+        dict with words, unique vectors, dimensions and size in bytes
+    """
+    vectors = nlp.vocab.vectors
+    words = []
+    rows = []
+    row_ids = {}
+    for word in _table_words(nlp, texts, max_words):
+        row = vectors.key2row.get(nlp.vocab.strings[word])
+        if row is None:
+            continue
+        words.append(word)
+        rows.append(row_ids.setdefault(row, len(row_ids)))
+
+    table = np.zeros((len(row_ids), vectors.shape[1]), dtype=np.float16)
+    for source_row, row in row_ids.items():
+        table[row] = vectors.data[source_row]
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, VECTORS_FILE), table)
+    np.save(os.path.join(output_dir, ROWS_FILE), np.array(rows, dtype=np.int32))
+    with open(os.path.join(output_dir, WORDS_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words))
+
+    # Lowercase tokenizer exceptions, e.g. "cant" -> ["ca", "nt"]
+    special_cases = {
+        text: [token.text for token in nlp.make_doc(text)]
+        for text in nlp.tokenizer.rules
+        if text.islower() and not text.isspace()
+    }
+    with open(os.path.join(output_dir, SPECIAL_CASES_FILE), 'w', encoding='utf-8') as f:
+        json.dump(special_cases, f)
+
+    meta = {
+        'source': nlp.meta.get('name', ''),
+        'source_version': nlp.meta.get('version', ''),
+        'words': len(words),
+        'vectors': len(row_ids),
+        'dimensions': int(table.shape[1]),
+        'bytes': int(table.nbytes),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+    with open(os.path.join(output_dir, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def compare_semantic_matches(reference, candidate, inputs, threshold=80):
+    """
+    Compare the semantic stage of two SymptomMatchers on the same inputs
+
+    Returns:
+        dict with agreement (same match or both unmatched), best_agreement
+        (same top symptom when both have vectors) and max_score_diff
+    """
+    reference._load_nlp()
+    candidate._load_nlp()
+    agree = best_agree = compared = 0
+    max_diff = 0.0
+    for text in inputs:
+        text = text.lower().strip()
+        a = reference.match_stage('semantic', text, threshold)
+        b = candidate.match_stage('semantic', text, threshold)
+        agree += (a and a[0]) == (b and b[0])
+
+        scores_a = reference._semantic_scores(text)
+        scores_b = candidate._semantic_scores(text)
+        if scores_a is not None and scores_b is not None:
+            compared += 1
+            best_agree += int(np.argmax(scores_a) == np.argmax(scores_b))
+            max_diff = max(max_diff, float(np.abs(scores_a - scores_b).max()))
+
+    return {
+        'inputs': len(inputs),
+        'agreement': agree / len(inputs) if inputs else 0.0,
+        'best_agreement': best_agree / compared if compared else 0.0,
+        'max_score_diff': max_diff
+    }
+
+
+if __name__ == '__main__':
+    import joblib
+    import spacy
+
+    from src.nlp.aliases import load_synonyms
+    from src.nlp.symptom_matcher import SymptomMatcher
+    from src.utils.synthetic import LAY_SYNONYMS, make_inputs
+
+    parser = argparse.ArgumentParser(description='Export a compact word-vector table for the matcher')
+    parser.add_argument('--model', default='en_core_web_md', help='spaCy package or pipeline path')
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--synonyms', default=os.path.join(project_root, 'data/symptom_synonyms.json'))
+    parser.add_argument('--output', default=os.path.join(project_root, 'models/word_vectors'))
+    parser.add_argument('--max-words', type=int, default=50000)
+    args = parser.parse_args()
+
+    symptoms = sorted(joblib.load(args.vocab)['symptoms'])
+    texts = list(symptoms) + list(LAY_SYNONYMS.values())
+    if os.path.exists(args.synonyms):
+        for aliases in load_synonyms(args.synonyms).values():
+            texts.extend(aliases)
+
+    start = time.perf_counter()
+    nlp = spacy.load(args.model)
+    spacy_seconds = time.perf_counter() - start
+
+    meta = export_word_vectors(nlp, args.output, texts, args.max_words)
+    print(f"✓ Exported {meta['words']:,} words ({meta['vectors']:,} distinct vectors, "
+          f"{meta['dimensions']} dims) = {meta['bytes'] / 1e6:.1f} MB float16 to {args.output}")
+
+    start = time.perf_counter()
+    WordVectorTable(args.output)
+    table_seconds = time.perf_counter() - start
+    print(f"  Load time: spaCy {spacy_seconds * 1000:.0f} ms -> table {table_seconds * 1000:.0f} ms")
+
+    reference = SymptomMatcher(symptoms, cache_size=0, nlp_model=args.model)
+    candidate = SymptomMatcher(symptoms, cache_size=0, nlp_model=args.output)
+    inputs = [text for kind in ('paraphrase', 'typo', 'exact') for text in make_inputs(symptoms, kind, 500, seed=7)]
+    inputs += texts
+    report = compare_semantic_matches(reference, candidate, inputs)
+    print(f"  Semantic stage vs spaCy on {report['inputs']} inputs: "
+          f"{report['agreement']:.1%} same result, {report['best_agreement']:.1%} same top symptom, "
+          f"max score difference {report['max_score_diff']:.3f}")
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+
+
+class BoundedCache:
+    """
+    Size-bounded, thread-safe memoization cache
+
+    policy='lru' evicts the least recently used entry, policy='fifo'
+    evicts the oldest inserted entry regardless of reads.
+    Hit, miss and eviction counters are kept for sizing the cache.
+    """
+
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, maxsize=1024, policy='lru'):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return cached value for key, or default on a miss"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.policy == 'lru':
+                self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value, evicting the oldest entry if the cache is full"""
+        with self._lock:
+            self._put_locked(key, value)
+
+    def _put_locked(self, key, value):
+        if key in self._data:
+            self._data[key] = value
+            if self.policy == 'lru':
+                self._data.move_to_end(key)
+            return
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self):
+        """Counters and current size as a dict"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class VersionedCache(BoundedCache):
+    """
+    BoundedCache whose entries all belong to one version of their source,
+    e.g. a model bundle
+
+    The cache only moves forward: a lookup with a version it hasn't seen
+    drops every entry and makes that version current, while lookups and
+    writes with a version it has moved past miss and are ignored. Entries
+    from an old model are never served after a swap, and requests still
+    running on the old model don't throw away the new model's entries.
+    advance() makes any version current, including a retired one (a
+    rollback).
+    """
+
+    def __init__(self, maxsize=1024, policy='lru'):
+        super().__init__(maxsize, policy)
+        self.version = None
+        self.invalidations = 0
+        self._retired = set()
+
+    def advance(self, version):
+        """Make version current, dropping every entry if it changed"""
+        with self._lock:
+            self._advance_locked(version)
+
+    def _advance_locked(self, version):
+        if version == self.version:
+            return
+        if self.version is not None:
+            self._retired.add(self.version)
+            self.invalidations += 1
+        self._retired.discard(version)
+        self._data.clear()
+        self.version = version
+
+    def get(self, key, version, default=None):
+        """Return cached value for key under version, or default on a miss"""
+        if version != self.version:
+            with self._lock:
+                if version in self._retired:
+                    self.misses += 1
+                    return default
+                self._advance_locked(version)
+        return super().get(key, default)
+
+    def put(self, key, value, version):
+        """Store value if version is still the current one"""
+        with self._lock:
+            if version == self.version:
+                self._put_locked(key, value)
+
+    def stats(self):
+        stats = super().stats()
+        stats['invalidations'] = self.invalidations
+        return stats
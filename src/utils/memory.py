@@ -0,0 +1,324 @@
+import argparse
+import os
+import sys
+import threading
+import tracemalloc
+import types
+
+import numpy as np
+from scipy import sparse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_bytes():
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_bytes():
+    """Peak resident set size of the process so far, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def memory_mark():
+    """Snapshot to pass to memory_since; cheap enough to take at every load step"""
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    return rss_bytes(), traced
+
+
+def memory_since(mark):
+    """
+    RSS and Python heap (tracemalloc) growth since memory_mark()
+    traced_bytes is None unless tracemalloc was tracing at both points.
+    """
+    rss, traced = memory_mark()
+    return {
+        'rss_bytes': rss - mark[0] if rss is not None and mark[0] is not None else None,
+        'traced_bytes': traced - mark[1] if traced is not None and mark[1] is not None else None
+    }
+
+
+def _is_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array.base, np.ndarray) else None
+    return False
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate retained size of obj and everything it references
+
+    numpy arrays count their buffers; memory-mapped arrays are reported
+    separately since their pages are shared between workers. Objects
+    already in seen are skipped, so components sharing data are not
+    counted twice. Extension objects without __dict__ (spaCy internals)
+    only count their shallow size.
+
+    Returns:
+        (heap_bytes, mapped_bytes)
+    """
+    if seen is None:
+        seen = set()
+    heap = mapped = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, (type, types.ModuleType, types.FunctionType,
+                                                 types.BuiltinFunctionType)):
+            continue
+        seen.add(id(item))
+
+        if isinstance(item, np.ndarray):
+            if _is_mapped(item):
+                mapped += item.nbytes
+            elif item.base is None:
+                heap += item.nbytes
+            else:
+                stack.append(item.base)
+            heap += sys.getsizeof(item, 0) - (item.nbytes if item.base is None else 0)
+            if item.dtype == object:
+                stack.extend(item.ravel())
+            continue
+        if sparse.issparse(item):
+            stack.extend(getattr(item, name) for name in ('data', 'indices', 'indptr', 'row', 'col')
+                         if hasattr(item, name))
+            continue
+
+        heap += sys.getsizeof(item, 0)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            pass
+        else:
+            if hasattr(item, '__dict__'):
+                stack.append(item.__dict__)
+            for name in getattr(type(item), '__slots__', ()):
+                if hasattr(item, name):
+                    stack.append(getattr(item, name))
+    return heap, mapped
+
+
+def component_sizes(predictor, extra=None):
+    """
+    Retained size of each serving component of a DiseasePredictor
+
+    Args:
+        predictor: Loaded DiseasePredictor
+        extra: Optional {name: object} held next to it, e.g. the app's
+            disease_info dict
+
+    Returns:
+        {component: {'heap_bytes', 'mapped_bytes'}}
+    """
+    matcher = predictor.matcher
+    components = {
+        'model': predictor.model,
+        'scorer': predictor.scorer,
+        'cascade': predictor.cascade,
+        'label_encoder': predictor.label_encoder,
+        'vocabulary': (predictor.symptom_list, predictor.symptom_to_idx),
+        'disease_info': predictor.disease_info,
+        'matcher.aliases': matcher.aliases,
+        'matcher.tfidf': (matcher.tfidf, matcher.symptom_vectors),
+        'matcher.autocomplete': matcher.autocomplete,
+        'matcher.fuzzy_index': matcher.fuzzy_index,
+        'matcher.match_cache': matcher.match_cache,
+        'matcher.word_vectors': matcher.word_vectors,
+        'matcher.embeddings': matcher.symptom_embeddings,
+    }
+    if extra:
+        components.update(extra)
+
+    seen = set()
+    sizes = {}
+    for name, obj in components.items():
+        if obj is None:
+            continue
+        heap, mapped = deep_sizeof(obj, seen)
+        sizes[name] = {'heap_bytes': heap, 'mapped_bytes': mapped}
+
+    # spaCy's vectors live in an extension type deep_sizeof can't walk
+    if matcher.nlp is not None:
+        vectors = matcher.nlp.vocab.vectors.data
+        sizes['matcher.spacy_vectors'] = {'heap_bytes': int(vectors.nbytes), 'mapped_bytes': 0}
+    return sizes
+
+
+class RequestMemoryTracker:
+    """
+    Peak Python heap allocated while handling each request, per endpoint
+
+    tracemalloc's peak is process-wide, so requests are tracked one at a
+    time: track() holds a lock for the duration of the request. Meant
+    for a debug/profiling instance, not for production traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def begin(self):
+        """Start tracking a request; returns a token for end()"""
+        self._lock.acquire()
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def end(self, name, token):
+        """Record the request's peak above its starting heap and release the lock"""
+        try:
+            peak = tracemalloc.get_traced_memory()[1] - token
+            stats = self._stats.setdefault(name, {'requests': 0, 'total_bytes': 0, 'max_bytes': 0})
+            stats['requests'] += 1
+            stats['total_bytes'] += peak
+            stats['max_bytes'] = max(stats['max_bytes'], peak)
+            return peak
+        finally:
+            self._lock.release()
+
+    def track(self, name, func, *args, **kwargs):
+        """Call func and record its peak allocation under name"""
+        token = self.begin()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.end(name, token)
+
+    def stats(self):
+        return {
+            name: dict(s, mean_bytes=s['total_bytes'] / s['requests'])
+            for name, s in self._stats.items()
+        }
+
+
+def top_allocations(limit=10, key_type='filename'):
+    """Largest live allocation sites from a tracemalloc snapshot"""
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics(key_type)
+    return [
+        {'site': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+        for stat in statistics[:limit]
+    ]
+
+
+def memory_report(predictor, extra=None, requests=None, top=10):
+    """
+    Memory picture of a serving process
+
+    Returns:
+        dict with process RSS, tracemalloc totals, per-component growth at
+        load (load), retained sizes (retained), per-request peaks and the
+        top allocation sites
+    """
+    load = {name: dict(usage) for name, usage in predictor.load_memory.items()}
+    load.update({f'matcher.{name}': dict(usage)
+                 for name, usage in predictor.matcher.load_memory.items()})
+
+    traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+    return {
+        'rss_bytes': rss_bytes(),
+        'peak_rss_bytes': peak_rss_bytes(),
+        'tracemalloc': tracemalloc.is_tracing(),
+        'traced_bytes': traced[0],
+        'traced_peak_bytes': traced[1],
+        'load': load,
+        'retained': component_sizes(predictor, extra),
+        'requests': requests.stats() if requests is not None else {},
+        'top_allocations': top_allocations(top)
+    }
+
+
+def _mb(value):
+    return f"{value / 1e6:9.2f}" if value is not None else f"{'-':>9}"
+
+
+def print_memory_report(report):
+    print(f"Process RSS {_mb(report['rss_bytes']).strip()} MB "
+          f"(peak {_mb(report['peak_rss_bytes']).strip()} MB), "
+          f"traced heap {_mb(report['traced_bytes']).strip()} MB")
+
+    print(f"\n{'growth while loading':<28} {'RSS MB':>9} {'traced MB':>9}")
+    for name, usage in report['load'].items():
+        print(f"  {name:<26} {_mb(usage['rss_bytes'])} {_mb(usage['traced_bytes'])}")
+
+    print(f"\n{'retained by component':<28} {'heap MB':>9} {'mapped MB':>9}")
+    retained = sorted(report['retained'].items(), key=lambda item: -item[1]['heap_bytes'])
+    for name, size in retained:
+        print(f"  {name:<26} {_mb(size['heap_bytes'])} {_mb(size['mapped_bytes'])}")
+
+    if report['requests']:
+        print(f"\n{'peak heap per request':<28} {'requests':>9} {'mean KB':>9} {'max KB':>9}")
+        for name, stats in report['requests'].items():
+            print(f"  {name:<26} {stats['requests']:>9} {stats['mean_bytes'] / 1e3:>9.1f} "
+                  f"{stats['max_bytes'] / 1e3:>9.1f}")
+
+    if report['top_allocations']:
+        print("\nLargest allocation sites:")
+        for site in report['top_allocations']:
+            print(f"  {site['size_bytes'] / 1e6:8.2f} MB  {site['count']:>8}  {site['site']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Profile the memory of a DiseasePredictor by component and per request'
+    )
+    parser.add_argument('--bundle', default=os.path.join(project_root, 'models/bundle'),
+                        help="Model bundle directory; pass '' to use --model/--vocab")
+    parser.add_argument('--model', default=os.path.join(project_root, 'models/best_model.pkl'))
+    parser.add_argument('--vocab', default=os.path.join(project_root, 'data/processed/vocabulary.pkl'))
+    parser.add_argument('--synonyms', default=os.path.join(project_root, 'data/symptom_synonyms.json'))
+    parser.add_argument('--nlp-model', default=None,
+                        help='spaCy model or word-vector table (default: models/word_vectors if exported)')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Synthetic predictions to run for per-request peaks')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    # Trace before anything is loaded so every component is attributed
+    tracemalloc.start()
+
+    import config
+    from src.models.bulk_score import load_predictor
+    from src.models.bundle import use_bundle
+    from src.utils.synthetic import make_symptom_lists
+
+    nlp_model = args.nlp_model or config.default_nlp_model(project_root)
+    if use_bundle(args.bundle, args.model, args.vocab):
+        predictor = load_predictor(bundle_path=args.bundle, synonyms_path=args.synonyms,
+                                   nlp_model=nlp_model)
+    else:
+        predictor = load_predictor(model_path=args.model, vocab_path=args.vocab,
+                                   synonyms_path=args.synonyms, nlp_model=nlp_model)
+    # Semantic matching is loaded on first use; load it now so it is counted
+    predictor.matcher._load_nlp()
+
+    tracker = RequestMemoryTracker()
+    for case in make_symptom_lists(predictor.symptom_list, args.requests, seed=0):
+        tracker.track('predict', predictor.predict, case)
+    for case in make_symptom_lists(predictor.symptom_list, args.requests // 10, seed=1):
+        tracker.track('suggest', predictor.get_symptom_suggestions, case[0][:4])
+
+    print_memory_report(memory_report(predictor, requests=tracker, top=args.top))
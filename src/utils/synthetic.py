@@ -0,0 +1,102 @@
+import random
+import string
+
+# Lay phrasing for parts of vocabulary terms, used to build paraphrases
+LAY_SYNONYMS = {
+    'pain': ' ache',
+    'vomiting': 'throwing up',
+    'fever': 'temperature',
+    'itching': 'itchy skin',
+    'fatigue': 'tiredness',
+    'headache': 'head ache',
+    'cough': 'coughing',
+    'nausea': 'feeling sick',
+    'breathlessness': 'short of breath',
+    'dehydration': 'dehydrated',
+    'rash': ' spots',
+    'swelling': 'swollen',
+    'weight': 'weight ',
+    'stomach': 'tummy ',
+    'abdominal': 'belly ',
+    'dizziness': 'dizzy',
+    'sweating': 'sweaty',
+    'chill': 'shivering',
+}
+
+PARAPHRASE_PREFIXES = ['', '', 'mild ', 'severe ', 'i have ', 'bad ', 'a lot of ']
+
+UNKNOWN_TERMS = [
+    'xyz123', 'notasymptom', 'qwerty', 'blue car', 'happy', 'keyboard',
+    'lorem ipsum', 'zzzz', 'banana bread', 'sunny weather'
+]
+
+
+def make_typo(term, rng=random):
+    """Apply one random character edit (swap, drop, duplicate or replace)"""
+    if len(term) < 3:
+        return term
+    i = rng.randrange(1, len(term) - 1)
+    edit = rng.choice(['swap', 'drop', 'duplicate', 'replace'])
+    if edit == 'swap':
+        return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+    if edit == 'drop':
+        return term[:i] + term[i + 1:]
+    if edit == 'duplicate':
+        return term[:i] + term[i] + term[i:]
+    return term[:i] + rng.choice(string.ascii_lowercase) + term[i + 1:]
+
+
+def make_paraphrase(term, rng=random):
+    """Rephrase a vocabulary term with lay synonyms and a filler prefix"""
+    phrase = term
+    for word, replacement in LAY_SYNONYMS.items():
+        if word in phrase:
+            phrase = phrase.replace(word, replacement)
+    return (rng.choice(PARAPHRASE_PREFIXES) + ' '.join(phrase.split())).strip()
+
+
+def make_inputs(vocabulary, kind, n, seed=0):
+    """
+    Generate n synthetic user inputs from the vocabulary
+    kind: 'exact', 'typo', 'paraphrase' or 'unknown'
+    """
+    rng = random.Random(seed)
+    vocabulary = list(vocabulary)
+    inputs = []
+    for _ in range(n):
+        term = rng.choice(vocabulary)
+        if kind == 'exact':
+            inputs.append(term)
+        elif kind == 'typo':
+            inputs.append(make_typo(term, rng))
+        elif kind == 'paraphrase':
+            inputs.append(make_paraphrase(term, rng))
+        elif kind == 'unknown':
+            inputs.append(rng.choice(UNKNOWN_TERMS))
+        else:
+            raise ValueError(f"Unknown input kind: {kind}")
+    return inputs
+
+
+def make_symptom_lists(vocabulary, n, min_len=2, max_len=6, seed=0,
+                       mix=(('exact', 0.6), ('typo', 0.25), ('paraphrase', 0.1), ('unknown', 0.05))):
+    """Generate n patient symptom lists mixing exact, typo'd, paraphrased and unknown inputs"""
+    rng = random.Random(seed)
+    vocabulary = list(vocabulary)
+    kinds = [kind for kind, _ in mix]
+    weights = [weight for _, weight in mix]
+
+    cases = []
+    for _ in range(n):
+        case = []
+        for term in rng.sample(vocabulary, rng.randint(min_len, max_len)):
+            kind = rng.choices(kinds, weights)[0]
+            if kind == 'typo':
+                term = make_typo(term, rng)
+            elif kind == 'paraphrase':
+                term = make_paraphrase(term, rng)
+            elif kind == 'unknown':
+                term = rng.choice(UNKNOWN_TERMS)
+            case.append(term)
+        cases.append(case)
+    return cases
@@ -0,0 +1,164 @@
+import copy
+import unittest
+import sys
+import os
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.batching import PredictionBatcher
+from src.models.online import OnlineUpdater
+from src.utils.cache import VersionedCache
+
+APP_DIR = os.path.join(project_root, 'app')
+
+
+class AppTestCase(unittest.TestCase):
+    """Runs from app/ like the server, since the app's paths are relative to it"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cwd = os.getcwd()
+        sys.path.insert(0, APP_DIR)
+        os.chdir(APP_DIR)
+        import app as app_module
+        cls.app_module = app_module
+        cls.original = app_module.predictor
+        cls.symptoms = cls.original.symptom_list
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.cwd)
+
+
+class TestPredictRoute(AppTestCase):
+    def setUp(self):
+        self.saved = {name: getattr(self.app_module, name)
+                      for name in ('batcher', 'response_cache')}
+        self.app_module.batcher = PredictionBatcher(self.original, max_wait_ms=1)
+        self.app_module.response_cache = VersionedCache(64)
+        self.client = self.app_module.app.test_client()
+
+    def tearDown(self):
+        self.app_module.batcher.close()
+        self.app_module.swap_predictor(self.original)
+        for name, value in self.saved.items():
+            setattr(self.app_module, name, value)
+
+    def predict(self, symptoms):
+        response = self.client.post('/predict', json={'symptoms': symptoms})
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_batched_predictions_match_direct_scoring(self):
+        case = self.symptoms[:4]
+        indices, used_symptoms = self.original.match_symptoms(case)
+        expected = self.original.predict_indices(indices, used_symptoms, return_top_n=3)
+
+        body = self.predict(case)
+        self.assertEqual(
+            [(p['disease'], p['probability']) for p in body['predictions']],
+            [(disease, float(probability)) for disease, probability, _ in expected]
+        )
+        self.assertEqual(self.app_module.batcher.stats()['requests'], 1)
+
+    def test_cache_hit_miss_and_swap(self):
+        cache = self.app_module.response_cache
+        case = self.symptoms[:4]
+
+        first = self.predict(case)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (0, 1))
+
+        # Same matched set in another order is a hit and skips scoring
+        self.assertEqual(self.predict(list(reversed(case)))['predictions'], first['predictions'])
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 1))
+        self.assertEqual(self.app_module.batcher.stats()['requests'], 1)
+
+        # A new model version drops the entries and is scored by the new model
+        swapped = copy.copy(self.original)
+        swapped.model_version = 'swapped'
+        self.app_module.swap_predictor(swapped)
+        self.assertEqual(self.predict(case)['predictions'], first['predictions'])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['invalidations']), (1, 2, 1))
+        self.assertEqual(cache.version, 'swapped')
+        self.assertEqual(self.app_module.batcher.stats()['requests'], 2)
+
+    def test_cache_keyed_on_scoring_settings(self):
+        """Changing the predictor's threshold doesn't serve results cached for the old one"""
+        cache = self.app_module.response_cache
+        case = self.symptoms[:4]
+        indices, used_symptoms = self.original.match_symptoms(case)
+
+        first = self.predict(case)
+        self.original.confidence_threshold = 0.0
+        try:
+            second = self.predict(case)
+        finally:
+            del self.original.confidence_threshold
+
+        self.assertEqual(cache.stats()['misses'], 2)
+        expected = self.original.predict_indices(
+            indices, used_symptoms, return_top_n=self.app_module.PREDICT_TOP_N,
+            confidence_threshold=0.0
+        )
+        self.assertEqual(len(second['predictions']), len(expected))
+        self.assertEqual(len(expected), self.app_module.PREDICT_TOP_N)
+        self.assertLess(len(first['predictions']), len(second['predictions']))
+
+    def test_unmatched_symptoms(self):
+        response = self.client.post('/predict', json={'symptoms': ['xyz123']})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.app_module.batcher.stats()['requests'], 0)
+
+
+class TestUpdateRoute(AppTestCase):
+    def setUp(self):
+        self.saved = self.app_module.updater
+        self.app_module.updater = OnlineUpdater(self.original)
+        self.client = self.app_module.app.test_client()
+
+    def tearDown(self):
+        self.app_module.swap_predictor(self.original)
+        self.app_module.updater = self.saved
+
+    def test_update_publishes_new_model(self):
+        case = {'symptoms': ['itching', 'skin rash', 'high fever'], 'disease': 'Chicken pox'}
+        response = self.client.post('/update', json={'cases': [case] * 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['updates'], 1)
+
+        current = self.app_module.predictor
+        self.assertEqual(current.model_version, f"{self.original.model_version}+update1")
+        self.assertIs(current, self.app_module.updater.predictor)
+        if self.app_module.sessions is not None:
+            self.assertIs(self.app_module.sessions.predictor, current)
+
+    def test_concurrent_updates_leave_newest_model_published(self):
+        case = {'symptoms': ['vomiting', 'headache'], 'disease': 'Migraine'}
+
+        def post():
+            self.app_module.app.test_client().post('/update', json={'cases': [case]})
+
+        threads = [threading.Thread(target=post) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.app_module.predictor.model_version,
+                         f"{self.original.model_version}+update6")
+        self.assertIs(self.app_module.predictor, self.app_module.updater.predictor)
+
+    def test_rejects_bad_cases(self):
+        response = self.client.post('/update', json={'cases': [
+            {'symptoms': ['itching'], 'disease': 'Not a disease'}
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIs(self.app_module.predictor, self.original)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
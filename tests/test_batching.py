@@ -0,0 +1,120 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.models.batching import PredictionBatcher
+
+
+class HeldPredictor:
+    """Predictor whose predict_batch waits for an event before scoring"""
+
+    def __init__(self, predictor, event):
+        self.predictor = predictor
+        self.event = event
+
+    def predict_batch(self, *args, **kwargs):
+        self.event.wait()
+        return self.predictor.predict_batch(*args, **kwargs)
+
+
+class TestPredictionBatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True
+        )
+        cls.symptoms = cls.predictor.symptom_list
+
+    def setUp(self):
+        self.batcher = PredictionBatcher(self.predictor, max_batch_size=8, max_wait_ms=5)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_single_request(self):
+        """A lone request gets the same answer as predict"""
+        case = self.symptoms[:4]
+        self.assertEqual(
+            self.batcher.predict(case, confidence_threshold=0.05),
+            self.predictor.predict(case, confidence_threshold=0.05)
+        )
+
+    def test_concurrent_requests_get_their_own_results(self):
+        """Concurrent requests are batched and routed back correctly"""
+        cases = [self.symptoms[i:i + 3] for i in range(0, 60, 3)] + [['xyz123']]
+        results = [None] * len(cases)
+
+        def worker(i):
+            results[i] = self.batcher.predict(cases[i], return_top_n=2, confidence_threshold=0.01)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(cases))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for case, result in zip(cases, results):
+            self.assertEqual(
+                result, self.predictor.predict(case, return_top_n=2, confidence_threshold=0.01)
+            )
+        stats = self.batcher.stats()
+        self.assertEqual(stats['requests'], len(cases))
+        self.assertLessEqual(stats['batches'], len(cases))
+
+    def test_predict_indices_uses_given_predictor(self):
+        """Matched requests are scored by the predictor passed with them"""
+        indices, used_symptoms = self.predictor.match_symptoms(self.symptoms[:4])
+        expected = self.predictor.predict_indices(indices, used_symptoms, confidence_threshold=0.05)
+
+        self.batcher.predictor = None
+        self.assertEqual(
+            self.batcher.predict_indices(indices, used_symptoms, confidence_threshold=0.05,
+                                         predictor=self.predictor),
+            expected
+        )
+
+    def test_bad_request_does_not_fail_its_batch(self):
+        """A request that raises only fails its own caller"""
+        good = self.symptoms[:3]
+        results = {}
+
+        def worker(name, case):
+            try:
+                results[name] = self.batcher.predict(case, confidence_threshold=0.05)
+            except Exception as e:
+                results[name] = e
+
+        # Hold the batcher thread so both requests land in the same batch
+        blocker = threading.Event()
+        self.batcher.predictor = HeldPredictor(self.predictor, blocker)
+        threads = [threading.Thread(target=worker, args=('warmup', good))]
+        threads[0].start()
+        time.sleep(0.05)
+        for name, case in (('bad', None), ('good', good)):
+            threads.append(threading.Thread(target=worker, args=(name, case)))
+            threads[-1].start()
+        time.sleep(0.05)
+        blocker.set()
+        for t in threads:
+            t.join()
+
+        expected = self.predictor.predict(good, confidence_threshold=0.05)
+        self.assertIsInstance(results['bad'], TypeError)
+        self.assertEqual(results['good'], expected)
+        self.assertEqual(results['warmup'], expected)
+        self.assertEqual(self.batcher.stats(), {
+            'requests': 3, 'batches': 2, 'mean_batch_size': 1.5
+        })
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.bulk_score import bulk_score, read_cases
+
+PREDICTOR_ARGS = {
+    'model_path': os.path.join(project_root, 'models/best_model.pkl'),
+    'vocab_path': os.path.join(project_root, 'data/processed/vocabulary.pkl')
+}
+
+
+class TestBulkScore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, 'cases.csv')
+        pd.read_csv(os.path.join(project_root, 'data/raw/dataset.csv')).iloc[::120].to_csv(
+            self.csv_path, index=False
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_csv_matches_labels(self):
+        """Raw dataset rows score to their own disease, in input order"""
+        output = os.path.join(self.tmpdir.name, 'out.csv')
+        totals = bulk_score(self.csv_path, output, PREDICTOR_ARGS, chunksize=7)
+
+        cases = pd.read_csv(self.csv_path)
+        scored = pd.read_csv(output)
+        self.assertEqual(totals['rows'], len(cases))
+        self.assertEqual(list(scored['id']), list(range(len(cases))))
+        self.assertEqual(list(scored['disease_1'].str.strip()), list(cases['Disease'].str.strip()))
+
+    def test_parallel_output_identical(self):
+        """Process-pool scoring writes the same file as a single process"""
+        single = os.path.join(self.tmpdir.name, 'single.jsonl')
+        parallel = os.path.join(self.tmpdir.name, 'parallel.jsonl')
+        bulk_score(self.csv_path, single, PREDICTOR_ARGS, chunksize=5)
+        bulk_score(self.csv_path, parallel, PREDICTOR_ARGS, chunksize=5, n_jobs=2)
+
+        with open(single) as a, open(parallel) as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_jsonl_input(self):
+        path = os.path.join(self.tmpdir.name, 'cases.jsonl')
+        with open(path, 'w') as f:
+            f.write(json.dumps({'case': 'a', 'symptoms': ['itching', 'skin rash']}) + '\n')
+            f.write(json.dumps({'case': 'b', 'symptoms': 'vomiting, headache'}) + '\n')
+
+        chunks = list(read_cases(path, chunksize=1, id_column='case'))
+        self.assertEqual(chunks, [(['a'], [['itching', 'skin rash']]),
+                                  (['b'], [['vomiting', ' headache']])])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
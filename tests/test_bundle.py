@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.bundle import export_bundle, load_bundle, stale_sources, use_bundle
+from src.models.predict import DiseasePredictor
+
+MODEL_PATH = os.path.join(project_root, 'models/best_model.pkl')
+VOCAB_PATH = os.path.join(project_root, 'data/processed/vocabulary.pkl')
+DISEASE_INFO_PATH = os.path.join(project_root, 'data/disease_info.json')
+
+
+class TestModelBundle(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.bundle_dir = os.path.join(cls.tmpdir.name, 'bundle')
+        cls.manifest = export_bundle(
+            MODEL_PATH, VOCAB_PATH, DISEASE_INFO_PATH, cls.bundle_dir, version='test'
+        )
+        cls.predictor = DiseasePredictor(MODEL_PATH, VOCAB_PATH, lazy_nlp=True)
+        cls.bundled = DiseasePredictor.from_bundle(cls.bundle_dir, lazy_nlp=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_manifest(self):
+        """Manifest records a fixed symptom order, classes and checksum"""
+        self.assertEqual(self.manifest['version'], 'test')
+        self.assertEqual(self.manifest['symptoms'], sorted(self.manifest['symptoms']))
+        self.assertEqual(len(self.manifest['classes']), len(self.predictor.classes))
+        self.assertEqual(len(self.manifest['checksum']), 64)
+
+    def test_arrays_are_memory_mapped(self):
+        """Scorer weights come straight from the memory-mapped .npy file"""
+        weights = self.bundled.scorer.weights
+        self.assertIsInstance(weights.base, np.memmap)
+
+    def test_training_counts_exported(self):
+        """MultinomialNB counts are kept for session suggestions"""
+        np.testing.assert_array_equal(self.bundled.bundle.feature_count,
+                                      self.predictor.model.feature_count_)
+        np.testing.assert_array_equal(self.bundled.bundle.class_count,
+                                      self.predictor.model.class_count_)
+
+    def test_bundle_predictions_match_pickles(self):
+        """Bundle predictor returns the same predictions as the pickled files"""
+        symptoms = self.predictor.symptom_list
+        for case in [symptoms[:4], symptoms[20:26], ['xyz123']]:
+            expected, expected_matched = self.predictor.predict(case, confidence_threshold=0.05)
+            predictions, matched = self.bundled.predict(case, confidence_threshold=0.05)
+            self.assertEqual(matched, expected_matched)
+            self.assertEqual(
+                [(d, p) for d, p, _ in predictions],
+                [(d, p) for d, p, _ in expected]
+            )
+
+    def test_stale_sources(self):
+        """A bundle is only used while it matches the files it was exported from"""
+        self.assertEqual(stale_sources(self.bundle_dir, MODEL_PATH, VOCAB_PATH, DISEASE_INFO_PATH), [])
+        self.assertTrue(use_bundle(self.bundle_dir, MODEL_PATH, VOCAB_PATH, DISEASE_INFO_PATH))
+
+        edited = os.path.join(self.tmpdir.name, 'disease_info.json')
+        with open(DISEASE_INFO_PATH) as f:
+            disease_info = json.load(f)
+        disease_info['Migraine'] = {'description': 'edited'}
+        with open(edited, 'w') as f:
+            json.dump(disease_info, f)
+
+        self.assertEqual(stale_sources(self.bundle_dir, MODEL_PATH, VOCAB_PATH, edited),
+                         ['disease_info'])
+        self.assertFalse(use_bundle(self.bundle_dir, MODEL_PATH, VOCAB_PATH, edited))
+        self.assertEqual(stale_sources(self.bundle_dir, MODEL_PATH, MODEL_PATH), ['vocabulary'])
+        self.assertFalse(use_bundle('', MODEL_PATH, VOCAB_PATH))
+        self.assertFalse(use_bundle(os.path.join(self.tmpdir.name, 'missing'), MODEL_PATH, VOCAB_PATH))
+
+    def test_corrupted_bundle_rejected(self):
+        """A modified file fails checksum verification"""
+        corrupted = os.path.join(self.tmpdir.name, 'corrupted')
+        export_bundle(MODEL_PATH, VOCAB_PATH, DISEASE_INFO_PATH, corrupted)
+        with open(os.path.join(corrupted, 'disease_info.json'), 'w') as f:
+            json.dump({}, f)
+        with self.assertRaises(ValueError):
+            load_bundle(corrupted)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
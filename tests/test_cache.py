@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cache import BoundedCache, VersionedCache
+
+
+class TestBoundedCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Recently read entries survive eviction under LRU"""
+        cache = BoundedCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_fifo_eviction(self):
+        """FIFO evicts the oldest insert even if it was read"""
+        cache = BoundedCache(maxsize=2, policy='fifo')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+
+    def test_hit_miss_counters(self):
+        """Hits and misses are counted"""
+        cache = BoundedCache(maxsize=4)
+        cache.get('missing')
+        cache.put('x', 1)
+        cache.get('x')
+        cache.get('x')
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_concurrent_access(self):
+        """Size bound holds when many threads share the cache"""
+        cache = BoundedCache(maxsize=50)
+
+        def worker(offset):
+            for i in range(500):
+                key = (offset + i) % 200
+                if cache.get(key) is None:
+                    cache.put(key, key)
+
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.stats()
+        self.assertLessEqual(len(cache), 50)
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 500)
+
+
+class TestVersionedCache(unittest.TestCase):
+    def test_version_change_invalidates(self):
+        """A new version drops old entries and ignores late writes from the old one"""
+        cache = VersionedCache(maxsize=10)
+        self.assertIsNone(cache.get('a', 'v1'))
+        cache.put('a', 1, 'v1')
+        self.assertEqual(cache.get('a', 'v1'), 1)
+
+        self.assertIsNone(cache.get('a', 'v2'))
+        cache.put('b', 2, 'v1')
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_old_version_does_not_reset_cache(self):
+        """Requests still on the old model miss without dropping the new model's entries"""
+        cache = VersionedCache(maxsize=10)
+        cache.get('a', 'v1')
+        cache.put('a', 1, 'v1')
+
+        cache.get('a', 'v2')
+        cache.put('a', 2, 'v2')
+        for _ in range(3):
+            self.assertIsNone(cache.get('a', 'v1'))
+            cache.put('a', 1, 'v1')
+            self.assertEqual(cache.get('a', 'v2'), 2)
+
+        stats = cache.stats()
+        self.assertEqual(cache.version, 'v2')
+        self.assertEqual(stats['invalidations'], 1)
+        self.assertEqual((stats['hits'], stats['misses']), (3, 5))
+
+    def test_advance_allows_rollback(self):
+        cache = VersionedCache(maxsize=10)
+        cache.get('a', 'v1')
+        cache.get('a', 'v2')
+        cache.advance('v1')
+        cache.put('a', 1, 'v1')
+        self.assertEqual(cache.get('a', 'v1'), 1)
+        self.assertIsNone(cache.get('a', 'v2'))
+        self.assertEqual(cache.version, 'v1')
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
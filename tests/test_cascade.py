@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.models.cascade import Cascade, evaluate_margins, top2_margin
+from src.models.selection import load_training_data
+from src.utils.metrics import MetricsRegistry
+
+CASES = [
+    ['itching', 'skin rash'],
+    ['itching', 'skin rash', 'nodal skin eruptions', 'dischromic patches'],
+    ['vomiting', 'headache']
+]
+
+
+class TestCascade(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        X, y = load_training_data(os.path.join(project_root, 'data/processed'))
+        cls.heavy = KNeighborsClassifier(n_neighbors=5).fit(X, y)
+
+    def setUp(self):
+        self.predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True,
+            metrics=MetricsRegistry()
+        )
+
+    def test_top2_margin(self):
+        margins = top2_margin(np.array([[0.6, 0.3, 0.1], [0.4, 0.1, 0.5]]))
+        np.testing.assert_allclose(margins, [0.3, 0.1])
+
+    def test_escalates_only_low_margin_rows(self):
+        plain = self.predictor.predict_batch(CASES, return_top_n=41, confidence_threshold=0)
+        self.predictor.set_cascade(self.heavy, margin=0.3)
+        cascaded = self.predictor.predict_batch(CASES, return_top_n=41, confidence_threshold=0)
+
+        for case, before, after in zip(CASES, plain, cascaded):
+            probabilities = np.array([p for _, p, _ in before[0]])
+            row, _ = self.predictor.match_symptoms(case)
+            if probabilities[0] - probabilities[1] < 0.3:
+                expected = self.heavy.predict_proba(self.predictor._feature_row(row))[0]
+                self.assertAlmostEqual(after[0][0][1], expected.max())
+            else:
+                self.assertEqual(after[0], before[0])
+
+        stats = self.predictor.cascade.stats()
+        self.assertEqual(stats['rows'], len(CASES))
+        self.assertGreater(stats['escalated'], 0)
+        self.assertLess(stats['escalated'], len(CASES))
+
+    def test_single_and_batch_paths_agree(self):
+        self.predictor.set_cascade(self.heavy, margin=1.01)
+        single = [self.predictor.predict(case)[0] for case in CASES]
+        batch = [p for p, _ in self.predictor.predict_batch(CASES)]
+        for a, b in zip(single, batch):
+            self.assertEqual([d for d, _, _ in a], [d for d, _, _ in b])
+            np.testing.assert_allclose([p for _, p, _ in a], [p for _, p, _ in b])
+
+        self.assertEqual(self.predictor.cascade.stats()['escalation_rate'], 1.0)
+        counter = self.predictor.metrics.get('cascade_rows_total')
+        self.assertEqual(counter.value('heavy'), 2 * len(CASES))
+
+    def test_rejects_mismatched_model(self):
+        model = KNeighborsClassifier().fit(np.eye(3), [0, 1, 2])
+        with self.assertRaises(ValueError):
+            Cascade(model, n_classes=41, n_features=131)
+
+    def test_evaluate_margins(self):
+        fast = np.array([[0.9, 0.1], [0.55, 0.45]])
+        heavy = np.array([[0.2, 0.8], [0.1, 0.9]])
+        results = evaluate_margins(fast, heavy, np.array([0, 1]), [0.0, 0.5, 1.0])
+        self.assertEqual([r['escalation_rate'] for r in results], [0.0, 0.5, 1.0])
+        self.assertEqual([r['accuracy'] for r in results], [0.5, 1.0, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+from sklearn.metrics import (
+    confusion_matrix, log_loss, precision_recall_fscore_support, top_k_accuracy_score
+)
+from sklearn.naive_bayes import MultinomialNB
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.data.feature_store import FeatureStore, save_features
+from src.models.evaluation import StreamingEvaluator, evaluate_store
+
+
+class TestStreamingEvaluator(unittest.TestCase):
+    def test_chunked_metrics_match_sklearn(self):
+        rng = np.random.RandomState(0)
+        y_true = rng.randint(0, 6, 500)
+        probabilities = rng.dirichlet(np.ones(6), 500)
+        y_pred = probabilities.argmax(axis=1)
+
+        evaluator = StreamingEvaluator(6, top_k=2)
+        for start in range(0, 500, 64):
+            evaluator.update(y_true[start:start + 64], probabilities=probabilities[start:start + 64])
+
+        np.testing.assert_array_equal(evaluator.confusion, confusion_matrix(y_true, y_pred))
+        metrics = evaluator.metrics()
+        for average in ('macro', 'weighted'):
+            precision, recall, f1, _ = precision_recall_fscore_support(
+                y_true, y_pred, average=average, zero_division=0
+            )
+            self.assertAlmostEqual(metrics[f'{average}_precision'], precision)
+            self.assertAlmostEqual(metrics[f'{average}_recall'], recall)
+            self.assertAlmostEqual(metrics[f'{average}_f1'], f1)
+        self.assertAlmostEqual(metrics['top_2_accuracy'],
+                               top_k_accuracy_score(y_true, probabilities, k=2))
+        self.assertAlmostEqual(metrics['log_loss'], log_loss(y_true, probabilities))
+
+    def test_macro_average_skips_absent_classes(self):
+        """Classes neither seen nor predicted don't drag the macro average down"""
+        rng = np.random.RandomState(2)
+        # Classes 2 and 5 never occur; class 4 is only predicted
+        y_true = rng.choice([0, 1, 3, 6], 200)
+        y_pred = np.where(rng.rand(200) < 0.7, y_true, rng.choice([0, 1, 4], 200))
+
+        evaluator = StreamingEvaluator(7)
+        for start in range(0, 200, 50):
+            evaluator.update(y_true[start:start + 50], y_pred[start:start + 50])
+
+        metrics = evaluator.metrics()
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_true, y_pred, average='macro', zero_division=0
+        )
+        self.assertAlmostEqual(metrics['macro_precision'], precision)
+        self.assertAlmostEqual(metrics['macro_recall'], recall)
+        self.assertAlmostEqual(metrics['macro_f1'], f1)
+
+    def test_evaluate_store(self):
+        rng = np.random.RandomState(1)
+        X = (rng.rand(300, 20) < 0.2).astype(np.float64)
+        y = rng.randint(0, 4, 300)
+        model = MultinomialNB().fit(X, y)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_features(tmpdir, X, y)
+            evaluator = evaluate_store(model, FeatureStore(tmpdir), chunksize=70)
+
+        np.testing.assert_array_equal(evaluator.confusion, confusion_matrix(y, model.predict(X)))
+        self.assertIn('accuracy', evaluator.report(['a', 'b', 'c', 'd']))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
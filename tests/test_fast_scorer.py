@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.fast_scorer import (
+    LinearScorer, NaiveBayesScorer, SoftmaxScorer, make_fast_scorer, top_n_indices
+)
+
+
+def random_binary_data(n_rows=300, n_features=30, n_classes=6, seed=0):
+    rng = np.random.RandomState(seed)
+    X = (rng.rand(n_rows, n_features) < 0.15).astype(float)
+    y = rng.randint(0, n_classes, n_rows)
+    return X, y
+
+
+class TestFastScorer(unittest.TestCase):
+    def assert_matches_model(self, model, scorer):
+        rng = np.random.RandomState(1)
+        n_features = scorer.weights.shape[0]
+        rows = [sorted(rng.choice(n_features, k, replace=False)) for k in range(0, 8)]
+        for indices in rows:
+            X = sparse.csr_matrix(
+                (np.ones(len(indices)), indices, [0, len(indices)]),
+                shape=(1, n_features)
+            )
+            np.testing.assert_allclose(
+                scorer.predict_proba_indices(indices),
+                model.predict_proba(X)[0],
+                rtol=1e-12, atol=1e-15
+            )
+
+    def test_naive_bayes_matches_predict_proba(self):
+        """NB fast path equals MultinomialNB.predict_proba"""
+        X, y = random_binary_data()
+        model = MultinomialNB().fit(X, y)
+        scorer = make_fast_scorer(model)
+        self.assertIsInstance(scorer, NaiveBayesScorer)
+        self.assert_matches_model(model, scorer)
+
+    def test_logistic_regression_matches_predict_proba(self):
+        """Softmax fast path equals multinomial LogisticRegression"""
+        X, y = random_binary_data()
+        model = LogisticRegression(max_iter=500).fit(X, y)
+        scorer = make_fast_scorer(model)
+        self.assertIsInstance(scorer, SoftmaxScorer)
+        self.assert_matches_model(model, scorer)
+
+    def test_unsupported_model(self):
+        """One-vs-rest and other models keep using predict_proba"""
+        X, y = random_binary_data()
+        model = LogisticRegression(solver='liblinear').fit(X, y)
+        self.assertIsNone(make_fast_scorer(model))
+
+    def test_linear_scorer_is_abstract(self):
+        """A scorer must say how to normalize its scores"""
+        with self.assertRaises(TypeError):
+            LinearScorer(np.zeros((3, 2)), np.zeros(2))
+
+    def test_top_n_indices(self):
+        """Top-n is sorted by probability with ties by class index"""
+        probabilities = np.array([0.1, 0.3, 0.05, 0.3, 0.25])
+        self.assertEqual(list(top_n_indices(probabilities, 3)), [1, 3, 4])
+        self.assertEqual(list(top_n_indices(probabilities, 1)), [1])
+        self.assertEqual(len(top_n_indices(probabilities, 10)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+from scipy import sparse
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.data.feature_store import FeatureStore, FeatureStoreWriter, save_features
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.X = (rng.rand(250, 131) < 0.05).astype(np.float64)
+        self.y = rng.randint(0, 41, 250)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_both_layouts(self):
+        for layout in ('packed', 'sparse'):
+            path = os.path.join(self.tmpdir.name, layout)
+            manifest = save_features(path, self.X, self.y, layout=layout, chunksize=64)
+            self.assertEqual(manifest['shape'], [250, 131])
+
+            store = FeatureStore(path)
+            self.assertIsInstance(store.labels, np.memmap)
+            np.testing.assert_array_equal(store.to_csr().toarray(), self.X)
+            np.testing.assert_array_equal(store.labels, self.y)
+
+            chunks = list(store.iter_chunks(chunksize=100))
+            self.assertEqual([start for start, _, _ in chunks], [0, 100, 200])
+            np.testing.assert_array_equal(
+                sparse.vstack([X for _, X, _ in chunks]).toarray(), self.X
+            )
+
+    def test_auto_layout_is_smaller_than_dense(self):
+        path = os.path.join(self.tmpdir.name, 'auto')
+        save_features(path, sparse.csr_matrix(self.X))
+        store = FeatureStore(path)
+        self.assertIsNone(store.labels)
+        self.assertLess(store.nbytes * 40, self.X.nbytes)
+
+    def test_writer_rejects_bad_chunks(self):
+        writer = FeatureStoreWriter(os.path.join(self.tmpdir.name, 'bad'), 131)
+        with self.assertRaises(ValueError):
+            writer.append(self.X * 2)
+        with self.assertRaises(ValueError):
+            writer.append(self.X[:, :100])
+        writer.append(self.X[:10], self.y[:10])
+        with self.assertRaises(ValueError):
+            writer.append(self.X[10:20])
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.run_load_test import compare, make_workload, run_load, summarize
+
+VOCABULARY = ['itching', 'skinrash', 'highfever', 'vomiting', 'headache', 'joint pain']
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_workload_mix(self):
+        tasks = make_workload(VOCABULARY, 200, seed=1)
+        predict = [t for t in tasks if t[0][0] == 'predict']
+        suggest = [t for t in tasks if t[0][0] == 'suggest']
+
+        self.assertEqual(len(predict) + len(suggest), 200)
+        self.assertTrue(120 < len(predict) < 190)
+        self.assertTrue(all(len(t) == 1 and t[0][1]['symptoms'] for t in predict))
+        # Keystroke streams send growing prefixes of one term
+        for task in suggest:
+            prefixes = [payload['partial'] for _, payload in task]
+            self.assertTrue(all(b.startswith(a) for a, b in zip(prefixes, prefixes[1:])))
+        # Streams type both exact and typo'd terms (all VOCABULARY terms fit
+        # in the 12-character stream, so the last prefix is the whole term)
+        last = [task[-1][1]['partial'] for task in suggest]
+        self.assertTrue(any(term in VOCABULARY for term in last))
+        self.assertTrue(any(term not in VOCABULARY for term in last))
+
+    def test_run_and_summarize(self):
+        def make_sender():
+            def send(endpoint, payload):
+                if endpoint == 'suggest' and len(payload['partial']) == 3:
+                    raise ConnectionError("dropped")
+                return 200
+            return send
+
+        tasks = make_workload(VOCABULARY, 50, seed=2)
+        records, elapsed = run_load(make_sender, tasks, concurrency=4)
+        self.assertEqual(len(records), sum(len(t) for t in tasks))
+
+        summary = summarize(records, elapsed)
+        self.assertEqual(summary['all']['requests'], len(records))
+        self.assertEqual(summary['predict']['errors'], 0)
+        self.assertGreater(summary['suggest']['error_rate'], 0)
+        self.assertLessEqual(summary['all']['p50_ms'], summary['all']['p99_ms'])
+
+    def test_compare_flags_regressions(self):
+        base = {'runs': {'4': {'all': {'p95_ms': 10.0, 'throughput_rps': 100.0}}}}
+        slower = {'runs': {'4': {'all': {'p95_ms': 20.0, 'throughput_rps': 90.0}}}}
+        rows = {name: regressed for name, _, _, _, regressed in compare(slower, base)}
+        self.assertEqual(rows, {'c4.all.p95_ms': True, 'c4.all.rps': False})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+from scipy import sparse
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.utils.memory import (
+    RequestMemoryTracker, component_sizes, deep_sizeof, memory_mark, memory_since
+)
+
+
+class TestMemoryProfiling(unittest.TestCase):
+    def setUp(self):
+        tracemalloc.start()
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    def test_deep_sizeof_arrays(self):
+        array = np.zeros(100000)
+        heap, mapped = deep_sizeof({'a': array, 'view': array[10:], 'm': sparse.eye(1000, format='csr')})
+        self.assertGreaterEqual(heap, array.nbytes + 1000 * 8)
+        self.assertLess(heap, array.nbytes * 1.2)
+        self.assertEqual(mapped, 0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'a.npy')
+            np.save(path, array)
+            heap, mapped = deep_sizeof(np.load(path, mmap_mode='r'))
+            self.assertEqual(mapped, array.nbytes)
+            self.assertLess(heap, 1000)
+
+    def test_shared_objects_counted_once(self):
+        shared = list(range(10000))
+        seen = set()
+        first, _ = deep_sizeof({'x': shared}, seen)
+        second, _ = deep_sizeof({'y': shared}, seen)
+        self.assertLess(second, first / 10)
+
+    def test_memory_since_and_request_peak(self):
+        mark = memory_mark()
+        kept = bytearray(2000000)
+        self.assertGreaterEqual(memory_since(mark)['traced_bytes'], len(kept))
+
+        tracker = RequestMemoryTracker()
+        tracker.track('alloc', lambda: len(bytearray(3000000)))
+        tracker.track('alloc', lambda: None)
+        stats = tracker.stats()['alloc']
+        self.assertEqual(stats['requests'], 2)
+        self.assertGreaterEqual(stats['max_bytes'], 3000000)
+        self.assertLess(stats['mean_bytes'], stats['max_bytes'])
+
+    def test_predictor_components(self):
+        predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True
+        )
+        self.assertGreater(predictor.load_memory['symptom_matcher']['traced_bytes'], 0)
+        self.assertIn('tfidf', predictor.matcher.load_memory)
+
+        sizes = component_sizes(predictor)
+        n_classes, n_features = len(predictor.classes), len(predictor.symptom_list)
+        self.assertGreaterEqual(sizes['model']['heap_bytes'], 8 * n_classes * n_features)
+        self.assertGreater(sizes['matcher.autocomplete']['heap_bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_format(self):
+        """Histograms render cumulative buckets, sum and count"""
+        registry = MetricsRegistry()
+        latency = registry.histogram('demo_seconds', 'Demo latency', ('stage',), buckets=(0.1, 1.0))
+        latency.observe(0.05, 'a')
+        latency.observe(0.5, 'a')
+        registry.counter('demo_total', 'Demo counter', ('stage',)).inc('a')
+
+        text = registry.render()
+        self.assertIn('# TYPE demo_seconds histogram', text)
+        self.assertIn('demo_seconds_bucket{stage="a",le="0.1"} 1', text)
+        self.assertIn('demo_seconds_bucket{stage="a",le="+Inf"} 2', text)
+        self.assertIn('demo_seconds_count{stage="a"} 2', text)
+        self.assertIn('demo_total{stage="a"} 1', text)
+
+
+class TestPredictorInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.metrics = MetricsRegistry()
+        cls.predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True,
+            metrics=cls.metrics
+        )
+
+    def test_stage_counts(self):
+        """Resolved-stage counters and stage latencies are recorded"""
+        # Vocabulary terms resolve in the alias index ahead of the cache
+        symptoms = self.predictor.symptom_list[:3] + ['itchng']
+        self.predictor.predict(symptoms)
+        self.predictor.predict(symptoms)
+
+        resolved = self.metrics.get('symptom_match_resolved_total')
+        self.assertEqual(resolved.value('alias'), 6)
+        self.assertEqual(resolved.value('fuzzy'), 1)
+        self.assertEqual(resolved.value('cache'), 1)
+
+        stages = self.metrics.get('prediction_stage_seconds')
+        self.assertEqual(stages.count('total'), 2)
+        self.assertEqual(stages.count('score'), 2)
+
+    def test_disabled_by_default(self):
+        """Without a registry nothing is recorded"""
+        predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True
+        )
+        self.assertIsNone(predictor.metrics)
+        self.assertIsNone(predictor.matcher.metrics)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
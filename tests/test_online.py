@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.naive_bayes import MultinomialNB
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.predict import DiseasePredictor
+from src.models.online import OnlineUpdater
+
+CASE = ['itching', 'skin rash', 'high fever']
+
+
+class TestOnlineUpdater(unittest.TestCase):
+    def setUp(self):
+        self.predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True
+        )
+        self.updater = OnlineUpdater(self.predictor)
+
+    def test_update_returns_new_predictor(self):
+        """The live predictor is untouched; the new one reflects the cases"""
+        before = self.predictor.predict(CASE)[0][0][1]
+        updated = self.updater.update([(CASE, 'Chicken pox')] * 20)
+
+        self.assertIsNot(updated, self.predictor)
+        self.assertIs(updated.matcher, self.predictor.matcher)
+        self.assertEqual(self.predictor.predict(CASE)[0][0][1], before)
+        self.assertGreater(updated.predict(CASE)[0][0][1], before)
+        self.assertEqual(self.updater.stats()['cases_applied'], 20)
+
+    def test_same_as_full_refit(self):
+        """partial_fit on new cases matches fitting old and new cases together"""
+        rng = np.random.RandomState(0)
+        n_features = len(self.predictor.symptom_list)
+        X_old = sparse.csr_matrix(rng.rand(60, n_features) < 0.05, dtype=np.float64)
+        y_old = np.arange(60) % len(self.predictor.classes)
+        self.updater.model = MultinomialNB().fit(X_old, y_old)
+
+        cases = [(CASE, 'Chicken pox'), (['vomiting', 'headache'], 'Migraine')]
+        X_new, y_new = self.updater.encode_cases(cases)
+        updated = self.updater.update(cases)
+
+        refit = MultinomialNB().fit(sparse.vstack([X_old, X_new]), np.concatenate([y_old, y_new]))
+        np.testing.assert_allclose(updated.model.feature_log_prob_, refit.feature_log_prob_)
+        np.testing.assert_allclose(updated.model.class_log_prior_, refit.class_log_prior_)
+
+    def test_concurrent_updates_publish_in_order(self):
+        """publish runs under the lock, so the last one published is the newest"""
+        published = []
+        threads = [
+            threading.Thread(target=self.updater.update,
+                             args=([(CASE, 'Chicken pox')],), kwargs={'publish': published.append})
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        versions = [p.model_version for p in published]
+        self.assertEqual(versions, [f"{self.predictor.model_version}+update{i}" for i in range(1, 9)])
+        self.assertIs(published[-1], self.updater.predictor)
+
+    def test_rejects_unknown_disease(self):
+        with self.assertRaises(ValueError):
+            self.updater.update([(CASE, 'Not a disease')])
+        self.assertEqual(self.updater.updates, 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
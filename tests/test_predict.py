@@ -211,6 +211,54 @@ class TestDiseasePredictor(unittest.TestCase):
         self.assertGreater(len(predictions), 0, "Should predict with realistic input")
         print("   ✓ Test passed\n")
 
+    def test_batch_matches_single_predictions(self):
+        """Test that predict_batch returns the same results as predict"""
+        print("\n📝 Test: Batch prediction")
+
+        cases = [
+            self.actual_symptoms[:3],
+            self.actual_symptoms[3:9],
+            ['xyz123', 'notreal'],
+            self.actual_symptoms[10:12] + ['xyz123'],
+        ]
+
+        batch_results = self.predictor.predict_batch(cases, confidence_threshold=0.05)
+
+        self.assertEqual(len(batch_results), len(cases))
+        for symptoms, (predictions, matched) in zip(cases, batch_results):
+            expected, expected_matched = self.predictor.predict(
+                symptoms, confidence_threshold=0.05
+            )
+            self.assertEqual(matched, expected_matched)
+            self.assertEqual(
+                [(d, p) for d, p, _ in predictions],
+                [(d, p) for d, p, _ in expected]
+            )
+
+        print(f"   Scored {len(cases)} cases in one call")
+        print("   ✓ Test passed\n")
+
+    def test_batch_unmatched_rows_are_independent(self):
+        """Unmatched rows of predict_batch don't share their result lists"""
+        results = self.predictor.predict_batch([['xyz123'], ['notreal'], ['abcdef']])
+        results[0][0].append('changed')
+        results[0][1].append('changed')
+        self.assertEqual(results[1], ([], []))
+        self.assertEqual(results[2], ([], []))
+
+    def test_known_case_from_dataset(self):
+        """Test that a training case maps to its disease (symptom column order)"""
+        print("\n📝 Test: Known case from dataset")
+
+        symptoms = ['itching', 'skinrash', 'nodalskineruptions', 'dischromic patch']
+        predictions, matched = self.predictor.predict(symptoms, return_top_n=1)
+
+        print(f"   Top prediction: {predictions[0][0] if predictions else None}")
+
+        self.assertEqual(len(matched), len(symptoms))
+        self.assertEqual(predictions[0][0], 'Fungal infection')
+        print("   ✓ Test passed\n")
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("RUNNING DISEASE PREDICTOR TESTS")
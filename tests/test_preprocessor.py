@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+import pandas as pd
+import nltk
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.data.preprocessor import NLTK_RESOURCES, DiseaseDataPreprocessor, existing_outputs
+
+DATASET_PATH = os.path.join(project_root, 'data/raw/dataset.csv')
+
+
+def nltk_data_available():
+    try:
+        for path in NLTK_RESOURCES.values():
+            nltk.data.find(path)
+    except LookupError:
+        return False
+    return True
+
+
+@unittest.skipUnless(nltk_data_available(), "NLTK corpora not installed")
+class TestDiseaseDataPreprocessor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.read_csv(DATASET_PATH)
+        cls.symptom_cols = [col for col in cls.df.columns if col != 'Disease']
+
+        cls.preprocessor = DiseaseDataPreprocessor()
+        processed_df = cls.preprocessor.prepare_dataset(cls.df, cls.symptom_cols)
+        cls.X, cls.y, cls.symptom_list = cls.preprocessor.create_feature_matrix(processed_df)
+
+    def test_clean_symptom_values_matches_clean_symptom_text(self):
+        """Vectorized cleaning equals the per-cell cleaning"""
+        values = self.df[self.symptom_cols].to_numpy(dtype=object).ravel()[:2000]
+        expected = [self.preprocessor.clean_symptom_text(v) for v in values]
+        self.assertEqual(self.preprocessor.clean_symptom_values(values), expected)
+
+    def test_streaming_matches_in_memory(self):
+        """Chunked sparse features equal the in-memory dense features"""
+        for chunksize in (333, 100000):
+            streaming = DiseaseDataPreprocessor()
+            X, y, symptom_list = streaming.build_sparse_features(
+                DATASET_PATH, chunksize=chunksize
+            )
+
+            self.assertEqual(symptom_list, self.symptom_list)
+            np.testing.assert_array_equal(X.toarray(), self.X)
+            np.testing.assert_array_equal(y, self.y)
+            np.testing.assert_array_equal(
+                streaming.label_encoder.classes_, self.preprocessor.label_encoder.classes_
+            )
+
+    def test_process_pool_matches_serial(self):
+        """Multi-process encoding merges to the same output as serial"""
+        serial = DiseaseDataPreprocessor()
+        X1, y1, symptoms1 = serial.build_sparse_features(DATASET_PATH, chunksize=500)
+        pooled = DiseaseDataPreprocessor()
+        X2, y2, symptoms2 = pooled.build_sparse_features(DATASET_PATH, chunksize=500, n_jobs=2)
+
+        self.assertEqual(symptoms1, symptoms2)
+        self.assertEqual((X1 != X2).nnz, 0)
+        np.testing.assert_array_equal(y1, y2)
+        self.assertEqual(pooled.rows_read, len(self.df))
+
+    def test_normalization_cache(self):
+        """Each distinct raw string is cleaned once and reused"""
+        self.assertIn(' skin_rash', self.preprocessor.normalization_cache)
+        self.assertEqual(
+            self.preprocessor.clean_symptom_text(' skin_rash'),
+            self.preprocessor.normalization_cache[' skin_rash']
+        )
+
+
+class KeepWords:
+    """Lemmatizer that keeps words as they are, so no NLTK corpora are needed"""
+
+    def lemmatize(self, word):
+        return word
+
+
+class TestPreprocessorWithoutCorpora(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.read_csv(DATASET_PATH)
+        cls.symptom_cols = [col for col in cls.df.columns if col != 'Disease']
+
+        cls.preprocessor = DiseaseDataPreprocessor(KeepWords())
+        processed_df = cls.preprocessor.prepare_dataset(cls.df, cls.symptom_cols)
+        cls.X, cls.y, cls.symptom_list = cls.preprocessor.create_feature_matrix(processed_df)
+
+    def test_streaming_matches_in_memory(self):
+        for chunksize, n_jobs in ((333, 1), (100000, 1), (500, 2)):
+            streaming = DiseaseDataPreprocessor(KeepWords())
+            X, y, symptom_list = streaming.build_sparse_features(
+                DATASET_PATH, chunksize=chunksize, n_jobs=n_jobs
+            )
+
+            self.assertEqual(symptom_list, self.symptom_list)
+            np.testing.assert_array_equal(X.toarray(), self.X)
+            np.testing.assert_array_equal(y, self.y)
+            self.assertEqual(streaming.rows_read, len(self.df))
+
+    def test_clean_symptom_values_matches_clean_symptom_text(self):
+        values = self.df[self.symptom_cols].to_numpy(dtype=object).ravel()[:2000]
+        expected = [DiseaseDataPreprocessor(KeepWords()).clean_symptom_text(v) for v in values]
+        self.assertEqual(DiseaseDataPreprocessor(KeepWords()).clean_symptom_values(values), expected)
+
+
+class TestPreprocessorCli(unittest.TestCase):
+    def test_existing_outputs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertEqual(existing_outputs(tmpdir, feature_store=True), [])
+            for name in ('vocabulary.pkl', 'features'):
+                open(os.path.join(tmpdir, name), 'w').close()
+            self.assertEqual(existing_outputs(tmpdir), ['vocabulary.pkl'])
+            self.assertEqual(existing_outputs(tmpdir, feature_store=True),
+                             ['vocabulary.pkl', 'features'])
+
+    def test_refuses_to_overwrite_shipped_files(self):
+        """The default output dir holds the shipped vocabulary; it is left alone"""
+        vocab_path = os.path.join(project_root, 'data/processed/vocabulary.pkl')
+        before = os.path.getmtime(vocab_path)
+
+        result = subprocess.run(
+            [sys.executable, '-m', 'src.data.preprocessor'],
+            cwd=project_root, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn('--force', result.stderr)
+        self.assertEqual(os.path.getmtime(vocab_path), before)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+from scipy import sparse
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.linear_model import LogisticRegression
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.selection import cross_validate_candidates, pareto_front, select_model
+
+
+class TestSelection(unittest.TestCase):
+    def test_pareto_selection(self):
+        """Dominated models drop out; the fastest near-best model wins"""
+        rows = {
+            'fast': {'cv_mean': 0.999, 'single_row_us': 20.0},
+            'accurate': {'cv_mean': 1.0, 'single_row_us': 500.0},
+            'slow': {'cv_mean': 0.999, 'single_row_us': 900.0},
+        }
+        self.assertEqual(pareto_front(rows), ['fast', 'accurate'])
+        self.assertEqual(select_model(rows, tolerance=0.001), 'fast')
+        self.assertEqual(select_model(rows, tolerance=0.0), 'accurate')
+
+    def test_cached_cross_validation(self):
+        """A re-run with the same cache reuses fold results"""
+        rng = np.random.RandomState(0)
+        y = np.repeat(np.arange(3), 20)
+        X = sparse.csr_matrix((rng.rand(60, 10) < 0.3) + np.eye(3)[y].repeat(4, axis=1)[:, :10])
+        candidates = {'nb': MultinomialNB(), 'lr': LogisticRegression(max_iter=200)}
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = cross_validate_candidates(candidates, X, y, n_splits=3, n_jobs=1, cache_dir=cache_dir)
+            second = cross_validate_candidates(candidates, X, y, n_splits=3, n_jobs=1, cache_dir=cache_dir)
+
+        self.assertEqual(set(first), {'nb', 'lr'})
+        # fit_seconds is measured inside the cached call, so equal only on a cache hit
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
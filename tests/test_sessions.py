@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import joblib
+import numpy as np
+from sklearn.naive_bayes import MultinomialNB
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.models.bundle import export_bundle
+from src.models.predict import DiseasePredictor
+from src.models.sessions import SessionStore, information_gain, symptom_presence_probabilities
+
+
+class TestSessionStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = DiseasePredictor(
+            model_path=os.path.join(project_root, 'models/best_model.pkl'),
+            vocab_path=os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+            lazy_nlp=True
+        )
+
+    def setUp(self):
+        self.store = SessionStore(self.predictor, max_sessions=3, ttl_seconds=60)
+
+    def test_incremental_scores_match_full_prediction(self):
+        """Adding and removing symptoms gives the same result as predicting from scratch"""
+        session = self.store.create()
+        self.store.update(session, add=['itching', 'skin rash', 'high fever'])
+        self.store.update(session, remove=['itching'], add=['vomiting'])
+        self.store.update(session, add=['vomiting', 'headache'])
+
+        expected = self.predictor.scorer.predict_proba_indices(session.indices)
+        np.testing.assert_allclose(self.store.probabilities(session), expected)
+
+        predictions = self.store.predictions(session)
+        full, _ = self.predictor.predict(['skin rash', 'high fever', 'vomiting', 'headache'])
+        self.assertEqual([p[0] for p in predictions], [p[0] for p in full])
+
+    def test_remove_takes_vocabulary_symptoms(self):
+        """Removing a matched symptom and re-adding the kept inputs keeps shared columns"""
+        session = self.store.create()
+        self.store.update(session, add=['skin rash', 'skin_rash', 'itching'])
+        matched = [s for s, _ in session.used_symptoms]
+        self.assertEqual(len(matched), 2)
+
+        # Raw input text is not a vocabulary symptom, so nothing is removed
+        self.store.update(session, remove=['skin rash'])
+        self.assertEqual(len(session.indices), 2)
+
+        # Client dropped 'skin rash' but kept 'skin_rash': rebuild from kept inputs
+        self.store.update(session, remove=matched, add=['skin_rash', 'itching'])
+        self.assertEqual(sorted(s for s, _ in session.used_symptoms), sorted(matched))
+        expected = self.predictor.scorer.predict_proba_indices(session.indices)
+        np.testing.assert_allclose(self.store.probabilities(session), expected)
+
+    def test_suggestions_skip_asked_symptoms(self):
+        session = self.store.create()
+        self.store.update(session, add=['itching', 'skin rash'], absent=['fatigue'])
+
+        suggestions = self.store.suggest(session, n=5)
+        symptoms = [s for s, _ in suggestions]
+        self.assertEqual(len(suggestions), 5)
+        self.assertTrue(set(symptoms).isdisjoint({'itching', 'skinrash', 'fatigue'}))
+        gains = [g for _, g in suggestions]
+        self.assertEqual(gains, sorted(gains, reverse=True))
+
+    def test_bundle_presence_matches_model_counts(self):
+        """A bundle-loaded store suggests from the exported training counts"""
+        rng = np.random.RandomState(3)
+        n_symptoms = len(self.predictor.symptom_list)
+        n_classes = len(self.predictor.classes)
+        X = (rng.rand(400, n_symptoms) < 0.1).astype(np.float64)
+        y = np.arange(400) % n_classes
+        model = MultinomialNB(alpha=0.5, class_prior=np.full(n_classes, 1 / n_classes)).fit(X, y)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = os.path.join(tmpdir, 'model.pkl')
+            joblib.dump(model, model_path)
+            bundle_dir = os.path.join(tmpdir, 'bundle')
+            export_bundle(
+                model_path, os.path.join(project_root, 'data/processed/vocabulary.pkl'),
+                os.path.join(project_root, 'data/disease_info.json'), bundle_dir
+            )
+            bundle_predictor = DiseasePredictor.from_bundle(bundle_dir, lazy_nlp=True, mmap=False)
+
+        self.assertIsNone(bundle_predictor.model)
+        store = SessionStore(bundle_predictor)
+        np.testing.assert_allclose(store.presence, symptom_presence_probabilities(model))
+
+        session = store.create()
+        store.update(session, add=['itching', 'skin rash'])
+        reference = SessionStore(bundle_predictor.with_model(model, 'reference'))
+        self.assertEqual(store.suggest(session, n=5), reference.suggest(session, n=5))
+
+    def test_information_gain_matches_direct_computation(self):
+        rng = np.random.RandomState(0)
+        probabilities = rng.dirichlet(np.ones(5))
+        presence = rng.rand(4, 5)
+
+        def entropy(p):
+            p = p[p > 0]
+            return -(p * np.log(p)).sum()
+
+        expected = []
+        for q in presence:
+            p_yes = (q * probabilities).sum()
+            expected.append(entropy(probabilities)
+                            - p_yes * entropy(q * probabilities / p_yes)
+                            - (1 - p_yes) * entropy((1 - q) * probabilities / (1 - p_yes)))
+        np.testing.assert_allclose(information_gain(probabilities, presence), expected)
+
+    def test_ttl_and_size_bound(self):
+        first = self.store.create()
+        first.last_access -= 120
+        self.assertIsNone(self.store.get(first.session_id))
+        self.assertEqual(self.store.stats()['expired'], 1)
+
+        ids = [self.store.create().session_id for _ in range(4)]
+        self.assertEqual(len(self.store), 3)
+        self.assertIsNone(self.store.get(ids[0]))
+        self.assertEqual(self.store.stats()['evictions'], 1)
+
+    def test_rescored_after_model_swap(self):
+        session = self.store.create()
+        self.store.update(session, add=['itching', 'skin rash'])
+
+        model = self.predictor.model
+        updated = self.predictor.with_model(model, 'swapped')
+        updated.scorer.bias = updated.scorer.bias + np.arange(len(updated.classes))
+        self.store.set_predictor(updated)
+
+        session = self.store.get(session.session_id)
+        np.testing.assert_allclose(
+            self.store.probabilities(session),
+            updated.scorer.predict_proba_indices(session.indices)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import spacy
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.nlp.symptom_matcher import SymptomMatcher
+from src.nlp.aliases import SymptomAliasIndex
+from src.nlp.autocomplete import SymptomAutocompleteIndex
+from src.nlp.fuzzy_index import FuzzyCandidateIndex
+from src.nlp.word_vectors import export_word_vectors
+from src.utils.synthetic import make_inputs
+
+VOCABULARY = ['high fever', 'chest pain', 'skin rash', 'joint pain', 'cough']
+
+
+def build_test_nlp():
+    """Small blank pipeline with hand-made word vectors"""
+    nlp = spacy.blank('en')
+    rng = np.random.RandomState(0)
+    for word in ['high', 'fever', 'chest', 'pain', 'skin', 'rash',
+                 'joint', 'cough', 'temperature', 'ache', 'itchy']:
+        nlp.vocab.set_vector(word, rng.rand(8).astype(np.float32))
+    return nlp
+
+
+class TestSymptomMatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.matcher = SymptomMatcher(VOCABULARY)
+        cls.matcher.nlp = build_test_nlp()
+        cls.matcher.symptom_embeddings = cls.matcher._build_embedding_matrix()
+
+    def test_semantic_scores_match_doc_similarity(self):
+        """Vectorized scores should equal spaCy's Doc.similarity"""
+        nlp = self.matcher.nlp
+        for query in ['temperature', 'itchy skin', 'ache chest', 'unknownword']:
+            user_doc = nlp(query)
+            expected = []
+            for symptom in VOCABULARY:
+                symptom_doc = nlp(symptom)
+                if user_doc.vector_norm and symptom_doc.vector_norm:
+                    expected.append(user_doc.similarity(symptom_doc) * 100)
+                else:
+                    expected.append(0.0)
+
+            scores = self.matcher._semantic_scores(query)
+            if scores is None:
+                self.assertTrue(all(e == 0 for e in expected))
+            else:
+                np.testing.assert_allclose(scores, expected, atol=1e-3)
+
+    def test_batched_tfidf_matches_single_inputs(self):
+        """match_multiple_symptoms gives the same matches and order as match_symptom"""
+        inputs = ['Chest pain', 'pain in the joint', 'xyz123', 'fever high', 'pain in the joint']
+        matcher = SymptomMatcher(VOCABULARY, cache_size=0, lazy_nlp=True)
+        expected = []
+        for user_input in inputs:
+            match, score = matcher.match_symptom(user_input, 80)
+            if match:
+                expected.append((match, score))
+        self.assertEqual(matcher.match_multiple_symptoms(inputs, 80), expected)
+
+    def test_word_vector_table_matches_spacy(self):
+        """The exported float16 table scores like the spaCy pipeline, without spaCy"""
+        with tempfile.TemporaryDirectory() as table_dir:
+            export_word_vectors(self.matcher.nlp, table_dir, VOCABULARY)
+            matcher = SymptomMatcher(VOCABULARY, nlp_model=table_dir)
+            self.assertIsNone(matcher.nlp)
+
+            for query in ['temperature', 'itchy skin', 'ache, chest', "can't cough"]:
+                np.testing.assert_allclose(
+                    matcher._semantic_scores(query), self.matcher._semantic_scores(query), atol=0.1
+                )
+            self.assertIsNone(matcher._semantic_scores('unknownword'))
+
+    def test_semantic_scores_without_vectors(self):
+        """Inputs with no word vectors should skip the semantic stage"""
+        self.assertIsNone(self.matcher._semantic_scores('xyz123'))
+        self.assertEqual(self.matcher.symptom_embeddings.shape, (len(VOCABULARY), 8))
+
+
+class TestSymptomAutocompleteIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymptomAutocompleteIndex(
+            ['skinrash', 'chest pain', 'joint pain', 'painful walking', 'cough', 'high fever']
+        )
+
+    def test_prefix_ranked_first(self):
+        """Whole-symptom prefixes rank above word prefixes and inner hits"""
+        self.assertEqual(
+            self.index.suggest('pain', top_n=3),
+            ['painful walking', 'chest pain', 'joint pain']
+        )
+
+    def test_ignores_spaces_and_underscores(self):
+        """'skin_rash' and 'skin rash' should both find 'skinrash'"""
+        self.assertEqual(self.index.suggest('skin_rash')[0], 'skinrash')
+        self.assertEqual(self.index.suggest('skin rash')[0], 'skinrash')
+
+    def test_fuzzy_fallback_for_typos(self):
+        """Typos fall back to fuzzy scoring on n-gram candidates"""
+        self.assertIn('high fever', self.index.suggest('fevr'))
+        self.assertEqual(self.index.suggest('xq'), [])
+
+
+class TestSymptomAliasIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymptomAliasIndex(
+            ['skinrash', 'dischromic patch', 'vomiting', 'high fever', 'headache'],
+            synonyms={'vomiting': ['throwing up'], 'not a symptom': ['anything']}
+        )
+
+    def test_spelling_variants(self):
+        """Case, spacing, underscores and plurals resolve to the vocabulary term"""
+        self.assertEqual(self.index.lookup('skin_rash'), 'skinrash')
+        self.assertEqual(self.index.lookup(' dischromic _patches'), 'dischromic patch')
+        self.assertEqual(self.index.lookup('HIGH-FEVER'), 'high fever')
+        self.assertEqual(self.index.lookup('headaches'), 'headache')
+        self.assertEqual(self.index.lookup('dischromic patches'), 'dischromic patch')
+        self.assertEqual(self.index.lookup('throwing up'), 'vomiting')
+        self.assertIsNone(self.index.lookup('anything'))
+        self.assertIsNone(self.index.lookup('fever'))
+
+    def test_resolved_fraction(self):
+        """Stats report the share of lookups the index resolved"""
+        self.index.lookup('skin rash')
+        self.index.lookup('rash on skin')
+        self.assertEqual(self.index.stats()['resolved_fraction'], 0.5)
+
+
+class TestFuzzyCandidateIndex(unittest.TestCase):
+    def test_same_result_as_full_scan(self):
+        """Pruned search returns what process.extractOne would"""
+        from fuzzywuzzy import fuzz, process
+
+        vocabulary = VOCABULARY + ['chest_pain', 'pain in chest', 'mild fever', 'high_fever']
+        index = FuzzyCandidateIndex(vocabulary)
+        queries = ['chest pian', 'pain chest', 'feverr', 'Skin-Rash', 'xyz', '']
+        for kind in ('typo', 'paraphrase'):
+            queries += make_inputs(vocabulary, kind, 50, seed=0)
+
+        for threshold in (50, 80, 95):
+            for query in queries:
+                best = process.extractOne(query, vocabulary, scorer=fuzz.token_sort_ratio)
+                expected = best if best and best[1] >= threshold else None
+                self.assertEqual(index.best_match(query, threshold), expected, (query, threshold))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)